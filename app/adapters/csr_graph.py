@@ -0,0 +1,145 @@
+# app/adapters/csr_graph.py
+"""
+In-process graph expansion over a CSR snapshot written by scripts/export_csr.py
+(EXPANSION_ENGINE=csr). See that script for the file layout.
+
+Arrays are memory-mapped, so workers share one copy through the OS page cache, and a hop is a
+handful of NumPy slices. Like local_ann, a new export is picked up by re-mapping when
+meta.json's version changes, checked at most every CSR_RELOAD_S. Loading a snapshot reads all of
+nodes.jsonl, so async callers go through aget_graph/aexpand: the check and any load run in a
+worker thread, requests keep using the current graph meanwhile, and only the slicing runs on the
+event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.adapters.local_ann import read_meta
+from app.core.settings import settings
+
+
+def _map(path: str, name: str, dtype, count: int):
+    if count == 0:  # np.memmap refuses empty files
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(os.path.join(path, name), dtype=dtype, mode="r", shape=(count,))
+
+
+class CSRGraph:
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = read_meta(path)
+        n, e = int(self.meta["nodes"]), int(self.meta["edges"])
+        self.indptr = _map(path, "indptr.i64", np.int64, n + 1)
+        self.indices = _map(path, "indices.i32", np.int32, e)
+        self.rels = _map(path, "rels.u16", np.uint16, e)
+        self.rel_types: list[str] = self.meta["rel_types"]
+        self.keys: list[str] = []
+        self.index: dict[str, int] = {}
+        with open(os.path.join(path, "nodes.jsonl")) as f:
+            for i, line in enumerate(f):
+                if i >= n:
+                    break
+                row = json.loads(line)
+                self.keys.append(row["key"])
+                self.index[row["id"]] = i
+
+    @property
+    def version(self):
+        return self.meta.get("version")
+
+    def degree(self, i: int) -> int:
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def _hop(self, i: int, per_node: int) -> tuple[np.ndarray, np.ndarray]:
+        lo = self.indptr[i]
+        hi = min(self.indptr[i + 1], lo + per_node)  # slices are best-connected first
+        return self.indices[lo:hi], self.rels[lo:hi]
+
+    def expand(self, seed_ids: list[str], per_seed: int = 20, limit: int = 50, hops: int = 1,
+               stats: dict | None = None) -> list[dict]:
+        """Triples around the seeds (elementIds), breadth-first up to `hops`, at most `limit`."""
+        frontier = [self.index[s] for s in seed_ids if s in self.index]
+        visited = set(frontier)
+        out, seen, truncated = [], set(), 0
+        hub = settings.hub_degree_threshold
+        for hop in range(max(1, hops)):
+            known = set(visited)  # edges back into earlier hops only repeat what we already have
+            nxt = []
+            for i in frontier:
+                if hop == 0 and hub > 0 and self.degree(i) >= hub and self.degree(i) > per_seed:
+                    truncated += 1
+                nbrs, rels = self._hop(i, per_seed)
+                a = self.keys[i]
+                for j, t in zip(nbrs.tolist(), rels.tolist()):
+                    if hop and j in known:
+                        continue
+                    key = (a, self.rel_types[t], self.keys[j])
+                    if key not in seen:
+                        seen.add(key)
+                        out.append({"a": key[0], "rel": key[1], "b": key[2]})
+                        if len(out) >= limit:
+                            break
+                    if j not in visited:
+                        visited.add(j)
+                        nxt.append(j)
+                if len(out) >= limit:
+                    break
+            frontier = nxt
+            if len(out) >= limit or not frontier:
+                break
+        if stats is not None:
+            stats["hub_seeds_truncated"] = truncated
+            stats["csr_version"] = self.version
+        return out
+
+
+_GRAPH: Optional[CSRGraph] = None
+_LOCK = threading.Lock()
+_CHECKED_AT = 0.0
+
+
+def get_graph() -> CSRGraph:
+    """Loaded once per worker; re-mapped when the exporter publishes a new version."""
+    global _GRAPH, _CHECKED_AT
+    now = time.monotonic()
+    if _GRAPH is not None and now - _CHECKED_AT < settings.csr_reload_s:
+        return _GRAPH
+    with _LOCK:
+        _CHECKED_AT = now
+        if _GRAPH is None:
+            _GRAPH = CSRGraph(settings.csr_path)
+            return _GRAPH
+        try:
+            if read_meta(settings.csr_path).get("version") != _GRAPH.version:
+                _GRAPH = CSRGraph(settings.csr_path)  # swap; old readers keep their ref
+        except (OSError, ValueError):
+            pass  # snapshot mid-swap: keep serving the one we have
+    return _GRAPH
+
+
+def _fresh() -> Optional[CSRGraph]:
+    graph = _GRAPH
+    return graph if graph is not None and time.monotonic() - _CHECKED_AT < settings.csr_reload_s else None
+
+
+async def aget_graph() -> CSRGraph:
+    """get_graph without blocking the event loop on the version check or a (re)load."""
+    return _fresh() or await asyncio.to_thread(get_graph)
+
+
+def expand(seed_ids: list[str], per_seed: int = 20, limit: int = 50, hops: int = 1,
+           stats: dict | None = None) -> list[dict]:
+    return get_graph().expand(seed_ids, per_seed, limit, hops, stats)
+
+
+async def aexpand(seed_ids: list[str], per_seed: int = 20, limit: int = 50, hops: int = 1,
+                  stats: dict | None = None) -> list[dict]:
+    graph = await aget_graph()
+    return graph.expand(seed_ids, per_seed, limit, hops, stats)  # slices only: stays on the loop
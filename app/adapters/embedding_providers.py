@@ -0,0 +1,191 @@
+# app/adapters/embedding_providers.py
+"""
+Embedding backends behind one LangChain `Embeddings` interface, picked by settings.emb_provider:
+
+  - "openai":  remote OpenAI embeddings on the shared pool (default)
+  - "local":   sentence-transformers on CPU (torch or ONNX backend), no network
+  - "hashing": deterministic feature-hashing encoder; no model, no network — for tests/offline
+
+settings.emb_dims shortens vectors: OpenAI returns them at that size (`dimensions=`), local models
+are truncated and re-normalized (Matryoshka-style; only meaningful for MRL-trained models).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from app.adapters.openai_client import make_embeddings, model_slot, amodel_slot
+from app.core.settings import settings
+
+
+def _with_dims(name: str, dims: Optional[int]) -> str:
+    # Part of the embedding-cache key: vectors of different sizes must never be mixed up.
+    return f"{name}@{dims}" if dims else name
+
+
+def _shorten(vec: List[float], dims: Optional[int]) -> List[float]:
+    if not dims or dims >= len(vec):
+        return vec
+    head = vec[:dims]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+class OpenAIProvider(Embeddings):
+    def __init__(self, dims: Optional[int] = None):
+        self.native_dims = 3072 if "3-large" in settings.emb_model else 1536
+        self._request_dims = dims if dims and dims < self.native_dims else None
+        self.dims = self._request_dims or self.native_dims
+        self.name = _with_dims(settings.emb_model, self._request_dims)
+
+    def _client(self):
+        return make_embeddings(self._request_dims)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with model_slot(settings.emb_model):
+            return self._client().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with model_slot(settings.emb_model):
+            return self._client().embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        async with amodel_slot(settings.emb_model):
+            return await self._client().aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        async with amodel_slot(settings.emb_model):
+            return await self._client().aembed_query(text)
+
+
+class _LocalProvider(Embeddings):
+    """Shared batching for in-process encoders: split into batches and fan out on a thread pool."""
+
+    def __init__(self, batch_size: int, threads: int, dims: Optional[int] = None):
+        self.batch_size = max(1, batch_size)
+        self.target_dims = dims
+        self._pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="emb")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def _encode_short(self, texts: List[str]) -> List[List[float]]:
+        return [_shorten(v, self.target_dims) for v in self._encode(texts)]
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) <= self.batch_size:
+            return self._encode_short(texts)
+        return [v for chunk in self._pool.map(self._encode_short, self._batches(texts)) for v in chunk]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode_short([text])[0]
+
+    # Only leaf work (_encode_short) goes to the pool: a pool task waiting on the same pool
+    # deadlocks once every worker is doing it.
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(loop.run_in_executor(self._pool, self._encode_short, b)
+                                        for b in self._batches(texts)))
+        return [v for chunk in chunks for v in chunk]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vecs = await asyncio.get_running_loop().run_in_executor(self._pool, self._encode_short, [text])
+        return vecs[0]
+
+
+class SentenceTransformerProvider(_LocalProvider):
+    def __init__(self, dims: Optional[int] = None):
+        super().__init__(settings.local_emb_batch, settings.local_emb_threads, dims)
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMB_PROVIDER=local needs `pip install sentence-transformers` "
+                "(plus `optimum[onnxruntime]` for LOCAL_EMB_BACKEND=onnx)."
+            ) from e
+        self._model = SentenceTransformer(
+            settings.local_emb_model,
+            device=settings.local_emb_device,
+            backend=settings.local_emb_backend,
+        )
+        native = self._model.get_sentence_embedding_dimension()
+        if dims and dims >= native:
+            self.target_dims = None
+        self.dims = self.target_dims or native
+        self.name = _with_dims(settings.local_emb_model, self.target_dims)
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vecs = self._model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True)
+        return [v.tolist() for v in vecs]
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingProvider(_LocalProvider):
+    """
+    Signed feature hashing over word unigrams/bigrams + character trigrams, L2-normalized.
+    Same text → same vector on every machine, so it is safe for fixtures and offline runs.
+    """
+
+    def __init__(self, dims: Optional[int] = None):
+        # Hashing can emit any width directly, so emb_dims replaces hash_emb_dims instead of truncating.
+        super().__init__(settings.local_emb_batch, settings.local_emb_threads)
+        self.dims = dims or settings.hash_emb_dims
+        self.name = f"hashing-{self.dims}"
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN.findall(text.casefold())
+        feats = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"#{w}#"
+            feats += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return feats
+
+    def _vector(self, text: str) -> List[float]:
+        vec = [0.0] * self.dims
+        for f in self._features(text):
+            h = int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dims] += 1.0 if (h >> 63) & 1 else -1.0
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return [x / norm for x in vec]
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
+
+
+_PROVIDERS = {
+    "openai": OpenAIProvider,
+    "local": SentenceTransformerProvider,
+    "hashing": HashingProvider,
+}
+_PROVIDER: Optional[Embeddings] = None
+_LOCK = threading.Lock()
+
+
+def make_provider(kind: Optional[str] = None, dims: Optional[int] = None) -> Embeddings:
+    """Fresh provider instance (tools compare several sizes side by side); the API uses get_provider()."""
+    kind = (kind or settings.emb_provider).lower()
+    if kind not in _PROVIDERS:
+        raise ValueError(f"Unknown EMB_PROVIDER '{kind}' (use one of {sorted(_PROVIDERS)})")
+    return _PROVIDERS[kind](dims)
+
+
+def get_provider() -> Embeddings:
+    """Process-wide provider for settings.emb_provider. Exposes `.name` (cache/model key) and `.dims`."""
+    global _PROVIDER
+    if _PROVIDER is None:
+        with _LOCK:
+            if _PROVIDER is None:
+                _PROVIDER = make_provider(settings.emb_provider, settings.emb_dims)
+    return _PROVIDER
@@ -0,0 +1,126 @@
+# app/adapters/local_ann.py
+"""
+In-process vector search over a snapshot written by scripts/export_vectors.py.
+
+Snapshot directory layout:
+  meta.json     {"dims", "rows", "version", "model", "last_updated"}
+  vectors.f32   row-major float32 matrix, rows L2-normalized (so dot product == cosine)
+  ids.jsonl     one {"id", "nodeId", "labels"} per row, same order as vectors.f32
+  hnsw.bin      optional hnswlib graph over the same rows (used when hnswlib is installed)
+
+Appends only grow vectors.f32/ids.jsonl and bump meta.json, so readers that mapped the old
+row count keep working. A re-embedded node appears again further down; only its last row is live.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.core.settings import settings
+
+try:  # optional: approximate search for large corpora
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def read_meta(path: str) -> dict:
+    with open(os.path.join(path, "meta.json")) as f:
+        return json.load(f)
+
+
+class LocalVectorIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = read_meta(path)
+        rows, dims = int(self.meta["rows"]), int(self.meta["dims"])
+        # Zero-copy: pages are shared between workers through the OS page cache.
+        self.vectors = np.memmap(os.path.join(path, "vectors.f32"), dtype=np.float32, mode="r",
+                                 shape=(rows, dims))
+        self.ids: list[dict] = []
+        with open(os.path.join(path, "ids.jsonl")) as f:
+            for line in f:
+                if len(self.ids) >= rows:
+                    break
+                self.ids.append(json.loads(line))
+
+        latest: dict[str, int] = {}
+        for i, row in enumerate(self.ids):
+            latest[row["id"]] = i
+        self.live = np.zeros(rows, dtype=bool)
+        self.live[list(latest.values())] = True
+
+        self.hnsw = None
+        hnsw_path = os.path.join(path, "hnsw.bin")
+        if hnswlib is not None and os.path.exists(hnsw_path):
+            idx = hnswlib.Index(space="ip", dim=dims)
+            idx.load_index(hnsw_path, max_elements=rows)
+            for i in np.flatnonzero(~self.live):
+                idx.mark_deleted(int(i))
+            idx.set_ef(max(64, settings.local_ann_ef))
+            self.hnsw = idx
+
+    @property
+    def version(self):
+        return self.meta.get("version")
+
+    def _row(self, i: int, sim: float, with_vectors: bool = False) -> dict:
+        meta = self.ids[i]
+        # Same scale as db.index.vector.queryNodes for cosine: (1 + cos) / 2
+        row = {"id": meta["id"], "labels": meta.get("labels", []), "nodeId": meta.get("nodeId"),
+               "score": (1.0 + float(sim)) / 2.0}
+        if with_vectors:
+            row["vec"] = np.asarray(self.vectors[i])
+        return row
+
+    def search(self, vec, k: int = 8, with_vectors: bool = False) -> list[dict]:
+        q = np.asarray(vec, dtype=np.float32)
+        q /= (np.linalg.norm(q) or 1.0)
+        n_live = int(self.live.sum())
+        k = min(k, n_live)
+        if k <= 0:
+            return []
+
+        if self.hnsw is not None:
+            labels, dists = self.hnsw.knn_query(q, k=k)
+            # hnswlib "ip" distance is 1 - dot
+            return [self._row(int(i), 1.0 - float(d), with_vectors) for i, d in zip(labels[0], dists[0])]
+
+        sims = self.vectors @ q
+        sims = np.where(self.live, sims, -np.inf)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [self._row(int(i), sims[i], with_vectors) for i in top]
+
+
+_INDEX: Optional[LocalVectorIndex] = None
+_LOCK = threading.Lock()
+_CHECKED_AT = 0.0
+
+
+def get_index() -> LocalVectorIndex:
+    """Loaded once per worker; re-mapped when the exporter publishes a new version."""
+    global _INDEX, _CHECKED_AT
+    now = time.monotonic()
+    if _INDEX is not None and now - _CHECKED_AT < settings.local_ann_reload_s:
+        return _INDEX
+    with _LOCK:
+        _CHECKED_AT = now
+        if _INDEX is None:
+            _INDEX = LocalVectorIndex(settings.local_ann_path)
+            return _INDEX
+        try:
+            if read_meta(settings.local_ann_path).get("version") != _INDEX.version:
+                _INDEX = LocalVectorIndex(settings.local_ann_path)  # swap; old readers keep their ref
+        except (OSError, ValueError):
+            pass  # snapshot mid-swap: keep serving the one we have
+    return _INDEX
+
+
+def search(vec, k: int = 8, with_vectors: bool = False) -> list[dict]:
+    return get_index().search(vec, k, with_vectors)
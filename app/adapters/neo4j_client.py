@@ -1,11 +1,74 @@
-from neo4j import GraphDatabase
+import threading
+
+from neo4j import GraphDatabase, AsyncGraphDatabase, Query, READ_ACCESS
 from app.core.settings import settings
 
 _driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+_async_driver = None
+
+# Round trips issued through run_read/arun_read (one session + one query each).
+# Incremented from request threads, the speculation pool and the event loop alike.
+_COUNTS = {"queries": 0}
+_LOCK = threading.Lock()
+
+def _count():
+    with _LOCK:
+        _COUNTS["queries"] += 1
+
+def query_stats() -> dict:
+    with _LOCK:
+        return dict(_COUNTS)
+
+def _query(cypher: str, timeout: float | None):
+    # Query(timeout=...) is enforced server-side: the transaction is terminated, not just abandoned.
+    return Query(cypher, timeout=timeout) if timeout else cypher
+
+def _session(driver):
+    # READ_ACCESS is enforced by the server: writes are refused, including write procedures
+    # reached through CALL, whatever the (possibly generated) query text says.
+    return driver.session(default_access_mode=READ_ACCESS)
 
-def run_read(cypher: str, params: dict | None = None):
-    with _driver.session() as s:
-        return list(s.run(cypher, **(params or {})))
+def run_read(cypher: str, params: dict | None = None, timeout: float | None = None,
+             max_rows: int | None = None):
+    _count()
+    with _session(_driver) as s:
+        result = s.run(_query(cypher, timeout), **(params or {}))
+        # Rows past max_rows are never pulled; closing the session discards the rest.
+        return result.fetch(max_rows) if max_rows else list(result)
+
+def explain(cypher: str, params: dict | None = None) -> dict:
+    """The planner's plan for `cypher` (EXPLAIN: nothing is executed)."""
+    _count()
+    with _session(_driver) as s:
+        return s.run("EXPLAIN " + cypher, **(params or {})).consume().plan or {}
+
+def _get_async_driver():
+    # Created lazily so it binds to the server's event loop, not the importer's.
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(
+            settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass)
+        )
+    return _async_driver
+
+async def arun_read(cypher: str, params: dict | None = None, timeout: float | None = None,
+                    max_rows: int | None = None):
+    _count()
+    async with _session(_get_async_driver()) as s:
+        result = await s.run(_query(cypher, timeout), **(params or {}))
+        return await result.fetch(max_rows) if max_rows else [r async for r in result]
+
+async def aexplain(cypher: str, params: dict | None = None) -> dict:
+    _count()
+    async with _session(_get_async_driver()) as s:
+        result = await s.run("EXPLAIN " + cypher, **(params or {}))
+        return (await result.consume()).plan or {}
 
 def close_driver():
     _driver.close()
+
+async def aclose_driver():
+    global _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
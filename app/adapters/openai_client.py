@@ -1,15 +1,206 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from app.core.settings import settings
 
-def make_chat():
-    return ChatOpenAI(
+try:  # HTTP/2 needs the optional `h2` package (httpx[http2])
+    import h2  # noqa: F401
+    _HTTP2 = settings.openai_http2
+except ImportError:
+    _HTTP2 = False
+
+# One keep-alive pool per process, shared by every LangChain client below.
+_LIMITS = httpx.Limits(
+    max_connections=settings.openai_max_connections,
+    max_keepalive_connections=settings.openai_max_keepalive,
+    keepalive_expiry=settings.openai_keepalive_s,
+)
+_TIMEOUT = httpx.Timeout(settings.openai_timeout_s, connect=10.0)
+_http_client = httpx.Client(http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+_http_async_client = httpx.AsyncClient(http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+
+_CLIENTS: dict = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _singleton(key: tuple, build):
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                client = _CLIENTS[key] = build()
+    return client
+
+
+def make_chat(temperature: float = 0, **kwargs):
+    """Process-wide ChatOpenAI per (model, temperature, extra kwargs) on the shared pool."""
+    key = ("chat", settings.chat_model, temperature, tuple(sorted(kwargs.items())))
+    return _singleton(key, lambda: ChatOpenAI(
         model=settings.chat_model,
-        temperature=0,
+        temperature=temperature,
         api_key=settings.openai_key,
-    )
+        http_client=_http_client,
+        http_async_client=_http_async_client,
+        **kwargs,
+    ))
 
-def make_embeddings():
-    return OpenAIEmbeddings(
+
+def make_embeddings(dimensions: int | None = None):
+    """`dimensions` asks text-embedding-3 models for shortened (Matryoshka) vectors server-side."""
+    key = ("emb", settings.emb_model, dimensions)
+    return _singleton(key, lambda: OpenAIEmbeddings(
         model=settings.emb_model,
         api_key=settings.openai_key,
-    )
\ No newline at end of file
+        dimensions=dimensions,
+        http_client=_http_client,
+        http_async_client=_http_async_client,
+    ))
+
+
+class _ModelGate:
+    """
+    Per-model concurrency cap so bursts queue locally instead of turning into 429s upstream.
+
+    One counter covers both paths: sync callers (thread pools) block on a Condition, async
+    callers await a future that a release wakes, so the limit holds across both at once.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._cond = threading.Condition()
+        self._awaiting: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.max_wait_ms = 0.0
+
+    def _take(self, start: float) -> bool:
+        # Caller holds _cond.
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        self.calls += 1
+        self.max_wait_ms = max(self.max_wait_ms, round((time.perf_counter() - start) * 1000, 1))
+        return True
+
+    def _release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+            # Async waiters re-check under the lock; whoever loses goes back to waiting.
+            awaiting, self._awaiting = self._awaiting, []
+        for loop, fut in awaiting:
+            loop.call_soon_threadsafe(_wake, fut)
+
+    @contextmanager
+    def slot(self):
+        start = time.perf_counter()
+        with self._cond:
+            if not self._take(start):
+                self.waiting += 1
+                try:
+                    while not self._take(start):
+                        self._cond.wait()
+                finally:
+                    self.waiting -= 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        queued = False
+        try:
+            while True:
+                with self._cond:
+                    if self._take(start):
+                        break
+                    fut = loop.create_future()
+                    self._awaiting.append((loop, fut))
+                    if not queued:
+                        self.waiting += 1
+                        queued = True
+                try:
+                    await fut
+                except BaseException:
+                    with self._cond:
+                        if (loop, fut) in self._awaiting:
+                            self._awaiting.remove((loop, fut))
+                    raise
+        finally:
+            if queued:
+                with self._cond:
+                    self.waiting -= 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"limit": self.limit, "in_flight": self.in_flight, "waiting": self.waiting,
+                    "calls": self.calls, "max_wait_ms": self.max_wait_ms}
+
+
+def _wake(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
+
+
+_GATES: dict[str, _ModelGate] = {}
+
+
+def _gate(model: str) -> _ModelGate:
+    gate = _GATES.get(model)
+    if gate is None:
+        with _CLIENTS_LOCK:
+            gate = _GATES.setdefault(model, _ModelGate(settings.openai_model_concurrency))
+    return gate
+
+
+def model_slot(model: str):
+    """`with model_slot(settings.chat_model): llm.invoke(...)`"""
+    return _gate(model).slot()
+
+
+def amodel_slot(model: str):
+    """`async with amodel_slot(settings.chat_model): await llm.ainvoke(...)`"""
+    return _gate(model).aslot()
+
+
+def _pool_connections(client) -> dict:
+    # httpx doesn't expose pool state publicly; read httpcore's view when it's there, and report
+    # unknowns rather than fail /metrics when a transport or version doesn't have it.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    conns = getattr(pool, "connections", None)
+    if conns is None:
+        return {"open": None, "idle": None}
+    try:
+        return {"open": len(conns), "idle": sum(1 for c in conns if c.is_idle())}
+    except Exception:
+        return {"open": len(conns), "idle": None}
+
+
+def pool_stats() -> dict:
+    return {
+        "http2": _HTTP2,
+        "max_connections": settings.openai_max_connections,
+        "max_keepalive": settings.openai_max_keepalive,
+        "sync_pool": _pool_connections(_http_client),
+        "async_pool": _pool_connections(_http_async_client),
+        "clients": len(_CLIENTS),
+        "models": {m: g.stats() for m, g in _GATES.items()},
+    }
+
+
+async def aclose_clients():
+    await _http_async_client.aclose()
+    _http_client.close()
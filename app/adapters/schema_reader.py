@@ -1,50 +1,133 @@
 # app/adapters/schema_reader.py
-from functools import lru_cache
+import hashlib
+import json
 from app.adapters.neo4j_client import run_read
 
-@lru_cache(maxsize=1)
-def schema_snapshot(max_nodes: int = 200):
-    labels = [r["label"] for r in run_read("CALL db.labels() YIELD label RETURN label")]
-    rels = [r["relationshipType"] for r in run_read("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
+_NODE_TYPE_PROPS = """
+CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+RETURN nodeLabels, propertyName
+"""
 
-    label_props = {}
-    for lab in labels:
-        rows = run_read(
-            f"MATCH (n:`{lab}`) WITH n LIMIT $max "
-            f"UNWIND keys(n) AS k RETURN DISTINCT k AS prop ORDER BY prop",
-            {"max": max_nodes},
+_REL_TYPE_PROPS = """
+CALL db.schema.relTypeProperties() YIELD relType, propertyName
+RETURN relType, propertyName
+"""
+
+# (start label, type, end label) triples as the schema graph reports them.
+_PATTERNS = """
+CALL db.schema.visualization() YIELD relationships
+UNWIND relationships AS r
+RETURN DISTINCT startNode(r).name AS start, type(r) AS rel, endNode(r).name AS end
+"""
+
+# Properties the maintenance scripts write on every node for the retrievers' own use. They are
+# not domain data, so they stay out of the snapshot (and the Cypher prompt).
+BOOKKEEPING_PROPS = frozenset({
+    "degree", "degree_updatedAt",                              # scripts/compute_degrees.py
+    "deg_types", "deg_counts",                                 # ... as written by earlier versions
+    "facts", "facts_degree", "facts_updatedAt",                # scripts/backfill_facts.py
+})
+
+_DISPLAY_PREF = ["NodeID","nodeId","id","code","name","title","canonical"]
+
+def _ident(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+def _sample_query(specs: list[tuple[str, str]]) -> tuple[str, dict]:
+    # Labels/property names can't be parameters: one UNION ALL branch per label, one statement per chunk.
+    # Each branch stops after $scan nodes, so a huge label costs the same as a small one.
+    parts, params = [], {}
+    for i, (lab, prop) in enumerate(specs):
+        parts.append(
+            f"MATCH (n:{_ident(lab)}) WHERE n.{_ident(prop)} IS NOT NULL WITH n LIMIT $scan "
+            f"RETURN $l{i} AS label, collect(DISTINCT toString(n.{_ident(prop)}))[..$samples] AS samples"
         )
-        props = [r["prop"] for r in rows]
+        params[f"l{i}"] = lab
+    return "\nUNION ALL\n".join(parts), params
 
+def schema_snapshot(scan: int = 1000, samples: int = 18, chunk: int = 40):
+    """
+    Read the live schema (uncached). Request paths read it via services.schema_catalog.
+
+    Labels and properties come from db.schema.nodeTypeProperties()/relTypeProperties();
+    example values for every label are fetched in ceil(labels / chunk) statements, each label
+    scanning at most `scan` nodes.
+    """
+    props_by_label: dict[str, set] = {}
+    for r in run_read(_NODE_TYPE_PROPS):
+        for lab in r["nodeLabels"]:
+            bucket = props_by_label.setdefault(lab, set())
+            if r["propertyName"] is not None and r["propertyName"] not in BOOKKEEPING_PROPS:
+                bucket.add(r["propertyName"])
+
+    rel_props: dict[str, set] = {}
+    for r in run_read(_REL_TYPE_PROPS):
+        rel = r["relType"][2:-1].replace("``", "`")  # ":`TYPE`" -> "TYPE"
+        bucket = rel_props.setdefault(rel, set())
+        if r["propertyName"] is not None:
+            bucket.add(r["propertyName"])
+
+    labels = sorted(props_by_label)
+    label_props = {}
+    for lab in labels:
+        props = sorted(props_by_label[lab])
         # choose a generic display property for citations
-        pref = ["NodeID","nodeId","id","code","name","title","canonical"]
-        display_prop = next((p for p in pref if p in props), (props[0] if props else None))
+        display_prop = next((p for p in _DISPLAY_PREF if p in props), (props[0] if props else None))
+        label_props[lab] = {"properties": props, "display_prop": display_prop, "samples": []}
+
+    # sample example values (stringifiable)
+    specs = [(lab, meta["display_prop"]) for lab, meta in label_props.items() if meta["display_prop"]]
+    for i in range(0, len(specs), chunk):
+        query, params = _sample_query(specs[i:i + chunk])
+        for r in run_read(query, {**params, "scan": scan, "samples": samples}):
+            label_props[r["label"]]["samples"] = list(r["samples"])
+
+    patterns = sorted({(r["start"], r["rel"], r["end"]) for r in run_read(_PATTERNS)})
 
-        # sample example values (stringifiable)
-        samples = []
-        if display_prop:
-            vals = run_read(
-                f"MATCH (n:`{lab}`) WHERE n.`{display_prop}` IS NOT NULL "
-                f"RETURN DISTINCT toString(n.`{display_prop}`) AS v LIMIT 18"
-            )
-            samples = [r["v"] for r in vals]
+    return {
+        "labels": labels,
+        "relationships": sorted(rel_props),
+        "label_props": label_props,
+        "rel_props": {rel: sorted(ps) for rel, ps in rel_props.items()},
+        "patterns": [list(p) for p in patterns],
+    }
 
-        label_props[lab] = {"properties": props, "display_prop": display_prop, "samples": samples}
+# Cheap change detectors: type lists + count-store totals (no scans). See services/schema_catalog.py.
+_FINGERPRINT = """
+CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+CALL { CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) AS rels }
+CALL { CALL db.propertyKeys() YIELD propertyKey RETURN collect(propertyKey) AS keys }
+CALL { MATCH (n) RETURN count(n) AS nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS edges }
+RETURN labels, rels, keys, nodes, edges
+"""
 
-    return {"labels": labels, "relationships": rels, "label_props": label_props}
+def _digest(payload: dict) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
-def relationship_filter() -> str:
-    rels = [r["relationshipType"] for r in run_read("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
-    return "|".join(sorted(set(rels)))
+def schema_fingerprints() -> tuple[str, str]:
+    """
+    (schema, data) fingerprints. The schema one covers labels, relationship types and property
+    keys only, so it moves when the shape of the graph does (keys for generated Cypher, prompts,
+    schema embeddings); the data one adds node/relationship counts and also moves on plain writes.
+    """
+    rows = run_read(_FINGERPRINT)
+    row = rows[0] if rows else {"labels": [], "rels": [], "keys": [], "nodes": 0, "edges": 0}
+    schema = {"labels": sorted(row["labels"]), "rels": sorted(row["rels"]), "keys": sorted(row["keys"])}
+    return _digest(schema), _digest({**schema, "nodes": row["nodes"], "edges": row["edges"]})
 
-def label_filter() -> str:
-    labs = [r["label"] for r in run_read("CALL db.labels() YIELD label RETURN label")]
-    return "+" + "|+".join(sorted(set(labs)))
+def expansion_filters_for(snapshot: dict) -> tuple[str, str]:
+    """(relationshipFilter, labelFilter) for apoc.path.expandConfig from a snapshot's type lists."""
+    rel = "|".join(sorted(set(snapshot["relationships"])))
+    lab = "+" + "|+".join(sorted(set(snapshot["labels"])))
+    return rel, lab
 
-def schema_text_for_llm(snapshot: dict, max_labels: int = 12) -> str:
+def schema_text_for_llm(snapshot: dict, max_labels: int = 12, patterns: bool = False) -> str:
     labels = snapshot["labels"][:max_labels]
     rels = snapshot["relationships"]
     parts = [ "Labels: " + ", ".join(labels), "Relationships: " + ", ".join(rels) ]
+    if patterns and snapshot.get("patterns"):
+        parts.append("Patterns: " + ", ".join(f"(:{a})-[:{r}]->(:{b})" for a, r, b in snapshot["patterns"]))
     for lab in labels:
         meta = snapshot["label_props"].get(lab, {})
         props = ", ".join(meta.get("properties", [])[:16]) or "(none)"
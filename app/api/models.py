@@ -5,9 +5,21 @@ class AskRouteIn(BaseModel):
     k: int = 8
     per_seed: int = 20
     org_limit: int = 25
+    concurrent: bool | None = None  # None → settings.ask_concurrent
 
 class AskRouteOut(BaseModel):
     answer: str
     question: str
     hybrid: dict
     cypher: dict
+    timings: dict = {}
+
+class AskBatchIn(BaseModel):
+    questions: list[str]
+    k: int = 8
+    per_seed: int = 20
+    org_limit: int = 25
+
+class AskBatchOut(BaseModel):
+    results: list[AskRouteOut]
+    timings: dict = {}
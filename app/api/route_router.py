@@ -1,12 +1,58 @@
+import json
+
 from fastapi import APIRouter
-from app.api.models import AskRouteIn, AskRouteOut
-from app.services.ask_service import ask_fused
-from app.services.fusion import fuse_answer
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.api.models import AskRouteIn, AskRouteOut, AskBatchIn, AskBatchOut
+from app.services.ask_service import aask_fused, astream_fused, aask_batch
+from app.services.embeddings import cache_stats as embedding_cache_stats
+from app.adapters.openai_client import pool_stats as openai_pool_stats
+from app.adapters.neo4j_client import query_stats as neo4j_query_stats
+from app.services.schema_catalog import get_catalog
+from app.services.neighbour_cache import cache_stats as neighbour_cache_stats
+from app.services.plan_cache import cache_stats as plan_cache_stats
+from app.services.cypher_guard import guard_stats as cypher_guard_stats
+from app.services.cypher_qa import speculation_stats as cypher_speculation_stats
+from app.services.schema_select import select_stats as schema_select_stats
 
 router = APIRouter()
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
 @router.post("/ask/route", response_model=AskRouteOut)
-def ask_route(body: AskRouteIn):
-    # ask_fused already runs: hybrid → cypher → fuse
-    return ask_fused(body.question, body.k, body.per_seed, body.org_limit)
-   
+async def ask_route(body: AskRouteIn):
+    # aask_fused already runs: (hybrid ‖ cypher) → fuse, without parking a threadpool worker
+    return await aask_fused(body.question, body.k, body.per_seed, body.org_limit, body.concurrent)
+
+@router.post("/ask/route/stream")
+async def ask_route_stream(body: AskRouteIn):
+    # Same pipeline as /ask/route, but evidence and answer tokens are pushed as server-sent events.
+    async def events():
+        async for event, data in astream_fused(body.question, body.k, body.per_seed, body.org_limit):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/ask/batch", response_model=AskBatchOut)
+async def ask_batch(body: AskBatchIn):
+    # One embeddings call + one KNN/expansion query per chunk; LLM stages fan out with a bound.
+    return await aask_batch(body.questions, body.k, body.per_seed, body.org_limit)
+
+@router.get("/metrics")
+def metrics():
+    return {
+        "embedding_cache": embedding_cache_stats(),
+        "openai": openai_pool_stats(),
+        "neo4j": neo4j_query_stats(),
+        "schema_catalog": get_catalog().stats(),
+        "neighbour_cache": neighbour_cache_stats(),
+        "plan_cache": plan_cache_stats(),
+        "cypher_guard": cypher_guard_stats(),
+        "cypher_speculation": cypher_speculation_stats(),
+        "schema_select": schema_select_stats(),
+    }
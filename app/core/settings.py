@@ -15,8 +15,27 @@ class Settings(BaseSettings):
     emb_model: str = Field(default="text-embedding-3-large",
                            validation_alias=AliasChoices("EMB_MODEL", "EMBEDDING_MODEL"))
 
+    # Embedding provider: "openai" | "local" (sentence-transformers, CPU) | "hashing" (deterministic, offline)
+    emb_provider: str = "openai"
+    local_emb_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    local_emb_device: str = "cpu"
+    local_emb_backend: str = "torch"   # or "onnx"
+    local_emb_batch: int = 64
+    local_emb_threads: int = 4
+    hash_emb_dims: int = 512
+    emb_dims: int | None = None        # shortened vectors (e.g. 256/512/1024); None = model's native size
+
     # OpenAI
-    openai_key: str = Field(validation_alias=AliasChoices("OPENAI_API_KEY", "OPENAI_KEY"))
+    # Optional so local/hashing embedding providers can run without it
+    openai_key: str = Field(default="", validation_alias=AliasChoices("OPENAI_API_KEY", "OPENAI_KEY"))
+
+    # OpenAI transport (shared httpx pool + per-model concurrency cap)
+    openai_max_connections: int = 64
+    openai_max_keepalive: int = 32
+    openai_keepalive_s: float = 30.0
+    openai_timeout_s: float = 60.0
+    openai_http2: bool = True
+    openai_model_concurrency: int = 16   # in-flight requests per model before callers queue
 
     # Neo4j
     neo4j_uri: str = Field(validation_alias=AliasChoices("NEO4J_URI", "NEO4J_URL"))
@@ -25,5 +44,81 @@ class Settings(BaseSettings):
 
     # Vector index
     vector_index: str = Field(default="emb_card_idx", validation_alias="VECTOR_INDEX")
+    emb_property: str = "embedding"   # node property the index covers (e.g. embedding_256)
+
+    # KNN backend: "neo4j" (db.index.vector.queryNodes) | "local" (in-process snapshot, scripts/export_vectors.py)
+    knn_backend: str = "neo4j"
+    local_ann_path: str = "data/vectors"
+    local_ann_reload_s: float = 30.0  # how often workers check for a newer snapshot
+    local_ann_ef: int = 128           # HNSW search breadth (only with hnsw.bin + hnswlib)
+
+    # Hybrid retrieval
+    seed_mode: str = "vector"         # "vector" | "hybrid" (vector + full-text seeds, reciprocal-rank fused)
+    fulltext_index: str = "card_fulltext_idx"  # scripts/create_fulltext_index.py
+    rrf_k: int = 60                   # RRF damping constant: score = sum 1 / (rrf_k + rank)
+    rrf_pool: int = 25                # candidates taken from each index before fusion
+    seed_select: str = "fixed"        # "fixed" (top k) | "adaptive" (gap/threshold cut + MMR, retrievers/seed_select.py)
+    seed_pool: int = 24               # adaptive: candidates over-fetched before cutting
+    seed_min_k: int = 1
+    seed_gap: float = 0.15            # adaptive: stop before a relative score drop larger than this
+    seed_threshold: float = 0.0       # adaptive: absolute score floor (vector scores; RRF scores are ~0.01-0.03)
+    seed_mmr_lambda: float = 0.7      # adaptive: 1.0 = pure relevance, lower = more diverse seeds
+    hybrid_single_query: bool = True  # KNN + filter + expansion in one Cypher statement
+    expansion_engine: str = "apoc"    # "apoc" (apoc.path.expandConfig) | "cypher" (native CALL subquery, no APOC)
+                                      # | "facts" (n.facts from scripts/backfill_facts.py)
+                                      # | "csr" (in-process snapshot from scripts/export_csr.py)
+    csr_path: str = "data/csr"
+    csr_reload_s: float = 30.0        # how often workers check for a newer CSR snapshot
+    hub_degree_threshold: int = 1000  # seeds with n.degree >= this are hubs (see scripts/compute_degrees.py); 0 = off
+    hub_rank: str = "degree"          # how hub neighbours are ranked: "degree" | "similarity" (to the question)
+    hub_scan: int = 5000              # edges of a hub looked at before ranking
+    hub_per_type: int = 5             # neighbours kept per relationship type of a hub
+    expansion_hops: int = 1           # >1 switches to beam-pruned multi-hop expansion (retrievers/multihop.py)
+    beam_width: int = 8               # frontier nodes kept per hop
+    rel_priors: dict[str, float] = {} # relationship type -> weight in (0, 1], e.g. {"GROWS": 1.0, "LOCATED_IN": 0.3}
+    rel_prior_default: float = 0.5    # weight of types not listed in rel_priors
+
+    # Neighbourhood cache: per-seed 1-hop triples, invalidated by catalog fingerprint or TTL
+    nbr_cache_size: int = 5000        # seeds kept; 0 disables (and re-enables the fused single query)
+    nbr_cache_ttl_s: float = 600.0    # upper bound on staleness for property-only edits; 0 = no TTL
+
+    # Cypher-QA: "chain" (GraphCypherQAChain: generate, run, LLM-summarize rows)
+    #          | "lean" (generate, validate, run; rows go straight to fusion, one LLM call fewer)
+    cypher_mode: str = "chain"
+    cypher_candidates: int = 1                 # >1: generate this many queries at once and run the first valid one
+    cypher_candidate_max_temp: float = 0.8     # candidates' temperatures spread from 0.1 up to this
+    # Generated-query guard (services/cypher_guard.py): EXPLAIN first, reject expensive plans into repair
+    cypher_guard: bool = True
+    cypher_cartesian_rows: int = 1000          # CartesianProduct allowed only below this estimate
+    cypher_max_scan_nodes: int = 100_000       # AllNodesScan allowed only on graphs smaller than this
+    cypher_max_estimated_rows: int = 1_000_000 # any operator estimated above this is rejected
+    cypher_timeout_s: float = 15.0             # server-side transaction timeout; 0 = none
+    cypher_max_rows: int = 1000                # rows fetched from a generated query; 0 = all
+
+    # Cypher plan cache: generated queries reused for same-shaped questions (services/plan_cache.py)
+    plan_cache_size: int = 1000       # plans kept; 0 disables
+    plan_cache_ttl_s: float = 3600.0  # 0 = until the schema fingerprint changes
+    plan_cache_threshold: float = 0.95  # cosine similarity for reuse when no template matches exactly
+
+    # Schema pruning: per-question subset of labels/relationships in the Cypher prompt (services/schema_select.py)
+    schema_prune: bool = False
+    schema_prompt_tokens: int = 1200  # budget for the label blocks (props, examples, value hints)
+    schema_prune_min_labels: int = 2  # always keep at least this many labels, even over budget
+
+    # Schema catalog: background fingerprint check interval (0 = load once, never refresh)
+    schema_refresh_s: float = 300.0
+
+    # Query-embedding cache
+    emb_cache_size: int = 10000       # in-process LRU entries; 0 disables the cache
+    emb_cache_ttl_s: float = 86400.0  # 0 = never expire
+    emb_cache_path: str | None = None # SQLite file shared by workers / restarts (optional)
+
+    # Ask pipeline
+    ask_concurrent: bool = True   # run hybrid + Cypher-QA branches side by side
+    ask_workers: int = 16         # threads shared by concurrent branches
+
+    # Batch endpoint
+    batch_size: int = 64          # questions per UNWIND'd KNN/expansion query
+    batch_concurrency: int = 8    # in-flight LLM stages (Cypher-QA, fusion) per batch
 
 settings = Settings()
\ No newline at end of file
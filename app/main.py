@@ -1,7 +1,12 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI
 from app.core.settings import settings
 from app.api.route_router import router as route_router
+from app.adapters.neo4j_client import close_driver, aclose_driver
+from app.adapters.openai_client import aclose_clients
+from app.adapters import csr_graph
 from fastapi.middleware.cors import CORSMiddleware  # 👈 import CORS middleware
 
 app = FastAPI(title="Graph-RAG")
@@ -19,5 +24,19 @@ app.add_middleware(
 
 app.include_router(route_router)
 
+
+@app.on_event("startup")
+async def _load_snapshots():
+    # Map the CSR snapshot before the first request instead of on the event loop during one.
+    if settings.expansion_engine == "csr":
+        await asyncio.to_thread(csr_graph.get_graph)
+
+
+@app.on_event("shutdown")
+async def _close_clients():
+    await aclose_driver()
+    close_driver()
+    await aclose_clients()
+
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host=settings.host, port=settings.port, reload=False)
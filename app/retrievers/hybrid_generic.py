@@ -1,39 +1,368 @@
 # app/retrievers/hybrid_generic.py
-from app.adapters.schema_reader import relationship_filter, label_filter
-from app.adapters.neo4j_client import run_read
-from app.services.embeddings import embed_one
+import asyncio
+
+from app.services.schema_catalog import expansion_filters, aexpansion_filters, get_catalog
+from app.services.neighbour_cache import get_cache as get_nbr_cache
+from app.adapters.neo4j_client import run_read, arun_read
+from app.services.embeddings import embed_one, aembed_one
+from app.adapters import local_ann, csr_graph
+from app.retrievers import multihop
+from app.retrievers.semantic import knn, aknn, seeds as select_seeds, aseeds as aselect_seeds, adaptive_seeds, rrf_params, RRF_SEEDS
 from app.core.settings import settings
 
-def knn(question: str, k: int = 8):
-    vec = embed_one(question)
-    return run_read("""
-      CALL db.index.vector.queryNodes($index, $k, $vec)
-      YIELD node, score
-      RETURN elementId(node) AS id,
-             labels(node) AS labels,
-             coalesce(node.NodeID, labels(node)[0] + ':' + coalesce(node.code, node.name)) AS nodeId,
-             score
-    """, {"index": settings.vector_index, "k": k, "vec": vec})
-
-def retrieve(question: str, k: int = 8, per_seed: int = 20, limit: int = 50):
-    seeds = knn(question, k=k)
-    if not seeds: return []
-    ids = [s["id"] for s in seeds]
-    return run_read("""
-      UNWIND $ids AS id
-      MATCH (seed) WHERE elementId(seed)=id
-      CALL apoc.path.expandConfig(seed, {
-        minLevel: 1, maxLevel: 1, bfs: true, limit: $perSeed,
-        relationshipFilter: $relFilter, labelFilter: $labFilter
-      }) YIELD path
-      WITH seed, nodes(path) AS ns, relationships(path) AS rs
-      WITH seed, ns[1] AS nbr, head(rs) AS r
-      RETURN DISTINCT
-        coalesce(seed.NodeID, labels(seed)[0] + ':' + coalesce(seed.code, seed.name)) AS a,
-        type(r) AS rel,
-        coalesce(nbr.NodeID, labels(nbr)[0] + ':' + coalesce(nbr.code, nbr.name)) AS b
-      LIMIT $limit
-    """, {
-      "ids": ids, "perSeed": per_seed, "limit": limit,
-      "relFilter": relationship_filter(), "labFilter": label_filter(),
+# Retrieval queries are assembled from fragments: a seed stage that binds `seed` (and `qi`
+# in batch queries), an expansion stage that binds `hub, rel, b` per seed, and a triple projection.
+_SEEDS_KNN = """
+  CALL db.index.vector.queryNodes($index, $k, $vec)
+  YIELD node AS seed
+"""
+
+# SEED_MODE=hybrid: vector + full-text candidates fused by reciprocal rank, still one statement.
+_SEEDS_RRF = RRF_SEEDS + """
+  WITH node AS seed
+"""
+
+_SEEDS_IDS = """
+  UNWIND $ids AS id
+  MATCH (seed) WHERE elementId(seed)=id
+"""
+
+# Expansion engines: subquery bodies over an imported `seed`, each returning `r, nbr`.
+_EXPAND_APOC = """
+    CALL apoc.path.expandConfig(seed, {
+      minLevel: 1, maxLevel: 1, bfs: true, limit: $perSeed,
+      relationshipFilter: $relFilter, labelFilter: $labFilter
+    }) YIELD path
+    WITH nodes(path) AS ns, relationships(path) AS rs
+    RETURN head(rs) AS r, ns[1] AS nbr
+"""
+
+# No APOC: the per-seed LIMIT lives inside the subquery, so the planner stops expanding each seed early.
+# The catalog's filters whitelist every type and label, which only ever excludes unlabelled neighbours.
+_EXPAND_CYPHER = """
+    MATCH (seed)-[r]-(nbr)
+    WHERE labels(nbr) <> []
+    RETURN r, nbr
+    LIMIT $perSeed
+"""
+
+# Hub seeds (degree from scripts/compute_degrees.py >= $hubDegree) skip BFS order: look at no more
+# than $hubScan edges, rank those neighbours, keep the best $hubPerType per relationship type.
+_EXPAND_HUB = """
+    MATCH (seed)-[r]-(nbr)
+    WHERE labels(nbr) <> []
+    WITH r, nbr, qv LIMIT $hubScan
+    WITH r, nbr, {rank} AS score
+    ORDER BY score DESC
+    WITH type(r) AS t, collect({{r: r, nbr: nbr, score: score}})[..$hubPerType] AS picks
+    UNWIND picks AS p
+    WITH p ORDER BY p.score DESC LIMIT $perSeed
+    RETURN p.r AS r, p.nbr AS nbr
+"""
+
+_HUB_RANK = {
+    "degree": "toFloat(coalesce(nbr.degree, 0))",
+    "similarity": "coalesce(vector.similarity.cosine(nbr[$embProp], qv), -1.0)",
+}
+
+_EXPAND = """
+  WITH {carry}seed, $hubDegree > 0 AND coalesce(seed.degree, 0) >= $hubDegree AS hub, {qv} AS qv
+  CALL {{
+    WITH seed, hub
+    WITH seed WHERE NOT hub
+{body}
+    UNION ALL
+    WITH seed, hub, qv
+    WITH seed, qv WHERE hub
+{hub_body}
+  }}
+  WITH {carry}seed, hub, type(r) AS rel,
+    coalesce(nbr.NodeID, labels(nbr)[0] + ':' + coalesce(nbr.code, nbr.name)) AS b
+"""
+
+# EXPANSION_ENGINE=facts: read the "REL\tb" summaries written by scripts/backfill_facts.py,
+# so expansion is a property read. Seeds not backfilled yet are expanded live.
+_EXPAND_FACTS = """
+  WITH {carry}seed, false AS hub
+  CALL {{
+    WITH seed
+    WITH seed WHERE seed.facts IS NOT NULL
+    UNWIND seed.facts[..$perSeed] AS f
+    WITH split(f, '\\t') AS p
+    RETURN p[0] AS rel, p[1] AS b
+    UNION ALL
+    WITH seed
+    WITH seed WHERE seed.facts IS NULL
+    MATCH (seed)-[r]-(nbr)
+    WHERE labels(nbr) <> []
+    WITH r, nbr LIMIT $perSeed
+    RETURN type(r) AS rel, coalesce(nbr.NodeID, labels(nbr)[0] + ':' + coalesce(nbr.code, nbr.name)) AS b
+  }}
+"""
+
+# `hubSeed` marks rows from a hub that had more neighbours than it was allowed to return.
+_TRIPLES = """
+  RETURN DISTINCT
+    coalesce(seed.NodeID, labels(seed)[0] + ':' + coalesce(seed.code, seed.name)) AS a,
+    rel, b,
+    CASE WHEN hub AND seed.degree > $perSeed THEN elementId(seed) END AS hubSeed
+  LIMIT $limit
+"""
+
+# Per-seed neighbourhoods (no global LIMIT) so each seed's triples can be cached on their own.
+_PER_SEED = """
+  WITH DISTINCT elementId(seed) AS seedId, hub,
+    hub AND seed.degree > $perSeed AS truncated,
+    coalesce(seed.NodeID, labels(seed)[0] + ':' + coalesce(seed.code, seed.name)) AS a,
+    rel, b
+  RETURN seedId, hub, truncated, collect({a: a, rel: rel, b: b}) AS triples
+"""
+
+# KNN + expansion for a whole batch of query vectors in one statement.
+# Seeds come from the vector index, or (local KNN backend) as precomputed elementIds per question.
+_BATCH_SEEDS_KNN = """
+  UNWIND range(0, size($vecs) - 1) AS qi
+  CALL {
+    WITH qi
+    CALL db.index.vector.queryNodes($index, $k, $vecs[qi]) YIELD node
+    RETURN collect(node) AS seeds
+  }
+  UNWIND seeds AS seed
+"""
+
+_BATCH_SEEDS_IDS = """
+  UNWIND range(0, size($seedIds) - 1) AS qi
+  UNWIND $seedIds[qi] AS id
+  MATCH (seed) WHERE elementId(seed) = id
+"""
+
+_BATCH_TRIPLES = """
+  WITH DISTINCT qi,
+    coalesce(seed.NodeID, labels(seed)[0] + ':' + coalesce(seed.code, seed.name)) AS a,
+    rel, b,
+    CASE WHEN hub AND seed.degree > $perSeed THEN elementId(seed) END AS hubSeed
+  WITH qi, collect({a: a, rel: rel, b: b})[..$limit] AS triples, collect(DISTINCT hubSeed) AS hubs
+  RETURN qi, triples, hubs
+"""
+
+def _local_knn() -> bool:
+    return settings.knn_backend == "local"
+
+def _single_query() -> bool:
+    # Local KNN, adaptive seed selection and the neighbourhood cache all need the seeds in Python
+    # before expansion.
+    return (settings.hybrid_single_query and not _local_knn() and not adaptive_seeds()
+            and not _use_nbr_cache() and not _csr())
+
+def _apoc() -> bool:
+    return settings.expansion_engine not in ("cypher", "facts", "csr")
+
+def _csr() -> bool:
+    return settings.expansion_engine == "csr"
+
+def _use_nbr_cache() -> bool:
+    # Precomputed facts are already a single property read per seed; CSR never asks Neo4j.
+    return get_nbr_cache().enabled and settings.expansion_engine not in ("facts", "csr")
+
+def _filters():
+    """Catalog filters for the APOC engine; the native engine needs none."""
+    return expansion_filters() if _apoc() else None
+
+async def _afilters():
+    return await aexpansion_filters() if _apoc() else None
+
+def _by_similarity() -> bool:
+    return settings.hub_degree_threshold > 0 and settings.hub_rank == "similarity"
+
+def _expansion(params: dict, filters, qv: str, batch: bool = False) -> str:
+    """Expansion fragment for the configured engine; `qv` is the Cypher expression of the query vector."""
+    if settings.expansion_engine == "facts":
+        return _EXPAND_FACTS.format(carry="qi, " if batch else "")
+    if filters is None:
+        body = _EXPAND_CYPHER
+    else:
+        body = _EXPAND_APOC
+        params["relFilter"], params["labFilter"] = filters
+    params.update({
+        "hubDegree": settings.hub_degree_threshold,
+        "hubScan": settings.hub_scan,
+        "hubPerType": settings.hub_per_type,
     })
+    rank = _HUB_RANK.get(settings.hub_rank, _HUB_RANK["degree"])
+    if _by_similarity():
+        params["embProp"] = settings.emb_property
+    else:
+        qv = "null"
+    return _EXPAND.format(
+        carry="qi, " if batch else "",
+        qv=qv, body=body, hub_body=_EXPAND_HUB.format(rank=rank),
+    )
+
+def _expand_query(ids, per_seed: int, limit: int, filters, vec=None):
+    params = {"ids": ids, "perSeed": per_seed, "limit": limit, "vec": vec}
+    return _SEEDS_IDS + _expansion(params, filters, "$vec") + _TRIPLES, params
+
+def _fused_query(vec, k: int, per_seed: int, limit: int, filters, lexical: dict | None = None):
+    # Vector (+ full-text) search, filtering and 1-hop expansion in one statement / one transaction.
+    params = {"index": settings.vector_index, "k": k, "vec": vec, "perSeed": per_seed, "limit": limit}
+    seeds = _SEEDS_KNN
+    if lexical:
+        params.update(lexical)
+        seeds = _SEEDS_RRF
+    return seeds + _expansion(params, filters, "$vec") + _TRIPLES, params
+
+def _triples(rows, stats: dict | None) -> list[dict]:
+    """Strip the hub marker off result rows; count truncated hub seeds into `stats` if given."""
+    if stats is not None:
+        stats["hub_seeds_truncated"] = len({r["hubSeed"] for r in rows if r["hubSeed"] is not None})
+    return [{"a": r["a"], "rel": r["rel"], "b": r["b"]} for r in rows]
+
+def _per_seed_query(ids, per_seed: int, filters, vec=None):
+    params = {"ids": ids, "perSeed": per_seed, "vec": vec}
+    return _SEEDS_IDS + _expansion(params, filters, "$vec") + _PER_SEED, params
+
+def _merge_cached(ids, per_seed: int, limit: int, version: str, cached: dict, rows, stats: dict | None):
+    """Store freshly expanded seeds, then concatenate all seeds' triples in seed order up to `limit`."""
+    cache = get_nbr_cache()
+    fresh = {sid: ([], False) for sid in ids if sid not in cached}  # no row = no neighbours
+    for r in rows:
+        fresh[r["seedId"]] = (list(r["triples"]), r["truncated"])
+        if r["hub"] and _by_similarity():
+            continue  # ranked against this question; not reusable
+        cache.put(r["seedId"], per_seed, version, fresh[r["seedId"]][0], r["truncated"])
+    for sid, (triples, truncated) in fresh.items():
+        if not triples:
+            cache.put(sid, per_seed, version, triples, truncated)
+
+    out, seen, truncated_hubs = [], set(), 0
+    for sid in ids:
+        triples, truncated = cached.get(sid) or fresh[sid]
+        truncated_hubs += bool(truncated)
+        for t in triples:
+            key = (t["a"], t["rel"], t["b"])
+            if key not in seen and len(out) < limit:
+                seen.add(key)
+                out.append(t)
+    if stats is not None:
+        stats["hub_seeds_truncated"] = truncated_hubs
+        stats["nbr_cache_hits"] = len(cached)
+    return out
+
+def _expand_cached(ids, per_seed: int, limit: int, vec, stats: dict | None):
+    version = get_catalog().current()["data_fingerprint"]
+    cached = get_nbr_cache().get_many(ids, per_seed, version)
+    missed = [sid for sid in ids if sid not in cached]
+    rows = run_read(*_per_seed_query(missed, per_seed, _filters(), vec)) if missed else []
+    return _merge_cached(ids, per_seed, limit, version, cached, rows, stats)
+
+async def _aexpand_cached(ids, per_seed: int, limit: int, vec, stats: dict | None):
+    version = (await get_catalog().acurrent())["data_fingerprint"]
+    cached = get_nbr_cache().get_many(ids, per_seed, version)
+    missed = [sid for sid in ids if sid not in cached]
+    rows = await arun_read(*_per_seed_query(missed, per_seed, await _afilters(), vec)) if missed else []
+    return _merge_cached(ids, per_seed, limit, version, cached, rows, stats)
+
+def retrieve(question: str, k: int = 8, per_seed: int = 20, limit: int = 50, stats: dict | None = None):
+    if _csr():
+        ids = [s["id"] for s in select_seeds(question, k=k, stats=stats)]
+        return csr_graph.expand(ids, per_seed, limit, settings.expansion_hops, stats)
+    if settings.expansion_hops > 1:
+        return multihop.retrieve(question, k=k, per_seed=per_seed, limit=limit, stats=stats)
+    if _single_query():
+        query = _fused_query(embed_one(question), k, per_seed, limit, _filters(), rrf_params(question, k))
+        return _triples(run_read(*query), stats)
+    seeds = select_seeds(question, k=k, stats=stats)
+    if not seeds: return _triples([], stats)
+    vec = embed_one(question) if _by_similarity() else None  # served from the embedding cache
+    ids = [s["id"] for s in seeds]
+    if _use_nbr_cache():
+        return _expand_cached(ids, per_seed, limit, vec, stats)
+    return _triples(run_read(*_expand_query(ids, per_seed, limit, _filters(), vec)), stats)
+
+async def aretrieve(question: str, k: int = 8, per_seed: int = 20, limit: int = 50, stats: dict | None = None):
+    if _csr():
+        ids = [s["id"] for s in await aselect_seeds(question, k=k, stats=stats)]
+        return await csr_graph.aexpand(ids, per_seed, limit, settings.expansion_hops, stats)
+    if settings.expansion_hops > 1:
+        return await multihop.aretrieve(question, k=k, per_seed=per_seed, limit=limit, stats=stats)
+    if _single_query():
+        vec = await aembed_one(question)
+        query = _fused_query(vec, k, per_seed, limit, await _afilters(), rrf_params(question, k))
+        return _triples(await arun_read(*query), stats)
+    seeds = await aselect_seeds(question, k=k, stats=stats)
+    if not seeds: return _triples([], stats)
+    vec = await aembed_one(question) if _by_similarity() else None
+    ids = [s["id"] for s in seeds]
+    if _use_nbr_cache():
+        return await _aexpand_cached(ids, per_seed, limit, vec, stats)
+    rows = await arun_read(*_expand_query(ids, per_seed, limit, await _afilters(), vec))
+    return _triples(rows, stats)
+
+def _batch_query(vecs, k: int, per_seed: int, limit: int, filters, seed_ids=None):
+    params = {"perSeed": per_seed, "limit": limit}
+    expand = _expansion(params, filters, "$vecs[qi]", batch=True)
+    if _local_knn():
+        params["seedIds"] = seed_ids if seed_ids is not None else _seed_id_lists(vecs, k)
+        if _by_similarity():
+            params["vecs"] = vecs
+        return _BATCH_SEEDS_IDS + expand + _BATCH_TRIPLES, params
+    params.update({"index": settings.vector_index, "vecs": vecs, "k": k})
+    return _BATCH_SEEDS_KNN + expand + _BATCH_TRIPLES, params
+
+def _by_question(rows, n: int, stats: list | None) -> list[list[dict]]:
+    # Questions whose seeds had no neighbours produce no row at all.
+    out: list[list[dict]] = [[] for _ in range(n)]
+    hubs = [0] * n
+    for r in rows:
+        out[r["qi"]] = list(r["triples"])
+        hubs[r["qi"]] = len(r["hubs"])
+    if stats is not None:
+        stats.extend({"hub_seeds_truncated": h} for h in hubs)
+    return out
+
+_BATCH_SEED_IDS = _BATCH_SEEDS_KNN + """
+  RETURN qi, collect(elementId(seed)) AS ids
+"""
+
+def _csr_batch(graph, id_lists, per_seed: int, limit: int, stats: list | None) -> list[list[dict]]:
+    out = []
+    for ids in id_lists:
+        st: dict = {}
+        out.append(graph.expand(ids, per_seed, limit, settings.expansion_hops, st))
+        if stats is not None:
+            stats.append(st)
+    return out
+
+def _seed_id_lists(vecs, k: int, rows=None) -> list[list[str]]:
+    if rows is None:
+        return [[s["id"] for s in local_ann.search(v, k)] for v in vecs]
+    lists: list[list[str]] = [[] for _ in vecs]
+    for r in rows:
+        lists[r["qi"]] = list(r["ids"])
+    return lists
+
+def retrieve_batch(vecs: list[list[float]], k: int = 8, per_seed: int = 20, limit: int = 50,
+                   stats: list | None = None):
+    """Triples per query vector (same order), using one round trip for the whole batch.
+    If `stats` is given, one stats dict per vector is appended to it. Always 1 hop (except CSR)."""
+    if not vecs: return []
+    if _csr():
+        rows = None if _local_knn() else run_read(_BATCH_SEED_IDS, {"index": settings.vector_index, "vecs": vecs, "k": k})
+        return _csr_batch(csr_graph.get_graph(), _seed_id_lists(vecs, k, rows), per_seed, limit, stats)
+    rows = run_read(*_batch_query(vecs, k, per_seed, limit, _filters()))
+    return _by_question(rows, len(vecs), stats)
+
+async def aretrieve_batch(vecs: list[list[float]], k: int = 8, per_seed: int = 20, limit: int = 50,
+                          stats: list | None = None):
+    if not vecs: return []
+    if _csr():
+        if _local_knn():
+            id_lists = await asyncio.to_thread(_seed_id_lists, vecs, k)
+        else:
+            rows = await arun_read(_BATCH_SEED_IDS, {"index": settings.vector_index, "vecs": vecs, "k": k})
+            id_lists = _seed_id_lists(vecs, k, rows)
+        return _csr_batch(await csr_graph.aget_graph(), id_lists, per_seed, limit, stats)
+    # Local KNN is NumPy/hnswlib work (and maybe a snapshot reload): keep it off the loop.
+    seed_ids = await asyncio.to_thread(_seed_id_lists, vecs, k) if _local_knn() else None
+    rows = await arun_read(*_batch_query(vecs, k, per_seed, limit, await _afilters(), seed_ids))
+    return _by_question(rows, len(vecs), stats)
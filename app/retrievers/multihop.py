@@ -0,0 +1,107 @@
+# app/retrievers/multihop.py
+"""
+Multi-hop expansion with beam pruning (EXPANSION_HOPS > 1).
+
+Starting from the seeds of semantic.seeds (scored by vector similarity), each hop expands
+the current frontier in one query and scores every neighbour as
+
+    score(nbr) = score(parent) * prior(type(r))
+
+with priors from settings.rel_priors. Only the best settings.beam_width unseen neighbours
+become the next frontier, and the walk stops as soon as `limit` triples are collected, so
+a 3-hop answer touches at most k + hops * beam_width nodes. Each hop gets an even share of
+what is left of `limit` (hop 1 of 3 with limit 25 keeps 9), so the first hop can't use up
+the whole budget before the walk gets anywhere.
+"""
+import math
+
+from app.adapters.neo4j_client import run_read, arun_read
+from app.core.settings import settings
+from app.retrievers.semantic import seeds, aseeds
+
+_HOP = """
+  UNWIND $frontier AS f
+  MATCH (src) WHERE elementId(src) = f.id
+  CALL {
+    WITH src
+    MATCH (src)-[r]-(nbr)
+    WHERE labels(nbr) <> [] AND NOT elementId(nbr) IN $visited
+    RETURN r, nbr
+    LIMIT $perNode
+  }
+  WITH src, r, nbr, f.score * coalesce($priors[type(r)], $defaultPrior) AS score
+  RETURN
+    coalesce(src.NodeID, labels(src)[0] + ':' + coalesce(src.code, src.name)) AS a,
+    type(r) AS rel,
+    coalesce(nbr.NodeID, labels(nbr)[0] + ':' + coalesce(nbr.code, nbr.name)) AS b,
+    elementId(nbr) AS nbrId,
+    score
+  ORDER BY score DESC
+  LIMIT $remaining
+"""
+
+
+class _Beam:
+    """Walk state shared by the sync and async drivers."""
+
+    def __init__(self, seeds, limit: int, per_seed: int, hops: int):
+        self.limit = limit
+        self.per_node = per_seed
+        self.hops = hops
+        self.frontier = [{"id": s["id"], "score": float(s["score"])} for s in seeds]
+        self.visited = {s["id"] for s in seeds}
+        self.triples: list[dict] = []
+        self.seen: set = set()
+        self.widths: list[int] = []
+
+    def pending(self) -> bool:
+        return bool(self.frontier) and len(self.widths) < self.hops and len(self.triples) < self.limit
+
+    def hop_budget(self) -> int:
+        left = self.limit - len(self.triples)
+        return math.ceil(left / max(1, self.hops - len(self.widths)))
+
+    def query(self):
+        return _HOP, {
+            "frontier": self.frontier,
+            "visited": list(self.visited),
+            "perNode": self.per_node,
+            "priors": settings.rel_priors,
+            "defaultPrior": settings.rel_prior_default,
+            "remaining": self.hop_budget(),
+        }
+
+    def advance(self, rows):
+        best: dict[str, float] = {}
+        for r in rows:
+            key = (r["a"], r["rel"], r["b"])
+            if key not in self.seen:
+                self.seen.add(key)
+                self.triples.append({"a": r["a"], "rel": r["rel"], "b": r["b"]})
+            best[r["nbrId"]] = max(best.get(r["nbrId"], 0.0), r["score"])
+        beam = sorted(best.items(), key=lambda kv: kv[1], reverse=True)[:settings.beam_width]
+        self.widths.append(len(self.frontier))
+        self.frontier = [{"id": i, "score": s} for i, s in beam]
+        self.visited.update(best)
+
+    def result(self, stats: dict | None) -> list[dict]:
+        if stats is not None:
+            stats["hops"] = len(self.widths)
+            stats["frontier_sizes"] = self.widths
+        return self.triples[:self.limit]
+
+
+def retrieve(question: str, k: int = 8, per_seed: int = 20, limit: int = 50,
+             hops: int | None = None, stats: dict | None = None):
+    beam = _Beam(seeds(question, k=k, stats=stats), limit, per_seed, hops or settings.expansion_hops)
+    while beam.pending():
+        beam.advance(run_read(*beam.query()))
+    return beam.result(stats)
+
+
+async def aretrieve(question: str, k: int = 8, per_seed: int = 20, limit: int = 50,
+                    hops: int | None = None, stats: dict | None = None):
+    beam = _Beam(await aseeds(question, k=k, stats=stats), limit, per_seed, hops or settings.expansion_hops)
+    while beam.pending():
+        beam.advance(await arun_read(*beam.query()))
+    return beam.result(stats)
@@ -0,0 +1,68 @@
+# app/retrievers/seed_select.py
+"""
+Adaptive seed selection (SEED_SELECT=adaptive).
+
+KNN over-fetches SEED_POOL candidates with their vectors; this module decides how many are
+worth expanding and which ones:
+
+  1. absolute cut   candidates scoring below SEED_THRESHOLD are dropped
+  2. gap cut        k ends before the first relative score drop larger than SEED_GAP
+  3. MMR            k seeds are picked from the remaining candidates, trading relevance for
+                    diversity with SEED_MMR_LAMBDA (1.0 = pure relevance)
+
+k always stays within [SEED_MIN_K, requested k].
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def cut_k(scores: np.ndarray, max_k: int, min_k: int, gap: float, threshold: float) -> tuple[int, int]:
+    """(k, eligible): how many seeds to keep and how many candidates pass the absolute cut.
+    `scores` must be sorted descending."""
+    n = len(scores)
+    if n == 0:
+        return 0, 0
+    eligible = int(np.count_nonzero(scores >= threshold)) or min(min_k, n)
+    k = eligible
+    if gap > 0 and eligible > 1:
+        head = scores[:eligible]
+        drops = (head[:-1] - head[1:]) / np.maximum(head[:-1], 1e-9)
+        big = np.flatnonzero(drops > gap)
+        if big.size:
+            k = int(big[0]) + 1
+    k = max(min(k, max_k), min(min_k, n))
+    return k, max(eligible, k)
+
+
+def mmr(scores: np.ndarray, vecs: np.ndarray, k: int, lam: float) -> list[int]:
+    """Indices of k rows chosen by maximal marginal relevance (cosine on L2-normalized rows)."""
+    if k >= len(scores) or lam >= 1.0:
+        return list(range(min(k, len(scores))))
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    unit = vecs / np.where(norms == 0, 1.0, norms)
+    sims = unit @ unit.T
+    chosen = [0]  # best-scoring candidate always goes first
+    redundancy = sims[0].copy()
+    for _ in range(1, k):
+        gain = lam * scores - (1.0 - lam) * redundancy
+        gain[chosen] = -np.inf
+        nxt = int(np.argmax(gain))
+        chosen.append(nxt)
+        redundancy = np.maximum(redundancy, sims[nxt])
+    return chosen
+
+
+def select(candidates: list, max_k: int, min_k: int = 1, gap: float = 0.15, threshold: float = 0.0,
+           lam: float = 0.7) -> list:
+    """Pick seeds from KNN rows carrying `score` and `vec`, best first by score."""
+    rows = sorted(candidates, key=lambda r: r["score"], reverse=True)
+    scores = np.asarray([r["score"] for r in rows], dtype=np.float32)
+    k, eligible = cut_k(scores, max_k, min_k, gap, threshold)
+    if k == 0:
+        return []
+    pool = rows[:eligible]
+    if any(r.get("vec") is None for r in pool):
+        return pool[:k]  # nothing to diversify on (e.g. node without a stored vector)
+    vecs = np.asarray([r["vec"] for r in pool], dtype=np.float32)
+    return [pool[i] for i in mmr(scores[:eligible], vecs, k, lam)]
@@ -1,15 +1,148 @@
-from app.adapters.neo4j_client import run_read
+import asyncio
+import re
+
+from app.adapters.neo4j_client import run_read, arun_read
 from app.core.settings import settings
-from app.services.embeddings import embed_one
+from app.services.embeddings import embed_one, aembed_one
+from app.adapters import local_ann
+from app.retrievers import seed_select
+
+_KNN_CYPHER = """
+CALL db.index.vector.queryNodes($index, $k, $v)
+YIELD node, score
+"""
+
+_SEED_ROW = """
+RETURN elementId(node) AS id,
+       labels(node) AS labels,
+       coalesce(node.NodeID, labels(node)[0] + ':' + coalesce(node.code, node.name)) AS nodeId,
+       score
+"""
+
+# Adaptive selection diversifies on the candidates' stored vectors.
+_SEED_ROW_VEC = _SEED_ROW + """       , node[$prop] AS vec
+"""
+
+# Vector and full-text candidates merged by reciprocal-rank fusion: binds `node, score`.
+RRF_SEEDS = """
+  CALL {
+    CALL db.index.vector.queryNodes($index, $pool, $vec) YIELD node
+    WITH collect(node) AS ranked
+    UNWIND range(0, size(ranked) - 1) AS i
+    RETURN ranked[i] AS node, 1.0 / ($rrfK + i + 1) AS rrf
+    UNION ALL
+    CALL db.index.fulltext.queryNodes($ftIndex, $lucene, {limit: $pool}) YIELD node
+    WITH collect(node) AS ranked
+    UNWIND range(0, size(ranked) - 1) AS i
+    RETURN ranked[i] AS node, 1.0 / ($rrfK + i + 1) AS rrf
+  }
+  WITH node, sum(rrf) AS score
+  ORDER BY score DESC
+  LIMIT $k
+"""
+
+_FULLTEXT_CYPHER = """
+CALL db.index.fulltext.queryNodes($ftIndex, $lucene, {limit: $pool})
+YIELD node, score
+"""
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+_TERM = re.compile(r"[\w][\w:.\-']*")
+_STOP = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "has", "have", "how",
+    "in", "is", "it", "of", "on", "or", "that", "the", "to", "was", "what", "which", "who", "with",
+}
+
+def _lucene_term(t: str) -> str:
+    if t in ("AND", "OR", "NOT"):
+        return f'"{t}"'  # state code, not an operator
+    return _LUCENE_SPECIAL.sub(r"\\\1", t)
+
+def lucene_query(text: str) -> str:
+    """Escaped OR-query of the question's terms ('' if nothing is left to search for)."""
+    # All-caps tokens are codes ("OR", "IN"), never stopwords.
+    terms = [t for t in _TERM.findall(text) if t.isupper() or t.lower() not in _STOP]
+    return " ".join(_lucene_term(t) for t in terms)
+
+def hybrid_seeds() -> bool:
+    return settings.seed_mode == "hybrid"
 
-def knn(question: str, k: int = 8):
+def rrf_params(question: str, k: int) -> dict | None:
+    """Full-text/RRF parameters when SEED_MODE=hybrid and the question has searchable terms."""
+    if not hybrid_seeds():
+        return None
+    lucene = lucene_query(question)
+    if not lucene:
+        return None
+    return {
+        "ftIndex": settings.fulltext_index, "lucene": lucene,
+        "pool": max(k, settings.rrf_pool), "rrfK": settings.rrf_k,
+    }
+
+def rrf_merge(ranked_lists, k: int) -> list[dict]:
+    """Reciprocal-rank fusion of seed lists (same row shape as knn); score = summed 1/(rrf_k + rank)."""
+    fused: dict[str, dict] = {}
+    for rows in ranked_lists:
+        for rank, row in enumerate(rows):
+            hit = fused.setdefault(row["id"], {**dict(row), "score": 0.0})
+            hit["score"] += 1.0 / (settings.rrf_k + rank + 1)
+    return sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:k]
+
+def _row(with_vectors: bool) -> str:
+    return _SEED_ROW_VEC if with_vectors else _SEED_ROW
+
+def _knn_query(qemb, k: int, lexical: dict | None, with_vectors: bool):
+    params = {"index": settings.vector_index, "k": k, "prop": settings.emb_property}
+    if lexical:
+        return RRF_SEEDS + _row(with_vectors), {**params, **lexical, "vec": qemb}
+    return _KNN_CYPHER + _row(with_vectors), {**params, "v": qemb}
+
+def _fulltext_query(lexical: dict, with_vectors: bool):
+    return _FULLTEXT_CYPHER + _row(with_vectors), {**lexical, "prop": settings.emb_property}
+
+def knn(question: str, k: int = 8, with_vectors: bool = False):
     qemb = embed_one(question)
-    cypher = """
-    CALL db.index.vector.queryNodes($index, $k, $v)
-    YIELD node, score
-    RETURN elementId(node) AS id,
-           labels(node) AS labels,
-           coalesce(node.NodeID, labels(node)[0] + ':' + coalesce(node.code, node.name)) AS nodeId,
-           score
-    """
-    return run_read(cypher, {"index": settings.vector_index, "k": k, "v": qemb})
+    lexical = rrf_params(question, k)
+    if settings.knn_backend == "local":
+        if lexical:
+            dense = local_ann.search(qemb, lexical["pool"], with_vectors)
+            return rrf_merge([dense, run_read(*_fulltext_query(lexical, with_vectors))], k)
+        return local_ann.search(qemb, k, with_vectors)
+    return run_read(*_knn_query(qemb, k, lexical, with_vectors))
+
+async def aknn(question: str, k: int = 8, with_vectors: bool = False):
+    qemb = await aembed_one(question)
+    lexical = rrf_params(question, k)
+    if settings.knn_backend == "local":
+        if lexical:
+            dense, sparse = await asyncio.gather(
+                asyncio.to_thread(local_ann.search, qemb, lexical["pool"], with_vectors),
+                arun_read(*_fulltext_query(lexical, with_vectors)),
+            )
+            return rrf_merge([dense, sparse], k)
+        return await asyncio.to_thread(local_ann.search, qemb, k, with_vectors)
+    return await arun_read(*_knn_query(qemb, k, lexical, with_vectors))
+
+def adaptive_seeds() -> bool:
+    return settings.seed_select == "adaptive"
+
+def _pick(candidates, k: int, stats: dict | None):
+    chosen = seed_select.select(
+        candidates, max_k=k, min_k=settings.seed_min_k, gap=settings.seed_gap,
+        threshold=settings.seed_threshold, lam=settings.seed_mmr_lambda,
+    )
+    if stats is not None:
+        stats["seeds"] = len(chosen)
+        stats["seed_candidates"] = len(candidates)
+    return chosen
+
+def seeds(question: str, k: int = 8, stats: dict | None = None):
+    """Seeds to expand: the top k, or (SEED_SELECT=adaptive) up to k chosen from an over-fetched pool."""
+    if not adaptive_seeds():
+        return knn(question, k=k)
+    return _pick(knn(question, k=max(k, settings.seed_pool), with_vectors=True), k, stats)
+
+async def aseeds(question: str, k: int = 8, stats: dict | None = None):
+    if not adaptive_seeds():
+        return await aknn(question, k=k)
+    return _pick(await aknn(question, k=max(k, settings.seed_pool), with_vectors=True), k, stats)
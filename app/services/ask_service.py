@@ -1,32 +1,280 @@
-from app.retrievers.hybrid_generic import retrieve as hybrid_retrieve
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.settings import settings
+from app.retrievers.hybrid_generic import (
+    retrieve as hybrid_retrieve, aretrieve as hybrid_aretrieve, aretrieve_batch as hybrid_aretrieve_batch,
+)
+from app.services.embeddings import aembed_many
 from app.utils.facts import make_triple_facts
-from app.services.cypher_qa import run_cypher_qa
-from app.services.fusion import fuse_answer  
-def ask_fused(question: str, k: int = 8, per_seed: int = 20, org_limit: int = 25):
-    # 1. HYBRID triples
-    triples = hybrid_retrieve(question, k=k, per_seed=per_seed, limit=org_limit)
+from app.services.cypher_qa import run_cypher_qa, arun_cypher_qa
+from app.services.fusion import fuse_answer, afuse_answer, astream_fuse_answer
+
+# Shared by all requests so concurrent mode doesn't spin up threads per call.
+_POOL = ThreadPoolExecutor(max_workers=settings.ask_workers, thread_name_prefix="ask")
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _hybrid_ok(triples, stats: dict | None = None) -> dict:
     facts_text, citations = make_triple_facts(triples)
+    return {"facts": facts_text, "citations": citations, "triples": triples, "stats": stats or {}}
 
-    # 2. CYPHER QA
-    cy = run_cypher_qa(question)  
 
-    # 3. Fuse into a final answer
-    answer = fuse_answer(
-        question=question,
-        facts=facts_text,
-        cypher_result=cy["result"],
-        cypher_context=cy["context"],
-        citations=citations,
-    )
+def _hybrid_failed(e: Exception) -> dict:
+    # A failed hybrid branch still lets the Cypher branch answer.
+    facts_text, _ = make_triple_facts([])
+    return {"facts": facts_text, "citations": [], "triples": [],
+            "error": f"{type(e).__name__}: {e}"}
 
+
+def _cypher_failed(e: Exception) -> dict:
+    # run_cypher_qa guards the query itself; this catches chain/schema setup failures.
+    return {
+        "result": "I don't know.",
+        "cypher": "(unavailable)",
+        "steps": [{"error": f"{type(e).__name__}: {e}"}],
+        "context": "(none)",
+    }
+
+
+def _hybrid_branch(question: str, k: int, per_seed: int, org_limit: int):
+    start = time.perf_counter()
+    try:
+        stats: dict = {}
+        out = _hybrid_ok(hybrid_retrieve(question, k=k, per_seed=per_seed, limit=org_limit, stats=stats), stats)
+    except Exception as e:
+        out = _hybrid_failed(e)
+    return out, _ms(start)
+
+
+def _cypher_branch(question: str):
+    start = time.perf_counter()
+    try:
+        out = run_cypher_qa(question)
+    except Exception as e:
+        out = _cypher_failed(e)
+    return out, _ms(start)
+
+
+async def _ahybrid_branch(question: str, k: int, per_seed: int, org_limit: int):
+    start = time.perf_counter()
+    try:
+        stats: dict = {}
+        out = _hybrid_ok(await hybrid_aretrieve(question, k=k, per_seed=per_seed, limit=org_limit, stats=stats), stats)
+    except Exception as e:
+        out = _hybrid_failed(e)
+    return out, _ms(start)
+
+
+async def _acypher_branch(question: str):
+    start = time.perf_counter()
+    try:
+        out = await arun_cypher_qa(question)
+    except Exception as e:
+        out = _cypher_failed(e)
+    return out, _ms(start)
+
+
+def _fuse_kwargs(question: str, hybrid: dict, cy: dict) -> dict:
+    return {
+        "question": question,
+        "facts": hybrid["facts"],
+        "cypher_result": cy["result"],
+        "cypher_context": cy["context"],
+        "citations": hybrid["citations"],
+    }
+
+
+def _response(question: str, answer: str, hybrid: dict, cy: dict, timings: dict) -> dict:
     return {
         "answer": answer,
         "question": question,
-        "hybrid": {"facts": facts_text, "citations": citations, "triples": triples},
+        "hybrid": hybrid,
         "cypher": {
             "result": cy["result"],
             "cypher": cy["cypher"],
             "steps": cy["steps"],
             "context": cy["context"],
+            "plan_cache": cy.get("plan_cache", "off"),
         },
+        "timings": timings,
+    }
+
+
+def ask_fused(
+    question: str,
+    k: int = 8,
+    per_seed: int = 20,
+    org_limit: int = 25,
+    concurrent: bool | None = None,
+):
+    start = time.perf_counter()
+    if concurrent is None:
+        concurrent = settings.ask_concurrent
+
+    # 1 + 2. HYBRID triples and CYPHER QA are independent until fusion
+    if concurrent:
+        hy_future = _POOL.submit(_hybrid_branch, question, k, per_seed, org_limit)
+        cy_future = _POOL.submit(_cypher_branch, question)
+        hybrid, hybrid_ms = hy_future.result()
+        cy, cypher_ms = cy_future.result()
+    else:
+        hybrid, hybrid_ms = _hybrid_branch(question, k, per_seed, org_limit)
+        cy, cypher_ms = _cypher_branch(question)
+
+    # 3. Fuse into a final answer
+    fuse_start = time.perf_counter()
+    answer = fuse_answer(**_fuse_kwargs(question, hybrid, cy))
+
+    return _response(question, answer, hybrid, cy, {
+        "concurrent": concurrent,
+        "hybrid_ms": hybrid_ms,
+        "cypher_ms": cypher_ms,
+        "fusion_ms": _ms(fuse_start),
+        "total_ms": _ms(start),
+    })
+
+
+async def aask_fused(
+    question: str,
+    k: int = 8,
+    per_seed: int = 20,
+    org_limit: int = 25,
+    concurrent: bool | None = None,
+):
+    """Async twin of ask_fused: no worker threads, branches are awaited on the event loop."""
+    start = time.perf_counter()
+    if concurrent is None:
+        concurrent = settings.ask_concurrent
+
+    if concurrent:
+        (hybrid, hybrid_ms), (cy, cypher_ms) = await asyncio.gather(
+            _ahybrid_branch(question, k, per_seed, org_limit),
+            _acypher_branch(question),
+        )
+    else:
+        hybrid, hybrid_ms = await _ahybrid_branch(question, k, per_seed, org_limit)
+        cy, cypher_ms = await _acypher_branch(question)
+
+    fuse_start = time.perf_counter()
+    answer = await afuse_answer(**_fuse_kwargs(question, hybrid, cy))
+
+    return _response(question, answer, hybrid, cy, {
+        "concurrent": concurrent,
+        "hybrid_ms": hybrid_ms,
+        "cypher_ms": cypher_ms,
+        "fusion_ms": _ms(fuse_start),
+        "total_ms": _ms(start),
+    })
+
+
+async def astream_fused(question: str, k: int = 8, per_seed: int = 20, org_limit: int = 25):
+    """
+    Progressive variant of aask_fused. Yields (event, payload) pairs:
+      - "hybrid": FACTS/citations as soon as hybrid retrieval finishes
+      - "cypher": generated Cypher + rows as soon as Cypher-QA finishes
+      - "token":  fused answer chunks as the LLM streams them
+      - "done":   full answer and timings
+    """
+    start = time.perf_counter()
+
+    async def _tagged(name, coro):
+        return name, await coro
+
+    branches = [
+        asyncio.ensure_future(_tagged("hybrid", _ahybrid_branch(question, k, per_seed, org_limit))),
+        asyncio.ensure_future(_tagged("cypher", _acypher_branch(question))),
+    ]
+    got: dict = {}
+    timings: dict = {"concurrent": True}
+    try:
+        for fut in asyncio.as_completed(branches):
+            name, (out, ms) = await fut
+            got[name] = out
+            timings[f"{name}_ms"] = ms
+            yield name, {**out, "ms": ms}
+    finally:
+        # Client went away mid-stream: don't leave branches running.
+        for b in branches:
+            b.cancel()
+
+    fuse_start = time.perf_counter()
+    chunks: list[str] = []
+    async for text in astream_fuse_answer(**_fuse_kwargs(question, got["hybrid"], got["cypher"])):
+        chunks.append(text)
+        yield "token", {"text": text}
+
+    timings["fusion_ms"] = _ms(fuse_start)
+    timings["total_ms"] = _ms(start)
+    yield "done", {"answer": "".join(chunks).strip(), "question": question, "timings": timings}
+
+
+async def _ahybrid_batch(questions: list[str], k: int, per_seed: int, org_limit: int):
+    start = time.perf_counter()
+    try:
+        vecs = await aembed_many(questions)
+    except Exception as e:
+        return [_hybrid_failed(e) for _ in questions], _ms(start)
+
+    out: list[dict] = []
+    step = max(1, settings.batch_size)
+    for i in range(0, len(questions), step):
+        chunk = vecs[i:i + step]
+        try:
+            stats: list = []
+            lists = await hybrid_aretrieve_batch(chunk, k=k, per_seed=per_seed, limit=org_limit, stats=stats)
+            out += [_hybrid_ok(t, st) for t, st in zip(lists, stats)]
+        except Exception as e:
+            # A failed chunk only blanks the hybrid evidence of its own questions.
+            out += [_hybrid_failed(e) for _ in chunk]
+    return out, _ms(start)
+
+
+async def aask_batch(questions: list[str], k: int = 8, per_seed: int = 20, org_limit: int = 25):
+    """
+    Answer many questions at once. Embeddings are one request, KNN + expansion is one
+    UNWIND'd query per settings.batch_size questions, and the per-question LLM stages
+    (Cypher-QA, fusion) fan out under a settings.batch_concurrency semaphore.
+    Results come back in input order with the same shape as aask_fused.
+    """
+    start = time.perf_counter()
+    if not questions:
+        return {"results": [], "timings": {"total_ms": _ms(start)}}
+    sem = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    async def _cypher(q: str):
+        async with sem:
+            return await _acypher_branch(q)
+
+    # Cypher-QA doesn't need the hybrid evidence, so it starts while the batch retrieval runs.
+    cy_tasks = [asyncio.ensure_future(_cypher(q)) for q in questions]
+    try:
+        hybrids, hybrid_ms = await _ahybrid_batch(questions, k, per_seed, org_limit)
+    except BaseException:
+        for t in cy_tasks:
+            t.cancel()
+        raise
+
+    async def _finish(i: int):
+        cy, cypher_ms = await cy_tasks[i]
+        async with sem:
+            fuse_start = time.perf_counter()
+            answer = await afuse_answer(**_fuse_kwargs(questions[i], hybrids[i], cy))
+        return _response(questions[i], answer, hybrids[i], cy, {
+            "concurrent": True,
+            "batched": True,
+            "hybrid_ms": hybrid_ms,  # wall time of the shared batch retrieval
+            "cypher_ms": cypher_ms,
+            "fusion_ms": _ms(fuse_start),
+            "total_ms": _ms(start),  # since the batch started
+        })
+
+    results = await asyncio.gather(*(_finish(i) for i in range(len(questions))))
+    return {
+        "results": results,
+        "timings": {"questions": len(questions), "hybrid_ms": hybrid_ms, "total_ms": _ms(start)},
     }
@@ -0,0 +1,94 @@
+# app/services/cypher_guard.py
+"""
+Pre-execution check for LLM-generated Cypher.
+
+The query is EXPLAINed (planned, not run) and rejected when the plan contains
+  - a CartesianProduct estimated above CYPHER_CARTESIAN_ROWS,
+  - an AllNodesScan over more than CYPHER_MAX_SCAN_NODES nodes,
+  - any operator estimated above CYPHER_MAX_ESTIMATED_ROWS (e.g. an unbounded variable-length match).
+A rejection raises CypherRejected, whose message is fed to the repair prompt instead of running
+the query. Queries that pass still run under CYPHER_TIMEOUT_S and CYPHER_MAX_ROWS.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from app.adapters.neo4j_client import explain, aexplain
+from app.core.settings import settings
+
+
+class CypherRejected(ValueError):
+    """The plan of a generated query is too expensive to run."""
+
+
+_COUNTS = {"checked": 0, "rejected": 0}
+_REASONS: dict[str, int] = {}
+_LOCK = threading.Lock()
+
+
+def _operators(plan: dict):
+    stack = [plan]
+    while stack:
+        op = stack.pop()
+        yield op
+        stack.extend(op.get("children") or [])
+
+
+def _op_name(op: dict) -> str:
+    return (op.get("operatorType") or "").split("@")[0]   # "CartesianProduct@neo4j"
+
+
+def _rows(op: dict) -> float:
+    # ResultSummary.plan is the raw Bolt plan: operator arguments live under "args".
+    return float((op.get("args") or {}).get("EstimatedRows") or 0.0)
+
+
+def plan_problem(plan: dict) -> Optional[tuple[str, str]]:
+    """(kind, explanation) for the first reason to reject `plan`, or None."""
+    for op in _operators(plan):
+        name, rows = _op_name(op), _rows(op)
+        if name == "CartesianProduct" and rows > settings.cypher_cartesian_rows:
+            return "cartesian_product", (
+                f"the plan has a CartesianProduct of ~{rows:,.0f} rows; connect the MATCH patterns "
+                "through a relationship or a shared variable")
+        if name == "AllNodesScan" and rows > settings.cypher_max_scan_nodes:
+            return "all_nodes_scan", (
+                f"the plan scans all ~{rows:,.0f} nodes; give every node pattern a label")
+        if rows > settings.cypher_max_estimated_rows:
+            return "estimated_rows", (
+                f"{name} is estimated at ~{rows:,.0f} rows; bound variable-length patterns "
+                "(e.g. *1..3), filter earlier and aggregate or LIMIT")
+    return None
+
+
+def _verdict(plan: dict):
+    problem = plan_problem(plan)
+    with _LOCK:
+        _COUNTS["checked"] += 1
+        if problem:
+            _COUNTS["rejected"] += 1
+            _REASONS[problem[0]] = _REASONS.get(problem[0], 0) + 1
+    if problem:
+        raise CypherRejected(f"Query rejected before execution: {problem[1]}.")
+
+
+def check(cypher: str, params: dict | None = None):
+    """Raise CypherRejected if the plan of `cypher` is too expensive (no-op with CYPHER_GUARD=false)."""
+    if settings.cypher_guard:
+        _verdict(explain(cypher, params))
+
+
+async def acheck(cypher: str, params: dict | None = None):
+    if settings.cypher_guard:
+        _verdict(await aexplain(cypher, params))
+
+
+def run_limits() -> dict:
+    """run_read/arun_read keyword arguments for generated queries."""
+    return {"timeout": settings.cypher_timeout_s or None, "max_rows": settings.cypher_max_rows or None}
+
+
+def guard_stats() -> dict:
+    with _LOCK:
+        return {**_COUNTS, "reasons": dict(_REASONS)}
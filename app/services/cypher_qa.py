@@ -1,26 +1,57 @@
 # app/services/cypher_qa.py
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import re
+import threading
 
-from langchain_openai import ChatOpenAI
 from langchain_neo4j import Neo4jGraph, GraphCypherQAChain
+from langchain_neo4j.chains.graph_qa.cypher import extract_cypher
+from langchain_neo4j.chains.graph_qa.cypher_utils import CypherQueryCorrector
+from langchain_neo4j.graphs.neo4j_graph import _value_sanitize
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
 
 from app.prompts.cypher_prompt import _CYPHER_PROMPT
 from app.core.settings import settings
-from app.adapters.schema_reader import schema_snapshot, schema_text_for_llm
+from app.adapters.openai_client import make_chat, model_slot, amodel_slot
+from app.adapters.neo4j_client import run_read, arun_read
+from app.adapters.schema_reader import schema_text_for_llm
+from app.services import cypher_guard, schema_select
+from app.services.cypher_guard import CypherRejected
+from app.services.embeddings import embed_one, aembed_one
+from app.services.plan_cache import get_cache as get_plan_cache, make_plan, mask_question
+from app.services.schema_catalog import get_catalog
+
+class _LimitedGraph(Neo4jGraph):
+    """
+    Neo4jGraph whose queries (the chain's generated Cypher) run through run_read under
+    cypher_guard.run_limits(): rows past CYPHER_MAX_ROWS are never pulled into the worker.
+    Schema introspection (refresh_schema) uses the driver directly and is not capped.
+    """
+
+    def query(self, query: str, params: dict = {}, session_params: dict = {}) -> List[Dict[str, Any]]:
+        rows = [r.data() for r in run_read(query, params, **cypher_guard.run_limits())]
+        return [_value_sanitize(r) for r in rows] if self.sanitize else rows
+
 
 _CHAIN: Optional[GraphCypherQAChain] = None
 _SCHEMA_TEXT: Optional[str] = None
 _GRAPH: Optional[Neo4jGraph] = None
+_CHAIN_FINGERPRINT: Optional[str] = None  # catalog version the cached chain was built from
+_CANDIDATES: List[Runnable] = []          # speculative generators, rebuilt with the chain
+
+# Generated queries must be read-only. run_read sessions are READ_ACCESS, so the server refuses
+# writes either way; this only rejects the obvious ones before a round trip.
+_WRITE_CLAUSE = re.compile(r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|LOAD\s+CSV|FOREACH)\b", re.I)
 
 # One automatic repair attempt is usually enough to turn a syntax/runtime error
 # into a good query when the model sees the Neo4j error text.
 MAX_REPAIRS = 1
 
 
-def _make_value_hints_text(max_labels: int = 10, max_examples_per_label: int = 10) -> str:
-    snap = schema_snapshot()
+def _make_value_hints_text(snap: dict, max_labels: int = 10, max_examples_per_label: int = 10) -> str:
     lines: List[str] = []
     used = 0
     for lab, meta in snap.get("label_props", {}).items():
@@ -58,9 +89,7 @@ def _format_context_preview(intermediate_steps: Any, max_rows: int = 40) -> str:
     """Render a compact preview of the rows the generated Cypher returned."""
     try:
         steps = intermediate_steps or []
-        if not steps or not isinstance(steps[0], dict):
-            return "(none)"
-        ctx = steps[0].get("context") or []
+        ctx = next((st.get("context") for st in steps if isinstance(st, dict) and "context" in st), None) or []
         lines = []
         for i, row in enumerate(ctx[:max_rows], start=1):
             if isinstance(row, dict):
@@ -74,29 +103,63 @@ def _format_context_preview(intermediate_steps: Any, max_rows: int = 40) -> str:
         return "(none)"
 
 
+class _GuardedCorrector(CypherQueryCorrector):
+    """
+    Schema correction followed by the EXPLAIN cost guard. GraphCypherQAChain calls this between
+    generation and graph.query, so a rejected plan aborts the chain (and goes to repair) unrun.
+    """
+
+    def correct(self, query: str) -> str:
+        """Schema correction only, for callers that run the (async) guard themselves."""
+        return super().__call__(query)
+
+    def __call__(self, query: str) -> str:
+        query = self.correct(query)
+        if query:
+            cypher_guard.check(query)
+        return query
+
+
+def _candidate_temperatures(n: int) -> List[float]:
+    # Candidate 0 is the regular generator (0.1); the rest spread up to CYPHER_CANDIDATE_MAX_TEMP.
+    if n <= 1:
+        return [0.1]
+    top = settings.cypher_candidate_max_temp
+    return [round(0.1 + i * (top - 0.1) / (n - 1), 2) for i in range(n)]
+
+
 def get_chain(force_refresh_schema: bool = False) -> GraphCypherQAChain:
     """
     Initialize (or return cached) GraphCypherQAChain with schema/value hints
     baked into the prompt via .partial(...). The chain then only needs {'query': ...}.
+    Rebuilt only when the schema catalog swaps in a new version (or on force_refresh_schema).
     """
-    global _CHAIN, _SCHEMA_TEXT, _GRAPH
+    global _CHAIN, _SCHEMA_TEXT, _GRAPH, _CHAIN_FINGERPRINT, _CANDIDATES
 
-    if _CHAIN is not None and not force_refresh_schema:
+    catalog = get_catalog()
+    if force_refresh_schema:
+        catalog.refresh(force=True)
+    snap = catalog.current()
+
+    if _CHAIN is not None and _CHAIN_FINGERPRINT == snap["fingerprint"]:
         return _CHAIN
 
-    _GRAPH = Neo4jGraph(
-        url=settings.neo4j_uri,
-        username=settings.neo4j_user,
-        password=settings.neo4j_pass,
-    )
-    # If you ever want to force schema reload: _GRAPH.refresh_schema()
+    if _GRAPH is None:
+        _GRAPH = _LimitedGraph(
+            url=settings.neo4j_uri,
+            username=settings.neo4j_user,
+            password=settings.neo4j_pass,
+            timeout=settings.cypher_timeout_s or None,  # schema reads; generated queries get run_limits()
+        )
+    else:
+        # Keep the structured schema used by validate_cypher in step with the catalog.
+        _GRAPH.refresh_schema()
 
-    snap = schema_snapshot()
     _SCHEMA_TEXT = schema_text_for_llm(snap)
-    value_hints_text = _make_value_hints_text()
+    value_hints_text = _make_value_hints_text(snap)
 
-    cypher_llm = ChatOpenAI(model=settings.chat_model, temperature=0.1, api_key=settings.openai_key)
-    qa_llm     = ChatOpenAI(model=settings.chat_model, temperature=0.2, api_key=settings.openai_key)
+    cypher_llm = make_chat(temperature=0.1)
+    qa_llm     = make_chat(temperature=0.2)
 
     prompt_partial = _CYPHER_PROMPT.partial(
         schema=_SCHEMA_TEXT or "(schema unavailable)",
@@ -113,10 +176,33 @@ def get_chain(force_refresh_schema: bool = False) -> GraphCypherQAChain:
         return_intermediate_steps=True,
         top_k=25,
     )
+    _CHAIN.cypher_query_corrector = _GuardedCorrector(_CHAIN.cypher_query_corrector.schemas)
+    _CANDIDATES = [prompt_partial | make_chat(temperature=t) | StrOutputParser()
+                   for t in _candidate_temperatures(settings.cypher_candidates)]
+    _CHAIN_FINGERPRINT = snap["fingerprint"]
     return _CHAIN
 
 
-def _invoke_with_repair(chain: GraphCypherQAChain, q: str) -> Dict[str, Any]:
+def _repair_question(q: str, e: Exception) -> str:
+    if isinstance(e, CypherRejected):
+        # The query never ran; tell the model why its plan was refused.
+        return (
+            q
+            + f"\n\nThe previously generated Cypher was not run. {e}\n"
+            + "Please regenerate ONE cheaper Cypher query using ONLY the provided schema. "
+              "Return only the query (no explanations)."
+        )
+    # Feed the database error back to the LLM to fix the query.
+    return (
+        q
+        + "\n\nThe previously generated Cypher failed with this database error:\n"
+        + f"{type(e).__name__}: {e}\n"
+        + "Please regenerate ONE corrected Cypher query using ONLY the provided schema. "
+          "Return only the query (no explanations)."
+    )
+
+
+def _invoke_with_repair(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
     """
     Invoke the chain once; on failure, append the Neo4j error text and ask
     the model to regenerate a corrected query (MAX_REPAIRS times).
@@ -125,24 +211,376 @@ def _invoke_with_repair(chain: GraphCypherQAChain, q: str) -> Dict[str, Any]:
     last_err = None
     while attempts <= MAX_REPAIRS:
         try:
-            return chain.invoke({"query": q})
+            # One slot covers the chain's generate + QA calls so it can't flood the model.
+            with model_slot(settings.chat_model):
+                return chain.invoke({"query": q, **(grounding or {})})
         except Exception as e:
             last_err = e
             attempts += 1
             if attempts > MAX_REPAIRS:
                 break
-            # Feed the database error back to the LLM to fix the query.
-            q = (
-                q
-                + "\n\nThe previously generated Cypher failed with this database error:\n"
-                + f"{type(e).__name__}: {e}\n"
-                + "Please regenerate ONE corrected Cypher query using ONLY the provided schema. "
-                  "Return only the query (no explanations)."
-            )
+            q = _repair_question(q, e)
     # If we get here, repair failed
     raise last_err if last_err else RuntimeError("Unknown Cypher QA failure")
 
 
+async def _ainvoke_with_repair(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    """Async twin of _invoke_with_repair."""
+    attempts = 0
+    last_err = None
+    while attempts <= MAX_REPAIRS:
+        try:
+            async with amodel_slot(settings.chat_model):
+                return await chain.ainvoke({"query": q, **(grounding or {})})
+        except Exception as e:
+            last_err = e
+            attempts += 1
+            if attempts > MAX_REPAIRS:
+                break
+            q = _repair_question(q, e)
+    raise last_err if last_err else RuntimeError("Unknown Cypher QA failure")
+
+
+# ---------- Lean mode (CYPHER_MODE=lean): generate -> validate -> execute, no QA LLM ----------
+
+def _validate_cypher(chain: GraphCypherQAChain, text: str) -> str:
+    cypher = extract_cypher(text)
+    corrector = chain.cypher_query_corrector
+    if corrector:
+        # Same schema check the chain applies; returns "" when a relationship doesn't exist.
+        # Not the guarded call: lean/speculative paths EXPLAIN once themselves (aexplain when async).
+        cypher = getattr(corrector, "correct", corrector)(cypher)
+    if not cypher or not cypher.strip():
+        raise ValueError("Generated Cypher does not match the schema")
+    if _WRITE_CLAUSE.search(re.sub(r"'[^']*'|\"[^\"]*\"", "''", cypher)):  # ignore words inside strings
+        raise ValueError("Generated Cypher writes to the graph")
+    return cypher
+
+
+def _rows_result(rows: List[Dict[str, Any]]) -> str:
+    """Short plain-text result for fusion's CYRESULT; the rows themselves go in as CYCONTEXT."""
+    if not rows:
+        return "The query returned no rows."
+    if len(rows) == 1 and len(rows[0]) == 1:
+        (k, v), = rows[0].items()
+        return f"{k} = {v}"
+    return f"The query returned {len(rows)} rows (see CYCONTEXT)."
+
+
+def _lean_output(cypher: str, rows: List[Dict[str, Any]], **step) -> Dict[str, Any]:
+    return {"result": _rows_result(rows),
+            "intermediate_steps": [{"query": cypher, **step}, {"context": rows}]}
+
+
+def _lean_invoke(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    """One generation call, then the query is checked and run here; failures go through repair."""
+    attempts = 0
+    last_err = None
+    while attempts <= MAX_REPAIRS:
+        try:
+            with model_slot(settings.chat_model):
+                text = chain.cypher_generation_chain.invoke({"query": q, **(grounding or {})})
+            cypher = _validate_cypher(chain, text)
+            cypher_guard.check(cypher)
+            rows = [r.data() for r in run_read(cypher, **cypher_guard.run_limits())][:chain.top_k]
+            return _lean_output(cypher, rows)
+        except Exception as e:
+            last_err = e
+            attempts += 1
+            if attempts > MAX_REPAIRS:
+                break
+            q = _repair_question(q, e)
+    raise last_err if last_err else RuntimeError("Unknown Cypher QA failure")
+
+
+async def _alean_invoke(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    """Async twin of _lean_invoke."""
+    attempts = 0
+    last_err = None
+    while attempts <= MAX_REPAIRS:
+        try:
+            async with amodel_slot(settings.chat_model):
+                text = await chain.cypher_generation_chain.ainvoke({"query": q, **(grounding or {})})
+            cypher = _validate_cypher(chain, text)
+            await cypher_guard.acheck(cypher)
+            rows = [r.data() for r in await arun_read(cypher, **cypher_guard.run_limits())][:chain.top_k]
+            return _lean_output(cypher, rows)
+        except Exception as e:
+            last_err = e
+            attempts += 1
+            if attempts > MAX_REPAIRS:
+                break
+            q = _repair_question(q, e)
+    raise last_err if last_err else RuntimeError("Unknown Cypher QA failure")
+
+
+def _lean() -> bool:
+    return settings.cypher_mode == "lean"
+
+
+def _summarize(chain: GraphCypherQAChain, question: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    """Rows run outside the chain get the chain's QA summary, unless in lean mode."""
+    if not _lean():
+        rows = out["intermediate_steps"][-1]["context"]
+        with model_slot(settings.chat_model):
+            out["result"] = chain.qa_chain.invoke({"question": question, "context": rows})
+    return out
+
+
+async def _asummarize(chain: GraphCypherQAChain, question: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    if not _lean():
+        rows = out["intermediate_steps"][-1]["context"]
+        async with amodel_slot(settings.chat_model):
+            out["result"] = await chain.qa_chain.ainvoke({"question": question, "context": rows})
+    return out
+
+
+# ---------- Speculative candidates (CYPHER_CANDIDATES > 1) ----------
+#
+# Instead of generate -> fail -> repair, N generators at spread temperatures run at once. Each
+# candidate is validated and EXPLAINed as soon as it arrives; the first that passes is executed
+# and the others are cancelled. Only if every candidate fails does a regular repair round run.
+
+_SPEC_POOL = ThreadPoolExecutor(max_workers=settings.ask_workers, thread_name_prefix="cypher-spec")
+_SPEC = {"runs": 0, "primary_won": 0, "saves": 0, "alternate_first": 0, "all_failed": 0}
+_SPEC_LOCK = threading.Lock()  # races finish on _SPEC_POOL threads and on the event loop
+
+
+def speculation_stats() -> dict:
+    # saves: the first candidate failed and another one was used, i.e. a repair round avoided.
+    with _SPEC_LOCK:
+        return dict(_SPEC)
+
+
+def _count(*keys: str):
+    with _SPEC_LOCK:
+        for k in keys:
+            _SPEC[k] += 1
+
+
+class _Race:
+    """Outcome bookkeeping shared by the sync and async drivers."""
+
+    def __init__(self):
+        self.errors: Dict[int, Exception] = {}
+
+    def failed(self, i: int, e: Exception):
+        self.errors[i] = e
+
+    def won(self, i: int):
+        if i == 0:
+            _count("runs", "primary_won")
+        elif 0 in self.errors:
+            _count("runs", "saves")
+        else:
+            _count("runs", "alternate_first")  # primary still pending: faster, not necessarily a save
+
+    def lost(self) -> Exception:
+        _count("runs", "all_failed")
+        return self.errors.get(0) or next(iter(self.errors.values()))
+
+
+def _candidate(chain: GraphCypherQAChain, i: int, q: str, grounding: Optional[dict]):
+    try:
+        with model_slot(settings.chat_model):
+            text = _CANDIDATES[i].invoke({"query": q, **(grounding or {})})
+        cypher = _validate_cypher(chain, text)
+        cypher_guard.check(cypher)
+        return i, cypher, None
+    except Exception as e:
+        return i, None, e
+
+
+async def _acandidate(chain: GraphCypherQAChain, i: int, q: str, grounding: Optional[dict]):
+    try:
+        async with amodel_slot(settings.chat_model):
+            text = await _CANDIDATES[i].ainvoke({"query": q, **(grounding or {})})
+        cypher = _validate_cypher(chain, text)
+        await cypher_guard.acheck(cypher)
+        return i, cypher, None
+    except Exception as e:
+        return i, None, e
+
+
+def _speculate(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    race = _Race()
+    futures = [_SPEC_POOL.submit(_candidate, chain, i, q, grounding) for i in range(len(_CANDIDATES))]
+    try:
+        for fut in as_completed(futures):
+            i, cypher, err = fut.result()
+            if err is None:
+                try:
+                    rows = [r.data() for r in run_read(cypher, **cypher_guard.run_limits())][:chain.top_k]
+                    race.won(i)
+                    return _summarize(chain, q, _lean_output(cypher, rows, candidate=i))
+                except Exception as e:
+                    err = e
+            race.failed(i, err)
+    finally:
+        for fut in futures:
+            fut.cancel()  # queued ones never start; running generations finish in the background
+    q = _repair_question(q, race.lost())
+    return _lean_invoke(chain, q, grounding) if _lean() else _invoke_with_repair(chain, q, grounding)
+
+
+async def _aspeculate(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    race = _Race()
+    tasks = [asyncio.ensure_future(_acandidate(chain, i, q, grounding)) for i in range(len(_CANDIDATES))]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            i, cypher, err = await fut
+            if err is None:
+                try:
+                    rows = [r.data() for r in await arun_read(cypher, **cypher_guard.run_limits())][:chain.top_k]
+                    race.won(i)
+                    return await _asummarize(chain, q, _lean_output(cypher, rows, candidate=i))
+                except Exception as e:
+                    err = e
+            race.failed(i, err)
+    finally:
+        for t in tasks:
+            t.cancel()  # abandons in-flight generation requests
+    q = _repair_question(q, race.lost())
+    return await (_alean_invoke(chain, q, grounding) if _lean() else _ainvoke_with_repair(chain, q, grounding))
+
+
+def _answer(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    if len(_CANDIDATES) > 1:
+        return _speculate(chain, q, grounding)
+    return _lean_invoke(chain, q, grounding) if _lean() else _invoke_with_repair(chain, q, grounding)
+
+
+async def _aanswer(chain: GraphCypherQAChain, q: str, grounding: Optional[dict] = None) -> Dict[str, Any]:
+    if len(_CANDIDATES) > 1:
+        return await _aspeculate(chain, q, grounding)
+    return await (_alean_invoke(chain, q, grounding) if _lean() else _ainvoke_with_repair(chain, q, grounding))
+
+
+# ---------- Schema pruning (SCHEMA_PRUNE=true, services/schema_select.py) ----------
+#
+# The chain's prompt has the whole catalog baked in; with pruning each generation call gets
+# "schema" and "value_hints" for the question's subset instead (prompt inputs override partials).
+
+def _grounding_for(sub: dict) -> dict:
+    return {"schema": schema_text_for_llm(sub, patterns=True), "value_hints": _make_value_hints_text(sub)}
+
+
+def _grounding(question: str) -> Optional[dict]:
+    if not settings.schema_prune:
+        return None
+    try:
+        return _grounding_for(schema_select.select(question, get_catalog().current()))
+    except Exception:
+        return None  # selection is an optimization; fall back to the full schema
+
+
+async def _agrounding(question: str) -> Optional[dict]:
+    if not settings.schema_prune:
+        return None
+    try:
+        return _grounding_for(await schema_select.aselect(question, await get_catalog().acurrent()))
+    except Exception:
+        return None
+
+
+def _prepare_question(question: str, add_count_hint: bool) -> str:
+    q = question.strip()
+    if add_count_hint:
+        q = _maybe_add_count_hint(q)
+    return q
+
+
+def _shape_output(out: Dict[str, Any], max_ctx_rows: int, plan_cache: str = "off") -> Dict[str, Any]:
+    steps = out.get("intermediate_steps") or []
+    return {
+        "result": out.get("result") or "I don't know.",
+        "cypher": _extract_generated_cypher(steps) or "(unavailable)",
+        "steps": steps,
+        "context": _format_context_preview(steps, max_rows=max_ctx_rows),
+        "plan_cache": plan_cache,
+    }
+
+
+# ---------- Plan cache (services/plan_cache.py) ----------
+
+def _lookup_plan(question: str, fingerprint: str):
+    cache = get_plan_cache()
+    hit = cache.match(question, fingerprint)
+    if hit is None:
+        if cache.wants_vector():
+            hit = cache.nearest(question, embed_one(mask_question(question)[0]), fingerprint)
+        else:
+            cache.miss()
+    return hit
+
+
+async def _alookup_plan(question: str, fingerprint: str):
+    cache = get_plan_cache()
+    hit = cache.match(question, fingerprint)
+    if hit is None:
+        if cache.wants_vector():
+            hit = cache.nearest(question, await aembed_one(mask_question(question)[0]), fingerprint)
+        else:
+            cache.miss()
+    return hit
+
+
+def _run_plan(chain: GraphCypherQAChain, question: str, cypher: str, params: dict) -> Optional[Dict[str, Any]]:
+    """Run a cached plan fresh and summarize its rows; None (plan dropped) if it fails or finds nothing."""
+    try:
+        rows = [r.data() for r in run_read(cypher, params, **cypher_guard.run_limits())][:chain.top_k]
+    except Exception:
+        rows = []
+    if not rows:
+        get_plan_cache().discard(cypher)
+        return None
+    # Same step shape as the chain, plus the bound values.
+    return _summarize(chain, question, _lean_output(cypher, rows, params=params))
+
+
+async def _arun_plan(chain: GraphCypherQAChain, question: str, cypher: str, params: dict) -> Optional[Dict[str, Any]]:
+    try:
+        rows = [r.data() for r in await arun_read(cypher, params, **cypher_guard.run_limits())][:chain.top_k]
+    except Exception:
+        rows = []
+    if not rows:
+        get_plan_cache().discard(cypher)
+        return None
+    return await _asummarize(chain, question, _lean_output(cypher, rows, params=params))
+
+
+def _plan_to_store(question: str, out: Dict[str, Any]):
+    """A plan for a query that ran and returned rows, else None."""
+    steps = out.get("intermediate_steps") or []
+    ctx = steps[1].get("context") if len(steps) > 1 and isinstance(steps[1], dict) else None
+    cypher = _extract_generated_cypher(steps)
+    if not cypher or not ctx:
+        return None
+    return make_plan(question, cypher)
+
+
+def _remember_plan(question: str, out: Dict[str, Any], fingerprint: str):
+    plan = _plan_to_store(question, out)
+    if plan is not None:
+        get_plan_cache().put(plan, embed_one(plan.masked) if plan.fuzzy else None, fingerprint)
+
+
+async def _aremember_plan(question: str, out: Dict[str, Any], fingerprint: str):
+    plan = _plan_to_store(question, out)
+    if plan is not None:
+        get_plan_cache().put(plan, await aembed_one(plan.masked) if plan.fuzzy else None, fingerprint)
+
+
+def _blocked_output(e: Exception) -> Dict[str, Any]:
+    # Never let a bad generated query 500 your API.
+    return {
+        "result": "I don't know.",
+        "cypher": "(blocked due to invalid or unsafe query)",
+        "steps": [{"error": f"{type(e).__name__}: {e}"}],
+        "context": "(none)",
+    }
+
+
 def run_cypher_qa(
     question: str,
     add_count_hint: bool = True,
@@ -151,36 +589,62 @@ def run_cypher_qa(
 ) -> Dict[str, Any]:
     """
     Execute the Cypher QA chain with generic schema/value grounding and one repair attempt.
+    With CYPHER_MODE=lean the chain's QA summarization call is skipped and `result` is a
+    plain description of the rows, which fusion reads directly.
     Returns:
       - result: final answer (short)
       - cypher: generated query (if available)
       - steps: raw intermediate steps (for debugging)
       - context: compact preview of rows returned by the Cypher
+      - plan_cache: "hit" (a cached query was reused), "miss" or "off"
     """
     chain = get_chain(force_refresh_schema=force_refresh_schema)
+    fingerprint = _CHAIN_FINGERPRINT
+    use_cache = get_plan_cache().enabled
 
-    q = question.strip()
-    if add_count_hint:
-        q = _maybe_add_count_hint(q)
+    if use_cache:
+        hit = _lookup_plan(question, fingerprint)
+        out = _run_plan(chain, question.strip(), *hit) if hit else None
+        if out is not None:
+            return _shape_output(out, max_ctx_rows, "hit")
+
+    q = _prepare_question(question, add_count_hint)
+    try:
+        out = _answer(chain, q, _grounding(question))
+    except Exception as e:
+        return _blocked_output(e)
+    if use_cache:
+        _remember_plan(question, out, fingerprint)
+    return _shape_output(out, max_ctx_rows, "miss" if use_cache else "off")
+
+
+async def arun_cypher_qa(
+    question: str,
+    add_count_hint: bool = True,
+    max_ctx_rows: int = 40,
+    force_refresh_schema: bool = False,
+) -> Dict[str, Any]:
+    """Async twin of run_cypher_qa; same return shape."""
+    snap = await get_catalog().acurrent()
+    if _CHAIN is not None and _CHAIN_FINGERPRINT == snap["fingerprint"] and not force_refresh_schema:
+        chain = _CHAIN
+    else:
+        # (Re)building reads the schema over the sync driver; keep it off the event loop.
+        chain = await asyncio.to_thread(get_chain, force_refresh_schema)
+    fingerprint = _CHAIN_FINGERPRINT
+    use_cache = get_plan_cache().enabled
+
+    if use_cache:
+        hit = await _alookup_plan(question, fingerprint)
+        out = await _arun_plan(chain, question.strip(), *hit) if hit else None
+        if out is not None:
+            return _shape_output(out, max_ctx_rows, "hit")
 
+    q = _prepare_question(question, add_count_hint)
     try:
-        out: Dict[str, Any] = _invoke_with_repair(chain, q)
-        steps = out.get("intermediate_steps") or []
-        cypher_text = _extract_generated_cypher(steps) or "(unavailable)"
-        ctx_preview = _format_context_preview(steps, max_rows=max_ctx_rows)
-        result_text = out.get("result") or "I don't know."
-
-        return {
-            "result": result_text,
-            "cypher": cypher_text,
-            "steps": steps,
-            "context": ctx_preview,
-        }
+        out = await _aanswer(chain, q, await _agrounding(question))
     except Exception as e:
-        # Never let a bad generated query 500 your API.
-        return {
-            "result": "I don't know.",
-            "cypher": "(blocked due to invalid or unsafe query)",
-            "steps": [{"error": f"{type(e).__name__}: {e}"}],
-            "context": "(none)",
-        }
+        return _blocked_output(e)
+    if use_cache:
+        await _aremember_plan(question, out, fingerprint)
+    return _shape_output(out, max_ctx_rows, "miss" if use_cache else "off")
@@ -0,0 +1,130 @@
+# app/services/embedding_cache.py
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_text(text: str) -> str:
+    """Cache key text: whitespace-collapsed and casefolded, so trivial re-phrasings hit."""
+    return " ".join((text or "").split()).casefold()
+
+
+def _pack(vec) -> bytes:
+    # float32 halves memory vs. Python floats and is what the vector index stores anyway.
+    return array("f", vec).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    a = array("f")
+    a.frombytes(blob)
+    return a.tolist()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU + TTL cache of query embeddings keyed by (model, normalized text).
+
+    With `path` set, a SQLite file backs the in-process tier: it survives restarts and is
+    shared by every uvicorn worker pointing at the same file (WAL mode, one writer at a time).
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS emb_cache (
+        key     TEXT PRIMARY KEY,
+        model   TEXT NOT NULL,
+        created REAL NOT NULL,
+        vec     BLOB NOT NULL
+    )
+    """
+
+    def __init__(self, max_items: int = 10000, ttl_s: float = 86400.0, path: Optional[str] = None):
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self.path = path
+        self._mem: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(self._SCHEMA)
+            self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha1(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_s > 0 and (time.time() - created) > self.ttl_s
+
+    def get(self, model: str, text: str) -> Optional[list[float]]:
+        if self.max_items <= 0:
+            return None
+        k = self.key(model, text)
+        with self._lock:
+            hit = self._mem.get(k)
+            if hit and not self._expired(hit[0]):
+                self._mem.move_to_end(k)
+                self.hits += 1
+                return _unpack(hit[1])
+            if hit:
+                del self._mem[k]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT created, vec FROM emb_cache WHERE key = ?", (k,)).fetchone()
+                if row and not self._expired(row[0]):
+                    self._remember(k, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return _unpack(row[1])
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, vec) -> None:
+        if self.max_items <= 0:
+            return
+        k = self.key(model, text)
+        blob = _pack(vec)
+        now = time.time()
+        with self._lock:
+            self._remember(k, now, blob)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO emb_cache (key, model, created, vec) VALUES (?, ?, ?, ?)",
+                        (k, model, now, blob),
+                    )
+                    self._db.commit()
+                except sqlite3.Error:
+                    # The disk tier is best-effort (e.g. another worker holds the write lock).
+                    pass
+
+    def _remember(self, k: str, created: float, blob: bytes) -> None:
+        self._mem[k] = (created, blob)
+        self._mem.move_to_end(k)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._mem),
+                "max_items": self.max_items,
+                "ttl_s": self.ttl_s,
+                "disk": bool(self._db is not None),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
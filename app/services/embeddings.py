@@ -1,4 +1,51 @@
-from app.adapters.openai_client import make_embeddings
+from app.adapters.embedding_providers import get_provider
+from app.core.settings import settings
+from app.services.embedding_cache import EmbeddingCache
+
+_CACHE = EmbeddingCache(
+    max_items=settings.emb_cache_size,
+    ttl_s=settings.emb_cache_ttl_s,
+    path=settings.emb_cache_path,
+)
+
+def cache_stats() -> dict:
+    return _CACHE.stats()
 
 def embed_one(text: str) -> list[float]:
-    return make_embeddings().embed_query(text)
+    provider = get_provider()
+    vec = _CACHE.get(provider.name, text)
+    if vec is None:
+        vec = provider.embed_query(text)
+        _CACHE.put(provider.name, text, vec)
+    return vec
+
+async def aembed_one(text: str) -> list[float]:
+    provider = get_provider()
+    vec = _CACHE.get(provider.name, text)
+    if vec is None:
+        vec = await provider.aembed_query(text)
+        _CACHE.put(provider.name, text, vec)
+    return vec
+
+def _split_cached(name: str, texts: list[str]):
+    vecs = [_CACHE.get(name, t) for t in texts]
+    return vecs, [i for i, v in enumerate(vecs) if v is None]
+
+def _fill(name: str, texts: list[str], vecs: list, missing: list[int], fresh: list) -> list[list[float]]:
+    for i, v in zip(missing, fresh):
+        vecs[i] = v
+        _CACHE.put(name, texts[i], v)
+    return vecs
+
+def embed_many(texts: list[str]) -> list[list[float]]:
+    # One provider batch for the cache misses (remote clients chunk very large inputs themselves).
+    provider = get_provider()
+    vecs, missing = _split_cached(provider.name, texts)
+    fresh = provider.embed_documents([texts[i] for i in missing]) if missing else []
+    return _fill(provider.name, texts, vecs, missing, fresh)
+
+async def aembed_many(texts: list[str]) -> list[list[float]]:
+    provider = get_provider()
+    vecs, missing = _split_cached(provider.name, texts)
+    fresh = await provider.aembed_documents([texts[i] for i in missing]) if missing else []
+    return _fill(provider.name, texts, vecs, missing, fresh)
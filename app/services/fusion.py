@@ -1,5 +1,8 @@
 from __future__ import annotations
-from app.adapters.openai_client import make_chat
+import asyncio
+
+from app.adapters.openai_client import make_chat, model_slot, amodel_slot
+from app.core.settings import settings
 from app.prompts.fusion_prompt import FUSE_SYSTEM
 
 _MAX_FACTS_CHARS = 6000
@@ -19,23 +22,20 @@ def _has_any_fact(facts: str | None) -> bool:
 def _has_text(x: str | None) -> bool:
     return bool(x and x.strip() and x.strip().lower() != "(none)")
 
-def fuse_answer(
-    *,
+def _fallback(facts: str | None, cypher_result: str | None) -> str:
+    if _has_text(cypher_result):
+        return cypher_result.strip()
+    if _has_any_fact(facts):
+        return "Here’s what I can confirm from the graph facts:\n" + _clip(facts, 1200)
+    return "I don't know."
+
+def _build_messages(
     question: str,
     facts: str,
     cypher_result: str | None,
     cypher_context: str | None,
-    citations: list[str] | None = None,
-) -> str:
-    """
-    Final answer = f(CYPHER_RESULT, CYPHER_CONTEXT, FACTS).
-    Also provide whitelist of NodeIDs (CITATIONS) that the LLM is allowed to cite.
-    """
-    if not (_has_text(cypher_result) or _has_text(cypher_context) or _has_any_fact(facts)):
-        return "I don't know."
-
-    llm = make_chat()  # temperature=0 recommended
-
+    citations: list[str] | None,
+) -> list[dict]:
     # Dedup & cap citations for prompt hygiene
     cites = []
     seen = set()
@@ -56,25 +56,108 @@ def fuse_answer(
         f"{_clip(facts, _MAX_FACTS_CHARS)}\n\n"
         f"{cites_block}"
     )
+    return [
+        {"role": "system", "content": FUSE_SYSTEM},
+        {"role": "user", "content": user},
+    ]
+
+def fuse_answer(
+    *,
+    question: str,
+    facts: str,
+    cypher_result: str | None,
+    cypher_context: str | None,
+    citations: list[str] | None = None,
+) -> str:
+    """
+    Final answer = f(CYPHER_RESULT, CYPHER_CONTEXT, FACTS).
+    Also provide whitelist of NodeIDs (CITATIONS) that the LLM is allowed to cite.
+    """
+    if not (_has_text(cypher_result) or _has_text(cypher_context) or _has_any_fact(facts)):
+        return "I don't know."
+
+    llm = make_chat()  # temperature=0 recommended
+    messages = _build_messages(question, facts, cypher_result, cypher_context, citations)
 
     try:
-        msg = llm.invoke([
-            {"role": "system", "content": FUSE_SYSTEM},
-            {"role": "user", "content": user},
-        ])
+        with model_slot(settings.chat_model):
+            msg = llm.invoke(messages)
         text = (getattr(msg, "content", "") or "").strip()
-        if _has_text(text):
-            return text
-
-        # Fallbacks
-        if _has_text(cypher_result):
-            return cypher_result.strip()
-        if _has_any_fact(facts):
-            return "Here’s what I can confirm from the graph facts:\n" + _clip(facts, 1200)
-        return "I don't know."
+        return text if _has_text(text) else _fallback(facts, cypher_result)
     except Exception:
-        if _has_text(cypher_result):
-            return cypher_result.strip()
-        if _has_any_fact(facts):
-            return "Here’s what I can confirm from the graph facts:\n" + _clip(facts, 1200)
+        return _fallback(facts, cypher_result)
+
+async def afuse_answer(
+    *,
+    question: str,
+    facts: str,
+    cypher_result: str | None,
+    cypher_context: str | None,
+    citations: list[str] | None = None,
+) -> str:
+    """Async twin of fuse_answer (same prompt and fallbacks, non-blocking LLM call)."""
+    if not (_has_text(cypher_result) or _has_text(cypher_context) or _has_any_fact(facts)):
         return "I don't know."
+
+    llm = make_chat()
+    messages = _build_messages(question, facts, cypher_result, cypher_context, citations)
+
+    try:
+        async with amodel_slot(settings.chat_model):
+            msg = await llm.ainvoke(messages)
+        text = (getattr(msg, "content", "") or "").strip()
+        return text if _has_text(text) else _fallback(facts, cypher_result)
+    except Exception:
+        return _fallback(facts, cypher_result)
+
+_DONE = object()
+
+async def _pump(llm, messages, queue: asyncio.Queue):
+    """Read the upstream stream into `queue` under the model slot; ends with _DONE or the error."""
+    try:
+        async with amodel_slot(settings.chat_model):
+            async for chunk in llm.astream(messages):
+                text = getattr(chunk, "content", "") or ""
+                if text:
+                    queue.put_nowait(text)
+        queue.put_nowait(_DONE)
+    except Exception as e:
+        queue.put_nowait(e)
+
+async def astream_fuse_answer(
+    *,
+    question: str,
+    facts: str,
+    cypher_result: str | None,
+    cypher_context: str | None,
+    citations: list[str] | None = None,
+):
+    """
+    Streaming twin of fuse_answer: yields the answer as text chunks as the LLM produces them.
+    Falls back to a single chunk (same fallbacks as fuse_answer) if nothing was streamed.
+
+    The upstream stream is read by its own task into an unbounded queue, so the model slot is
+    held only as long as OpenAI is streaming, not for as long as a slow client takes to read.
+    """
+    if not (_has_text(cypher_result) or _has_text(cypher_context) or _has_any_fact(facts)):
+        yield "I don't know."
+        return
+
+    llm = make_chat()
+    messages = _build_messages(question, facts, cypher_result, cypher_context, citations)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    pump = asyncio.create_task(_pump(llm, messages, queue))
+    streamed = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE or isinstance(item, Exception):
+                # Once tokens went out we can't retract them; only fall back on a silent failure.
+                break
+            streamed = True
+            yield item
+    finally:
+        pump.cancel()  # no-op once the upstream finished; stops it if the client went away
+    if not streamed:
+        yield _fallback(facts, cypher_result)
@@ -0,0 +1,97 @@
+# app/services/neighbour_cache.py
+"""
+In-process LRU of 1-hop neighbourhoods for hot seed nodes.
+
+Entries are keyed by (elementId, per_seed, expansion settings) and tagged with the schema
+catalog's data fingerprint they were computed under. It covers node/relationship counts, so
+structural writes invalidate every entry at the next catalog check; NBR_CACHE_TTL_S
+bounds staleness for property-only edits that don't move any count.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.settings import settings
+
+
+class NeighbourhoodCache:
+    def __init__(self, max_items: int = 5000, ttl_s: float = 600.0):
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self._items: OrderedDict[tuple, tuple[float, str, list, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    @staticmethod
+    def _key(seed_id: str, per_seed: int) -> tuple:
+        # Anything that changes what one seed expands to is part of the key.
+        return (seed_id, per_seed, settings.expansion_engine, settings.hub_degree_threshold,
+                settings.hub_rank, settings.hub_per_type)
+
+    def get_many(self, seed_ids: list[str], per_seed: int, version: str) -> dict[str, tuple[list, bool]]:
+        """{seed_id: (triples, truncated)} for the ids that are cached, fresh and current."""
+        out = {}
+        now = time.time()
+        with self._lock:
+            for sid in seed_ids:
+                k = self._key(sid, per_seed)
+                hit = self._items.get(k)
+                if hit is None:
+                    self.misses += 1
+                    continue
+                created, ver, triples, truncated = hit
+                if ver != version or (self.ttl_s > 0 and now - created > self.ttl_s):
+                    del self._items[k]
+                    self.stale += 1
+                    self.misses += 1
+                    continue
+                self._items.move_to_end(k)
+                self.hits += 1
+                out[sid] = (triples, truncated)
+        return out
+
+    def put(self, seed_id: str, per_seed: int, version: str, triples: list, truncated: bool):
+        with self._lock:
+            k = self._key(seed_id, per_seed)
+            self._items[k] = (time.time(), version, triples, truncated)
+            self._items.move_to_end(k)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_items": self.max_items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+_CACHE = NeighbourhoodCache(settings.nbr_cache_size, settings.nbr_cache_ttl_s)
+
+
+def get_cache() -> NeighbourhoodCache:
+    return _CACHE
+
+
+def cache_stats() -> dict:
+    return _CACHE.stats()
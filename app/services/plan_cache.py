@@ -0,0 +1,319 @@
+# app/services/plan_cache.py
+"""
+Plan cache for Cypher-QA: generated Cypher reused for questions of the same shape.
+
+After a generated query runs and returns rows, its string/number literals that also appear in
+the question are turned into parameters ($v0, $v1, ...) and the question becomes a template
+with those spans as slots:
+
+    "Which farms grow Almonds in CA?"  ->  "which farms grow <v0> in <v1>"
+    ... WHERE c.name = 'Almonds' AND s.code = 'CA'  ->  ... = $v0 ... = $v1
+
+A later question matching a template exactly ("Which farms grow walnuts in OR?") binds its own
+values and the cached query is run fresh against the graph, skipping Cypher generation. Failing
+that, the question's likely literals (quoted text, numbers, codes, capitalised names) are masked
+and its embedding compared with the cached templates; above PLAN_CACHE_THRESHOLD the nearest
+plan is reused, but only when the values can be bound unambiguously (same number of slots, at
+most one string and one number slot).
+
+Every entry is tagged with the schema catalog fingerprint (labels, relationship types, property
+keys; not counts) it was generated against; a new fingerprint empties the cache, data writes don't.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from app.core.settings import settings
+
+# Literals in generated Cypher; strings first so digits inside quotes aren't matched on their own.
+_CYPHER_LITERAL = re.compile(
+    r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])"
+)
+# Likely values in a question (used for the similarity path only).
+_QUESTION_LITERAL = re.compile(
+    r"\"[^\"]+\"|'[^']+'"                              # quoted
+    r"|(?<![\w.])\d+(?:\.\d+)?(?![\w.])"               # numbers
+    r"|\b[A-Z]{2,}\b"                                  # codes (CA, USDA)
+    r"|(?<=\s)[A-Z][\w&'-]*(?:\s+[A-Z][\w&'-]*)*"      # capitalised names, not sentence-initial
+)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_WORD = r"[^\s,?;]+"
+
+
+def _words_pattern(n: int) -> str:
+    """Capture exactly `n` words: a slot never stretches over the rest of a longer question."""
+    return "(" + _WORD + (r"\s+" + _WORD) * (n - 1) + ")"
+
+
+def normalize_question(q: str) -> str:
+    return " ".join((q or "").split()).rstrip("?.! ")
+
+
+def _case_of(literal: str, span: str) -> str:
+    """How the query spelled the value relative to the question, so new values get the same treatment."""
+    if literal == span:
+        return "same"
+    for name in ("lower", "upper", "title"):
+        if literal == getattr(span, name)():
+            return name
+    return "same"
+
+
+def _apply_case(value: str, case: str) -> str:
+    return value if case == "same" else getattr(value, case)()
+
+
+def _unquote(s: str) -> str:
+    return s[1:-1] if len(s) >= 2 and s[0] == s[-1] and s[0] in "'\"" else s
+
+
+def _to_number(s: str):
+    return float(s) if "." in s else int(s)
+
+
+@dataclass
+class Plan:
+    template: str                  # normalized question, bound spans replaced by <vN>
+    cypher: str                    # parameterized query
+    kinds: list[str]               # per slot: "str" | "num"
+    cases: list[str]               # per string slot: how the query spelled the question's value
+    masked: str = ""               # question with likely literals masked, embedded for similarity
+    fuzzy: bool = False            # may be matched by similarity (values bindable without ambiguity)
+    pattern: Optional[re.Pattern] = None
+    words: frozenset = frozenset()  # the template's own words; a bound value containing one is a mis-split
+    vec: Optional[np.ndarray] = None
+    created: float = field(default_factory=time.time)
+
+    def bind(self, values: list[str]) -> Optional[dict]:
+        if len(values) != len(self.kinds):
+            return None
+        params = {}
+        for i, (v, kind, case) in enumerate(zip(values, self.kinds, self.cases)):
+            v = _unquote(v.strip())
+            if kind == "num":
+                if not _NUMBER.fullmatch(v):
+                    return None
+                params[f"v{i}"] = _to_number(v)
+            else:
+                if not v or self.words & set(v.casefold().split()):
+                    return None
+                params[f"v{i}"] = _apply_case(v, case)
+        return params
+
+
+def make_plan(question: str, cypher: str) -> Optional[Plan]:
+    """Parameterize `cypher` by the literals it shares with `question`."""
+    q = normalize_question(question)
+    if not q or not cypher:
+        return None
+    spans: list[tuple[int, int, str, str]] = []   # (start, end, kind, case) in q, one per slot
+    slot_of: dict[str, int] = {}
+    pieces: list = []                             # query text and slot numbers (by discovery)
+    last = 0
+    for m in _CYPHER_LITERAL.finditer(cypher):
+        tok = m.group(0)
+        is_str = tok[0] in "'\""
+        value = _unquote(tok) if is_str else tok
+        if is_str and len(value.strip()) < 2:
+            continue
+        key = ("s:" if is_str else "n:") + value.casefold()
+        if key not in slot_of:
+            hit = re.search(r"(?<!\w)" + re.escape(value) + r"(?!\w)", q, re.I)
+            if hit is None or any(s < hit.end() and hit.start() < e for s, e, _, _ in spans):
+                continue  # a constant of the query, not a value from the question
+            slot_of[key] = len(spans)
+            spans.append((hit.start(), hit.end(), "str" if is_str else "num",
+                          _case_of(value, hit.group(0)) if is_str else "same"))
+        pieces += [cypher[last:m.start()], slot_of[key]]
+        last = m.end()
+    pieces.append(cypher[last:])
+
+    # Slots are numbered in question order, so regex group N feeds $vN.
+    order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+    renum = {old: new for new, old in enumerate(order)}
+    template, regex, pos = [], [], 0
+    for new, old in enumerate(order):
+        s, e, kind, _ = spans[old]
+        template.append(q[pos:s].casefold() + f"<v{new}>")
+        regex.append(re.escape(q[pos:s]) + (r"(-?\d+(?:\.\d+)?)" if kind == "num"
+                                            else _words_pattern(len(q[s:e].split()))))
+        pos = e
+    template.append(q[pos:].casefold())
+    regex.append(re.escape(q[pos:]))
+
+    kinds = [spans[i][2] for i in order]
+    words = frozenset(re.sub(r"<v\d+>", " ", "".join(template)).split())
+    # The similarity path can only place values if our own masking finds exactly these slots.
+    masked_q, found = mask_question(q)
+    return Plan(
+        template="".join(template),
+        cypher="".join(p if isinstance(p, str) else f"$v{renum[p]}" for p in pieces),
+        kinds=kinds,
+        cases=[spans[i][3] for i in order],
+        masked=masked_q,
+        fuzzy=(sorted(_kind(v) for v in found) == sorted(kinds)
+               and kinds.count("str") <= 1 and kinds.count("num") <= 1),
+        pattern=re.compile("".join(regex) + "$", re.I),
+        words=words,
+    )
+
+
+def mask_question(question: str) -> tuple[str, list[str]]:
+    """(question with likely literals replaced by <v>, the literals) for the similarity path."""
+    q = normalize_question(question)
+    values = [m.group(0) for m in _QUESTION_LITERAL.finditer(q)]
+    return _QUESTION_LITERAL.sub("<v>", q), values
+
+
+def _kind(value: str) -> str:
+    return "num" if _NUMBER.fullmatch(_unquote(value.strip())) else "str"
+
+
+class PlanCache:
+    def __init__(self, max_items: int = 1000, ttl_s: float = 3600.0, threshold: float = 0.95):
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self.threshold = threshold
+        self._items: OrderedDict[str, Plan] = OrderedDict()   # template -> plan
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.fallbacks = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    def _check_fingerprint(self, fingerprint: str):
+        # Caller holds the lock.
+        if fingerprint != self._fingerprint:
+            if self._items:
+                self.invalidations += 1
+            self._items.clear()
+            self._fingerprint = fingerprint
+
+    def _live(self, now: float) -> list[Plan]:
+        if self.ttl_s > 0:
+            for k in [k for k, p in self._items.items() if now - p.created > self.ttl_s]:
+                del self._items[k]
+        return list(self._items.values())
+
+    def match(self, question: str, fingerprint: str) -> Optional[tuple[str, dict]]:
+        """Exact template match: (cypher, params) or None."""
+        q = normalize_question(question)
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            for key, plan in reversed(self._items.items()):   # most recent first
+                if self.ttl_s > 0 and time.time() - plan.created > self.ttl_s:
+                    continue
+                m = plan.pattern.match(q)
+                params = plan.bind(list(m.groups())) if m else None
+                if params is not None:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return plan.cypher, params
+        return None
+
+    def wants_vector(self) -> bool:
+        """Whether the similarity path has anything to compare against (saves an embedding call)."""
+        with self._lock:
+            return any(p.fuzzy and p.vec is not None for p in self._items.values())
+
+    def nearest(self, question: str, vec, fingerprint: str) -> Optional[tuple[str, dict]]:
+        """Similarity match on the masked question; `vec` is the embedding of mask_question(question)[0]."""
+        _, values = mask_question(question)
+        kinds = [_kind(v) for v in values]
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            cands = [p for p in self._live(time.time())
+                     if p.fuzzy and p.vec is not None and len(p.kinds) == len(values)]
+            if not cands:
+                self.misses += 1
+                return None
+            v = np.asarray(vec, dtype=np.float32)
+            v = v / (np.linalg.norm(v) or 1.0)
+            sims = np.stack([p.vec for p in cands]) @ v
+            best = int(np.argmax(sims))
+            plan = cands[best]
+            if sims[best] < self.threshold:
+                self.misses += 1
+                return None
+            # At most one slot per kind, so values are placed by kind, not by position.
+            by_kind = dict(zip(kinds, values))
+            if len(by_kind) != len(values) or sorted(by_kind) != sorted(plan.kinds):
+                self.misses += 1
+                return None
+            params = plan.bind([by_kind[k] for k in plan.kinds])
+            if params is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(plan.template)
+            self.similar_hits += 1
+            return plan.cypher, params
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def put(self, plan: Plan, vec, fingerprint: str):
+        if vec is not None:
+            v = np.asarray(vec, dtype=np.float32)
+            plan.vec = v / (np.linalg.norm(v) or 1.0)
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._items[plan.template] = plan
+            self._items.move_to_end(plan.template)
+            self.stores += 1
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, cypher: str):
+        """Drop a plan whose reuse failed or came back empty, and count the fallback."""
+        with self._lock:
+            self.fallbacks += 1
+            for k in [k for k, p in self._items.items() if p.cypher == cypher]:
+                del self._items[k]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        hits = self.hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_items": self.max_items,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "fallbacks": self.fallbacks,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+_CACHE = PlanCache(settings.plan_cache_size, settings.plan_cache_ttl_s, settings.plan_cache_threshold)
+
+
+def get_cache() -> PlanCache:
+    return _CACHE
+
+
+def cache_stats() -> dict:
+    return _CACHE.stats()
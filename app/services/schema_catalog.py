@@ -0,0 +1,123 @@
+# app/services/schema_catalog.py
+"""
+Versioned schema catalog shared by the retrievers and the Cypher-QA chain.
+
+Holds labels, relationship types, properties, display props and samples (the schema_snapshot
+shape) plus derived expansion filters. A background thread recomputes two cheap fingerprints every
+settings.schema_refresh_s; only when one changes is the full snapshot rebuilt and swapped in as a
+new immutable version. Readers never hit the database once the first version is loaded.
+
+Each version carries both: "fingerprint" (labels, relationship types, property keys) keys what is
+derived from the schema itself (the Cypher chain, the plan cache, schema embeddings), and
+"data_fingerprint" (the same plus node/relationship counts) keys caches of graph data.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from app.adapters.schema_reader import schema_snapshot, schema_fingerprints, expansion_filters_for
+from app.core.settings import settings
+
+
+class SchemaCatalog:
+    def __init__(self, refresh_s: float):
+        self.refresh_s = refresh_s
+        self._current: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.refreshes = 0
+        self.checks = 0
+        self.last_error: Optional[str] = None
+
+    def current(self) -> dict:
+        """The live catalog version (loads synchronously the first time)."""
+        snap = self._current
+        if snap is None:
+            with self._lock:
+                if self._current is None:
+                    self._swap(*schema_fingerprints())
+                snap = self._current
+            self.start()
+        return snap
+
+    async def acurrent(self) -> dict:
+        snap = self._current
+        if snap is None:
+            # First load runs the sync reader; keep it off the event loop.
+            snap = await asyncio.to_thread(self.current)
+        return snap
+
+    def _swap(self, fingerprint: str, data_fingerprint: str):
+        snap = dict(schema_snapshot())
+        snap["fingerprint"] = fingerprint
+        snap["data_fingerprint"] = data_fingerprint
+        snap["version"] = (self._current or {}).get("version", 0) + 1
+        snap["loaded_at"] = time.time()
+        snap["filters"] = expansion_filters_for(snap)
+        self._current = snap  # single reference assignment: readers see old or new, never a mix
+        self.refreshes += 1
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild if either fingerprint moved (or `force`). Returns True when a new version was swapped in."""
+        fps = schema_fingerprints()
+        with self._lock:
+            self.checks += 1
+            cur = self._current
+            if not force and cur is not None and (cur["fingerprint"], cur["data_fingerprint"]) == fps:
+                return False
+            self._swap(*fps)
+            return True
+
+    def _loop(self):
+        while not self._stop.wait(self.refresh_s):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the last good version; try again next tick.
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def start(self):
+        if self.refresh_s <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="schema-catalog", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        snap = self._current or {}
+        return {
+            "version": snap.get("version"),
+            "fingerprint": snap.get("fingerprint"),
+            "data_fingerprint": snap.get("data_fingerprint"),
+            "loaded_at": snap.get("loaded_at"),
+            "labels": len(snap.get("labels", [])),
+            "relationships": len(snap.get("relationships", [])),
+            "checks": self.checks,
+            "refreshes": self.refreshes,
+            "last_error": self.last_error,
+        }
+
+
+_CATALOG = SchemaCatalog(settings.schema_refresh_s)
+
+
+def get_catalog() -> SchemaCatalog:
+    return _CATALOG
+
+
+def expansion_filters() -> tuple[str, str]:
+    """(relationshipFilter, labelFilter) for apoc.path.expandConfig, from the current version."""
+    return _CATALOG.current()["filters"]
+
+
+async def aexpansion_filters() -> tuple[str, str]:
+    return (await _CATALOG.acurrent())["filters"]
@@ -0,0 +1,164 @@
+# app/services/schema_select.py
+"""
+Question-relevant schema subset for the Cypher prompt (SCHEMA_PRUNE=true).
+
+Once per schema catalog version every label (properties + a few examples) and every
+relationship type (its (:A)-[:R]->(:B) patterns) is embedded. Per question, labels and
+relationship types are taken in order of similarity to the question while their prompt text
+fits SCHEMA_PROMPT_TOKENS; a relationship brings its endpoint labels along. Relationship types
+connecting two chosen labels are then added, so the subset stays joinable.
+
+The result has the schema_snapshot shape, so schema_text_for_llm and the value-hint builder
+render it unchanged.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional
+
+import numpy as np
+
+from app.core.settings import settings
+from app.services.embeddings import embed_one, aembed_one, embed_many, aembed_many
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1   # rough, tokenizer-free: ~4 characters per token
+
+
+def _label_doc(lab: str, meta: dict) -> str:
+    props = ", ".join(meta.get("properties", [])[:16])
+    ex = ", ".join(meta.get("samples", [])[:5])
+    return f"{lab}: properties {props}; examples {ex}"
+
+
+def _label_cost(lab: str, meta: dict) -> int:
+    # Props and examples lines of the schema text, plus the examples again in the value hints.
+    props = ", ".join(meta.get("properties", [])[:16])
+    samples = ", ".join(meta.get("samples", [])[:10])
+    return _tokens(f"{lab} props: {props}\n{lab} examples: {samples}\n- {lab} sample values: {samples}")
+
+
+class _Index:
+    """Embedded label/relationship descriptions for one catalog version."""
+
+    def __init__(self, snap: dict, vecs: list):
+        self.fingerprint = snap["fingerprint"]
+        self.labels = list(snap["labels"])
+        self.rels = list(snap["relationships"])
+        m = np.asarray(vecs, dtype=np.float32).reshape(len(self.labels) + len(self.rels), -1)
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        self.matrix = m / np.where(norms == 0, 1.0, norms)
+        self.ends: dict[str, set] = {}
+        for a, r, b in snap.get("patterns", []):
+            self.ends.setdefault(r, set()).update((a, b))
+
+    @staticmethod
+    def docs(snap: dict) -> list[str]:
+        by_rel: dict[str, list[str]] = {}
+        for a, r, b in snap.get("patterns", []):
+            by_rel.setdefault(r, []).append(f"(:{a})-[:{r}]->(:{b})")
+        return ([_label_doc(lab, snap["label_props"].get(lab, {})) for lab in snap["labels"]]
+                + [f"{r}: " + (", ".join(by_rel.get(r, [])[:6]) or r) for r in snap["relationships"]])
+
+
+_INDEX: Optional[_Index] = None
+_LOCK = threading.Lock()
+_COUNTS = {"builds": 0, "selections": 0, "tokens_saved": 0}
+
+
+def _current(snap: dict) -> Optional[_Index]:
+    idx = _INDEX
+    return idx if idx is not None and idx.fingerprint == snap["fingerprint"] else None
+
+
+def _index(snap: dict) -> _Index:
+    global _INDEX
+    idx = _current(snap)
+    if idx is None:
+        with _LOCK:
+            idx = _current(snap)
+            if idx is None:
+                idx = _INDEX = _Index(snap, embed_many(_Index.docs(snap)))
+                _COUNTS["builds"] += 1
+    return idx
+
+
+async def _aindex(snap: dict) -> _Index:
+    global _INDEX
+    idx = _current(snap)
+    if idx is None:
+        idx = _Index(snap, await aembed_many(_Index.docs(snap)))
+        if _current(snap) is None:  # another request may have built it meanwhile
+            _INDEX = idx
+            _COUNTS["builds"] += 1
+    return idx
+
+
+def _pick(idx: _Index, snap: dict, qvec, budget: int) -> dict:
+    q = np.asarray(qvec, dtype=np.float32)
+    q = q / (np.linalg.norm(q) or 1.0)
+    scores = idx.matrix @ q
+    n = len(idx.labels)
+    meta = snap["label_props"]
+    labels: list[str] = []
+    rels: list[str] = []
+    used = 0
+
+    def add_labels(new: list[str]) -> bool:
+        nonlocal used
+        new = [lab for lab in new if lab not in labels]
+        cost = sum(_label_cost(lab, meta.get(lab, {})) for lab in new)
+        if len(labels) >= settings.schema_prune_min_labels and used + cost > budget:
+            return False
+        labels.extend(new)
+        used += cost
+        return True
+
+    for i in np.argsort(-scores).tolist():
+        if used >= budget and len(labels) >= settings.schema_prune_min_labels:
+            break
+        if i < n:
+            add_labels([idx.labels[i]])
+        elif add_labels(sorted(idx.ends.get(idx.rels[i - n], ()))):
+            rels.append(idx.rels[i - n])
+
+    chosen = set(labels)
+    for a, r, b in snap.get("patterns", []):
+        if a in chosen and b in chosen and r not in rels:
+            rels.append(r)
+    patterns = [p for p in snap.get("patterns", []) if p[1] in rels and p[0] in chosen and p[2] in chosen]
+    return {
+        "labels": labels,
+        "relationships": sorted(rels),
+        "label_props": {lab: meta.get(lab, {}) for lab in labels},
+        "patterns": patterns,
+        "fingerprint": snap["fingerprint"],
+    }
+
+
+def _record(snap: dict, sub: dict):
+    full = sum(_label_cost(lab, snap["label_props"].get(lab, {})) for lab in snap["labels"][:12])
+    part = sum(_label_cost(lab, sub["label_props"][lab]) for lab in sub["labels"])
+    _COUNTS["selections"] += 1
+    _COUNTS["tokens_saved"] += max(0, full - part)
+
+
+def select(question: str, snap: dict, budget: int | None = None) -> dict:
+    """Snapshot-shaped subset of `snap` relevant to `question`."""
+    sub = _pick(_index(snap), snap, embed_one(question), budget or settings.schema_prompt_tokens)
+    _record(snap, sub)
+    return sub
+
+
+async def aselect(question: str, snap: dict, budget: int | None = None) -> dict:
+    idx, qvec = await asyncio.gather(_aindex(snap), aembed_one(question))
+    sub = _pick(idx, snap, qvec, budget or settings.schema_prompt_tokens)
+    _record(snap, sub)
+    return sub
+
+
+def select_stats() -> dict:
+    # tokens_saved: estimated, against the first 12 labels the unpruned prompt shows.
+    return dict(_COUNTS)
@@ -0,0 +1,7 @@
+import os
+
+# Settings() requires the Neo4j connection variables; unit tests never connect.
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_USER", "neo4j")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
+os.environ.setdefault("EMB_PROVIDER", "hashing")
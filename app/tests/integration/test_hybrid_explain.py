@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from app.core.settings import settings
+
+pytestmark = pytest.mark.skipif(not os.environ.get("NEO4J_INTEGRATION"),
+                                reason="set NEO4J_INTEGRATION=1 with a reachable NEO4J_URI")
+
+
+@pytest.mark.parametrize("rank", ["degree", "similarity"])
+def test_expand_query_plans(monkeypatch, rank):
+    from app.adapters.neo4j_client import explain
+    from app.retrievers import hybrid_generic
+
+    monkeypatch.setattr(settings, "expansion_engine", "cypher")
+    monkeypatch.setattr(settings, "hub_degree_threshold", 1000)
+    monkeypatch.setattr(settings, "hub_rank", rank)
+    query, params = hybrid_generic._expand_query([], 20, 50, None, vec=[0.0] * 8)
+    assert explain(query, params)  # raises Neo.ClientError.Statement.SyntaxError on scoping bugs
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import threading
+
+import numpy as np
+
+from app.adapters import csr_graph
+from app.core.settings import settings
+
+
+def _write_snapshot(path, edges: dict, version: str = "v1"):
+    """edges: node key -> [(neighbour key, rel type)], in slice order. Node ids are 'id:<key>'."""
+    keys = sorted({k for k in edges} | {j for nb in edges.values() for j, _ in nb})
+    pos = {k: i for i, k in enumerate(keys)}
+    rel_types = sorted({t for nb in edges.values() for _, t in nb})
+    indptr, indices, rels = [0], [], []
+    for k in keys:
+        for j, t in edges.get(k, []):
+            indices.append(pos[j])
+            rels.append(rel_types.index(t))
+        indptr.append(len(indices))
+    os.makedirs(path, exist_ok=True)
+    np.asarray(indptr, dtype=np.int64).tofile(os.path.join(path, "indptr.i64"))
+    np.asarray(indices, dtype=np.int32).tofile(os.path.join(path, "indices.i32"))
+    np.asarray(rels, dtype=np.uint16).tofile(os.path.join(path, "rels.u16"))
+    with open(os.path.join(path, "nodes.jsonl"), "w") as f:
+        for k in keys:
+            f.write(json.dumps({"id": f"id:{k}", "key": k}) + "\n")
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"nodes": len(keys), "edges": len(indices), "rel_types": rel_types, "version": version}, f)
+
+
+def test_async_load_runs_off_the_event_loop(tmp_path, monkeypatch):
+    _write_snapshot(str(tmp_path), {"a": [("b", "R")], "b": [("a", "R")]})
+    monkeypatch.setattr(settings, "csr_path", str(tmp_path))
+    monkeypatch.setattr(settings, "csr_reload_s", 0.0)
+    monkeypatch.setattr(csr_graph, "_GRAPH", None)
+    loaded_on = []
+    init = csr_graph.CSRGraph.__init__
+
+    def recording_init(self, path):
+        loaded_on.append(threading.get_ident())
+        init(self, path)
+
+    monkeypatch.setattr(csr_graph.CSRGraph, "__init__", recording_init)
+
+    async def main():
+        first = await csr_graph.aexpand(["id:a"])
+        _write_snapshot(str(tmp_path), {"a": [("c", "S")], "c": [("a", "S")]}, version="v2")
+        return first, await csr_graph.aexpand(["id:a"]), threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(main())
+    assert first == [{"a": "a", "rel": "R", "b": "b"}]
+    assert second == [{"a": "a", "rel": "S", "b": "c"}]
+    assert len(loaded_on) == 2 and loop_thread not in loaded_on
+
+
+_EDGES = {
+    "a": [("b", "R"), ("c", "R"), ("d", "S")],
+    "b": [("a", "R"), ("e", "T")],
+    "c": [("a", "R")],
+    "d": [("a", "S")],
+    "e": [("b", "T")],
+}
+
+
+def _triples(out):
+    return [(t["a"], t["rel"], t["b"]) for t in out]
+
+
+def test_expand_per_seed_limit_and_hops(tmp_path):
+    _write_snapshot(str(tmp_path), _EDGES)
+    graph = csr_graph.CSRGraph(str(tmp_path))
+    assert _triples(graph.expand(["id:a"], per_seed=2)) == [("a", "R", "b"), ("a", "R", "c")]
+    assert _triples(graph.expand(["id:a"], hops=2)) == [
+        ("a", "R", "b"), ("a", "R", "c"), ("a", "S", "d"), ("b", "T", "e")]  # no edges back to hop 0
+    assert len(graph.expand(["id:a"], limit=2, hops=2)) == 2
+    assert graph.expand(["id:missing"]) == []
+
+
+def test_expand_dedupes_and_reports_hubs(tmp_path, monkeypatch):
+    _write_snapshot(str(tmp_path), _EDGES)
+    graph = csr_graph.CSRGraph(str(tmp_path))
+    monkeypatch.setattr(settings, "hub_degree_threshold", 3)
+    stats = {}
+    out = _triples(graph.expand(["id:a", "id:a", "id:b"], per_seed=3, stats=stats))
+    assert out == [("a", "R", "b"), ("a", "R", "c"), ("a", "S", "d"), ("b", "R", "a"), ("b", "T", "e")]
+    assert stats == {"hub_seeds_truncated": 0, "csr_version": "v1"}
+    graph.expand(["id:a"], per_seed=2, stats=stats)
+    assert stats["hub_seeds_truncated"] == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from app.services import cypher_guard
+from app.services.cypher_guard import CypherRejected, plan_problem
+
+
+def _op(name, rows, *children):
+    return {"operatorType": f"{name}@neo4j", "args": {"EstimatedRows": rows}, "identifiers": [],
+            "children": list(children)}
+
+
+def test_cartesian_product_rejected():
+    plan = _op("ProduceResults", 10.0,
+               _op("CartesianProduct", 1e6, _op("NodeByLabelScan", 1e3), _op("NodeByLabelScan", 1e3)))
+    assert plan_problem(plan)[0] == "cartesian_product"
+
+
+def test_all_nodes_scan_rejected():
+    plan = _op("ProduceResults", 1.0, _op("EagerAggregation", 1.0, _op("AllNodesScan", 5e5)))
+    assert plan_problem(plan)[0] == "all_nodes_scan"
+
+
+def test_estimated_rows_rejected():
+    plan = _op("ProduceResults", 10.0, _op("VarLengthExpand(All)", 5e7, _op("NodeByLabelScan", 100.0)))
+    assert plan_problem(plan)[0] == "estimated_rows"
+
+
+def test_cheap_plan_passes():
+    plan = _op("ProduceResults", 25.0, _op("Limit", 25.0, _op("Expand(All)", 400.0, _op("NodeIndexSeek", 1.0))))
+    assert plan_problem(plan) is None
+
+
+def test_check_raises_with_reason(monkeypatch):
+    monkeypatch.setattr(cypher_guard, "explain", lambda cypher, params=None: _op(
+        "ProduceResults", 1.0, _op("CartesianProduct", 1e6)))
+    with pytest.raises(CypherRejected, match="CartesianProduct"):
+        cypher_guard.check("MATCH (a), (b) RETURN count(*)")
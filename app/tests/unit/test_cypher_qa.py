@@ -0,0 +1,59 @@
+from app.services import cypher_guard, cypher_qa
+
+
+class _Chain:
+    def __init__(self, corrector):
+        self.cypher_query_corrector = corrector
+
+
+def test_validate_cypher_does_not_explain(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cypher_guard, "explain", lambda cypher, params=None: calls.append(cypher) or {})
+    chain = _Chain(cypher_qa._GuardedCorrector([]))
+    assert cypher_qa._validate_cypher(chain, "```cypher\nMATCH (n:Farm) RETURN n LIMIT 5\n```").strip() \
+        == "MATCH (n:Farm) RETURN n LIMIT 5"
+    assert calls == []
+    chain.cypher_query_corrector("MATCH (n:Farm) RETURN n LIMIT 5")  # the chain's own call is guarded
+    assert len(calls) == 1
+
+
+def test_async_candidate_uses_only_aexplain(monkeypatch):
+    import asyncio
+
+    sync_calls, async_calls = [], []
+    monkeypatch.setattr(cypher_guard, "explain", lambda cypher, params=None: sync_calls.append(cypher) or {})
+
+    async def aexplain(cypher, params=None):
+        async_calls.append(cypher)
+        return {}
+
+    class _Gen:
+        async def ainvoke(self, inputs):
+            return "MATCH (n:Farm) RETURN n LIMIT 5"
+
+    monkeypatch.setattr(cypher_guard, "aexplain", aexplain)
+    monkeypatch.setattr(cypher_qa, "_CANDIDATES", [_Gen()])
+    i, cypher, err = asyncio.run(cypher_qa._acandidate(_Chain(cypher_qa._GuardedCorrector([])), 0, "q", None))
+    assert err is None and cypher
+    assert sync_calls == [] and len(async_calls) == 1
+
+
+def test_chain_graph_fetches_at_most_max_rows(monkeypatch):
+    from app.core.settings import settings
+
+    class _Record(dict):
+        def data(self):
+            return dict(self)
+
+    calls = []
+
+    def run_read(cypher, params=None, timeout=None, max_rows=None):
+        calls.append((cypher, timeout, max_rows))
+        return [_Record(n=i) for i in range(max_rows)]
+
+    monkeypatch.setattr(settings, "cypher_max_rows", 3)
+    monkeypatch.setattr(cypher_qa, "run_read", run_read)
+    graph = object.__new__(cypher_qa._LimitedGraph)  # no driver: queries go through run_read
+    graph.sanitize = False
+    assert graph.query("MATCH (n) RETURN n") == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert calls == [("MATCH (n) RETURN n", settings.cypher_timeout_s, 3)]
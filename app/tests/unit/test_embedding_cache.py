@@ -0,0 +1,37 @@
+from app.services import embedding_cache
+from app.services.embedding_cache import EmbeddingCache
+
+_V = [0.5, -0.25, 1.0]
+
+
+def test_lru_and_normalized_keys():
+    cache = EmbeddingCache(max_items=2, ttl_s=0)
+    cache.put("m", "Which  farms?", _V)
+    assert cache.get("m", "which farms?") == _V
+    assert cache.get("other-model", "which farms?") is None
+    cache.put("m", "b", _V)
+    cache.get("m", "which farms?")            # most recently used again
+    cache.put("m", "c", _V)
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "which farms?") == _V
+    assert EmbeddingCache(max_items=0).get("m", "x") is None
+
+
+def test_ttl_expires_both_tiers(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: now[0])
+    cache = EmbeddingCache(max_items=10, ttl_s=60, path=str(tmp_path / "emb.sqlite"))
+    cache.put("m", "q", _V)
+    now[0] += 61
+    assert cache.get("m", "q") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_sqlite_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    EmbeddingCache(max_items=10, ttl_s=0, path=path).put("m", "q", _V)
+    other = EmbeddingCache(max_items=10, ttl_s=0, path=path)   # another worker / a restart
+    assert other.get("m", "q") == _V
+    assert other.get("m", "q") == _V                          # now from memory
+    stats = other.stats()
+    assert stats["hits"] == 2 and stats["disk_hits"] == 1 and stats["disk"] is True
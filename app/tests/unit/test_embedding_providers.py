@@ -0,0 +1,15 @@
+import asyncio
+
+from app.adapters.embedding_providers import HashingProvider
+from app.core.settings import settings
+
+
+def test_async_batches_on_a_single_thread_pool(monkeypatch):
+    # More texts than one batch with one worker: deadlocked when the whole call ran on the pool.
+    monkeypatch.setattr(settings, "local_emb_threads", 1)
+    monkeypatch.setattr(settings, "local_emb_batch", 2)
+    provider = HashingProvider()
+    texts = [f"text {i}" for i in range(5)]
+    vecs = asyncio.run(asyncio.wait_for(provider.aembed_documents(texts), timeout=5))
+    assert vecs == provider.embed_documents(texts)
+    assert asyncio.run(provider.aembed_query("text 0")) == vecs[0]
@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.adapters import openai_client
+from app.core.settings import settings
+from app.services import fusion
+
+
+class _LLM:
+    def __init__(self, chunks, fail=False):
+        self.chunks, self.fail = chunks, fail
+
+    async def astream(self, messages):
+        for c in self.chunks:
+            yield SimpleNamespace(content=c)
+        if self.fail:
+            raise RuntimeError("upstream closed")
+
+
+def _stream(**kwargs):
+    return fusion.astream_fuse_answer(question="q", facts="- (a)-[R]->(b)", cypher_result=None,
+                                      cypher_context=None, **kwargs)
+
+
+def test_slot_is_released_before_a_slow_client_reads(monkeypatch):
+    monkeypatch.setattr(fusion, "make_chat", lambda: _LLM(["a", "b", "c"]))
+    gate = openai_client._gate(settings.chat_model)
+
+    async def main():
+        stream = _stream()
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)  # the client stalls; the upstream has finished meanwhile
+        in_flight = gate.stats()["in_flight"]
+        return [first] + [t async for t in stream], in_flight
+
+    chunks, in_flight = asyncio.run(main())
+    assert chunks == ["a", "b", "c"]
+    assert in_flight == 0
+
+
+def test_upstream_failure_before_any_token_falls_back(monkeypatch):
+    monkeypatch.setattr(fusion, "make_chat", lambda: _LLM([], fail=True))
+
+    async def main():
+        return [t async for t in _stream()]
+
+    assert asyncio.run(main()) == [fusion._fallback("- (a)-[R]->(b)", None)]
+    assert openai_client._gate(settings.chat_model).stats()["in_flight"] == 0
@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+from app.core.settings import settings
+from app.retrievers import hybrid_generic
+
+
+def _projected(with_clause: str) -> set:
+    """Variable names a `WITH a, b, expr AS c ...` clause keeps in scope."""
+    body = re.split(r"\b(?:WHERE|ORDER BY|LIMIT)\b", with_clause[len("WITH"):])[0]
+    parts, depth, cur = [], 0, ""
+    for ch in body:
+        depth += ch in "({[" and 1 or ch in ")}]" and -1 or 0
+        if ch == "," and depth == 0:
+            parts.append(cur)
+            cur = ""
+        else:
+            cur += ch
+    parts.append(cur)
+    return {re.split(r"\bAS\b", p)[-1].strip() for p in parts}
+
+
+@pytest.mark.parametrize("rank", ["degree", "similarity"])
+def test_hub_branch_keeps_rank_inputs_in_scope(monkeypatch, rank):
+    monkeypatch.setattr(settings, "expansion_engine", "cypher")
+    monkeypatch.setattr(settings, "hub_degree_threshold", 1000)
+    monkeypatch.setattr(settings, "hub_rank", rank)
+    query, params = hybrid_generic._expand_query(["id"], 20, 50, None, vec=[0.1, 0.2])
+    hub = query.split("UNION ALL", 1)[1]
+    scope = set()
+    for line in hub.splitlines():
+        line = line.strip()
+        if line.startswith("WITH"):
+            if "AS score" in line:
+                expr = line[len("WITH"):].rsplit(" AS score", 1)[0]
+                used = set(re.findall(r"\b(qv|nbr|r)\b", expr.split(",", 2)[-1]))
+                assert used <= scope, f"{used - scope} not in scope for {rank} rank"
+                break
+            scope = _projected(line)
+    if rank == "similarity":
+        assert params["embProp"] == settings.emb_property
+
+
+def test_async_batch_runs_local_knn_off_the_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    monkeypatch.setattr(settings, "expansion_engine", "cypher")
+    monkeypatch.setattr(settings, "knn_backend", "local")
+    searched_on = []
+
+    def search(vec, k=8, with_vectors=False):
+        searched_on.append(threading.get_ident())
+        return [{"id": f"s{vec[0]}"}]
+
+    sent = []
+
+    async def arun_read(query, params=None, **kwargs):
+        sent.append(params)
+        return [{"qi": 1, "triples": [{"a": "x", "rel": "R", "b": "y"}], "hubs": []}]
+
+    monkeypatch.setattr(hybrid_generic.local_ann, "search", search)
+    monkeypatch.setattr(hybrid_generic, "arun_read", arun_read)
+
+    async def main():
+        out = await hybrid_generic.aretrieve_batch([[0.0, 1.0], [1.0, 0.0]], k=1)
+        return out, threading.get_ident()
+
+    out, loop_thread = asyncio.run(main())
+    assert out == [[], [{"a": "x", "rel": "R", "b": "y"}]]
+    assert sent[0]["seedIds"] == [["s0.0"], ["s1.0"]]
+    assert searched_on and loop_thread not in searched_on
@@ -0,0 +1,27 @@
+import json
+import os
+
+import numpy as np
+
+from app.adapters.local_ann import LocalVectorIndex
+
+
+def _write_snapshot(path, rows: list[tuple[str, list[float]]]):
+    np.asarray([v for _, v in rows], dtype=np.float32).tofile(os.path.join(path, "vectors.f32"))
+    with open(os.path.join(path, "ids.jsonl"), "w") as f:
+        for node_id, _ in rows:
+            f.write(json.dumps({"id": node_id, "labels": ["Farm"], "nodeId": node_id}) + "\n")
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"rows": len(rows), "dims": len(rows[0][1]), "version": "v1"}, f)
+
+
+def test_search_skips_superseded_rows(tmp_path):
+    # n1 was re-embedded by an --append export: only its latest row is live.
+    _write_snapshot(str(tmp_path), [("n1", [1.0, 0.0]), ("n2", [0.0, 1.0]), ("n1", [-1.0, 0.0])])
+    index = LocalVectorIndex(str(tmp_path))
+    assert index.live.tolist() == [False, True, True]
+    hits = index.search([2.0, 0.0], k=5, with_vectors=True)
+    assert [(h["id"], h["score"]) for h in hits] == [("n2", 0.5), ("n1", 0.0)]
+    assert hits[1]["vec"].tolist() == [-1.0, 0.0]
+    assert [h["id"] for h in index.search([0.0, 1.0], k=1)] == ["n2"]
+    assert index.search([1.0, 0.0], k=0) == []
@@ -0,0 +1,26 @@
+import pytest
+
+from app.core.settings import settings
+from app.retrievers.semantic import lucene_query, rrf_merge
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What farms grow almonds in CA?", "farms grow almonds CA"),
+    ("Which crops are grown in OR", 'crops grown "OR"'),              # state code, not an operator
+    ("Who owns NodeID:farm-1?", r"owns NodeID\:farm\-1"),
+    ("what is the", ""),
+])
+def test_lucene_query(question, expected):
+    assert lucene_query(question) == expected
+
+
+def test_rrf_merge_sums_reciprocal_ranks(monkeypatch):
+    monkeypatch.setattr(settings, "rrf_k", 60)
+    dense = [{"id": "a", "score": 0.9, "vec": [1.0]}, {"id": "b", "score": 0.8, "vec": [0.5]}]
+    lexical = [{"id": "b", "score": 12.0}, {"id": "c", "score": 3.0}]
+    merged = rrf_merge([dense, lexical], k=3)
+    assert [r["id"] for r in merged] == ["b", "a", "c"]
+    assert merged[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
+    assert merged[0]["vec"] == [0.5]              # row fields come from the first list it appears in
+    assert [r["id"] for r in rrf_merge([dense, lexical], k=1)] == ["b"]
+    assert rrf_merge([], k=3) == []
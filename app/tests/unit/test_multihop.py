@@ -0,0 +1,29 @@
+from app.retrievers.multihop import _Beam
+
+
+def _expand(beam):
+    """Stand-in for the hop query: every frontier node has plenty of fresh neighbours."""
+    _, params = beam.query()
+    rows = []
+    for f in params["frontier"]:
+        for j in range(params["perNode"]):
+            rows.append({"a": f["id"], "rel": "R", "b": f"{f['id']}.{j}", "nbrId": f"{f['id']}.{j}",
+                         "score": f["score"] * 0.5})
+    return rows[:params["remaining"]]
+
+
+def test_budget_is_shared_across_hops():
+    seeds = [{"id": f"s{i}", "score": 1.0 - i / 10} for i in range(8)]
+    beam = _Beam(seeds, limit=25, per_seed=20, hops=3)
+    while beam.pending():
+        beam.advance(_expand(beam))
+    stats = {}
+    triples = beam.result(stats)
+    assert stats["hops"] == 3
+    assert len(triples) == 25
+    assert any(t["a"].count(".") >= 1 for t in triples)  # triples from beyond the seeds
+
+
+def test_single_hop_uses_whole_limit():
+    beam = _Beam([{"id": "s0", "score": 1.0}], limit=25, per_seed=20, hops=1)
+    assert beam.query()[1]["remaining"] == 25
@@ -0,0 +1,37 @@
+from app.core.settings import settings
+from app.services import neighbour_cache
+from app.services.neighbour_cache import NeighbourhoodCache
+
+_T = [{"a": "x", "rel": "R", "b": "y"}]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = NeighbourhoodCache(max_items=2, ttl_s=0)
+    cache.put("s1", 20, "v1", _T, False)
+    cache.put("s2", 20, "v1", _T, True)
+    assert cache.get_many(["s1"], 20, "v1") == {"s1": (_T, False)}  # s1 is now the most recent
+    cache.put("s3", 20, "v1", _T, False)
+    assert set(cache.get_many(["s1", "s2", "s3"], 20, "v1")) == {"s1", "s3"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_new_version_and_ttl_make_entries_stale(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(neighbour_cache.time, "time", lambda: now[0])
+    cache = NeighbourhoodCache(max_items=10, ttl_s=60)
+    cache.put("s1", 20, "v1", _T, False)
+    cache.put("s2", 20, "v1", _T, False)
+    assert cache.get_many(["s1"], 20, "v2") == {}
+    now[0] += 61
+    assert cache.get_many(["s2"], 20, "v1") == {}
+    stats = cache.stats()
+    assert stats["stale"] == 2 and stats["size"] == 0 and stats["hit_rate"] == 0.0
+
+
+def test_key_covers_per_seed_and_expansion_settings(monkeypatch):
+    cache = NeighbourhoodCache(max_items=10, ttl_s=0)
+    cache.put("s1", 20, "v1", _T, False)
+    assert cache.get_many(["s1"], 10, "v1") == {}
+    monkeypatch.setattr(settings, "hub_rank", "similarity" if settings.hub_rank != "similarity" else "degree")
+    assert cache.get_many(["s1"], 20, "v1") == {}
+    assert NeighbourhoodCache(max_items=0).enabled is False
@@ -0,0 +1,72 @@
+import asyncio
+
+from neo4j import READ_ACCESS
+
+from app.adapters import neo4j_client
+
+
+class _Result(list):
+    def fetch(self, n):
+        return self[:n]
+
+
+class _AsyncResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, n):
+        return self.rows[:n]
+
+
+class _Session:
+    def __init__(self, rows, is_async=False):
+        self.rows, self.is_async = rows, is_async
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        if self.is_async:
+            async def run():
+                return _AsyncResult(self.rows)
+            return run()
+        return _Result(self.rows)
+
+
+class _Driver:
+    def __init__(self, is_async=False):
+        self.modes = []
+        self.is_async = is_async
+
+    def session(self, **kwargs):
+        self.modes.append(kwargs.get("default_access_mode"))
+        return _Session([{"n": 1}, {"n": 2}], self.is_async)
+
+
+def test_sessions_are_read_only(monkeypatch):
+    driver, adriver = _Driver(), _Driver(is_async=True)
+    monkeypatch.setattr(neo4j_client, "_driver", driver)
+    monkeypatch.setattr(neo4j_client, "_get_async_driver", lambda: adriver)
+    assert neo4j_client.run_read("MATCH (n) RETURN n") == [{"n": 1}, {"n": 2}]
+    assert neo4j_client.run_read("MATCH (n) RETURN n", max_rows=1) == [{"n": 1}]
+    assert asyncio.run(neo4j_client.arun_read("MATCH (n) RETURN n", max_rows=1)) == [{"n": 1}]
+    assert driver.modes == [READ_ACCESS, READ_ACCESS] and adriver.modes == [READ_ACCESS]
+
+
+def test_query_count_is_exact_across_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(neo4j_client, "_driver", _Driver())
+    before = neo4j_client.query_stats()["queries"]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: neo4j_client.run_read("RETURN 1"), range(400)))
+    assert neo4j_client.query_stats()["queries"] - before == 400
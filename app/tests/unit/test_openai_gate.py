@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+from app.adapters.openai_client import _ModelGate
+
+
+def test_limit_is_shared_by_sync_and_async_callers():
+    gate = _ModelGate(2)
+    lock = threading.Lock()
+    peak = [0, 0]  # current, max
+
+    def enter():
+        with lock:
+            peak[0] += 1
+            peak[1] = max(peak[1], peak[0])
+
+    def leave():
+        with lock:
+            peak[0] -= 1
+
+    def sync_call():
+        with gate.slot():
+            enter()
+            time.sleep(0.02)
+            leave()
+
+    async def async_call():
+        async with gate.aslot():
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+
+    async def main():
+        threads = [threading.Thread(target=sync_call) for _ in range(6)]
+        for t in threads:
+            t.start()
+        await asyncio.gather(*(async_call() for _ in range(6)))
+        for t in threads:
+            t.join()
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
+    stats = gate.stats()
+    assert peak[1] <= 2
+    assert stats["calls"] == 12 and stats["in_flight"] == 0 and stats["waiting"] == 0
+
+
+def test_cancelled_async_waiter_does_not_leak_a_slot():
+    gate = _ModelGate(1)
+
+    async def main():
+        async with gate.aslot():
+            waiter = asyncio.ensure_future(gate.aslot().__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+        async with gate.aslot():
+            pass
+
+    asyncio.run(asyncio.wait_for(main(), timeout=5))
+    assert gate.stats()["in_flight"] == 0 and gate.stats()["waiting"] == 0
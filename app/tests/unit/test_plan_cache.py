@@ -0,0 +1,54 @@
+from app.services.plan_cache import PlanCache, make_plan
+
+COUNT_Q = "How many farms are in CA?"
+COUNT_CYPHER = "MATCH (f:Farm)-[:LOCATED_IN]->(s:State {code: 'CA'}) RETURN count(f) AS n"
+
+
+def _cache_with(question, cypher):
+    cache = PlanCache()
+    cache.put(make_plan(question, cypher), None, "fp")
+    return cache
+
+
+def test_make_plan_parameterizes_shared_literals():
+    plan = make_plan("Which farms grow Almonds in CA?",
+                     "MATCH (f:Farm)-[:GROWS]->(:Crop {name: 'almonds'}), (f)-[:LOCATED_IN]->(:State {code: 'CA'}) "
+                     "RETURN f.name LIMIT 25")
+    assert plan.template == "which farms grow <v0> in <v1>"
+    assert "$v0" in plan.cypher and "$v1" in plan.cypher and "LIMIT 25" in plan.cypher
+    assert plan.kinds == ["str", "str"]
+
+
+def test_match_binds_same_shape():
+    cache = _cache_with(COUNT_Q, COUNT_CYPHER)
+    assert cache.match("how many farms are in OR", "fp") == (COUNT_CYPHER.replace("'CA'", "$v0"), {"v0": "OR"})
+
+
+def test_match_rejects_longer_question():
+    cache = _cache_with(COUNT_Q, COUNT_CYPHER)
+    assert cache.match("How many farms are in CA that grow almonds and were certified in 2020?", "fp") is None
+
+
+def test_match_rejects_compound_value():
+    cache = _cache_with(COUNT_Q, COUNT_CYPHER)
+    assert cache.match("how many farms are in CA or OR", "fp") is None
+
+
+def test_multi_word_slot_keeps_word_count():
+    cache = _cache_with("Which farms are in Fresno County?",
+                        "MATCH (f:Farm)-[:IN]->(c:County {name: 'Fresno County'}) RETURN f.name")
+    assert cache.match("which farms are in Kern County", "fp")[1] == {"v0": "Kern County"}
+    assert cache.match("which farms are in Kern", "fp") is None
+
+
+def test_bind_rejects_template_words():
+    cache = _cache_with("Which farms grow Almonds in CA?",
+                        "MATCH (f:Farm)-[:GROWS]->(:Crop {name: 'Almonds'}), (f)-[:LOCATED_IN]->(:State {code: 'CA'}) "
+                        "RETURN f.name")
+    assert cache.match("which farms grow farms in CA", "fp") is None
+
+
+def test_new_fingerprint_empties_cache():
+    cache = _cache_with(COUNT_Q, COUNT_CYPHER)
+    assert cache.match("how many farms are in OR", "other") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,30 @@
+from app.adapters import schema_reader
+
+
+def test_snapshot_skips_bookkeeping_props(monkeypatch):
+    node_props = [{"nodeLabels": ["Farm"], "propertyName": p}
+                  for p in ["name", "acres", *sorted(schema_reader.BOOKKEEPING_PROPS)]]
+
+    def run_read(query, params=None):
+        if query is schema_reader._NODE_TYPE_PROPS:
+            return node_props
+        return []
+
+    monkeypatch.setattr(schema_reader, "run_read", run_read)
+    snap = schema_reader.schema_snapshot()
+    assert snap["label_props"]["Farm"]["properties"] == ["acres", "name"]
+    assert "degree" not in schema_reader.schema_text_for_llm(snap)
+
+
+def _fingerprints(monkeypatch, **row):
+    base = {"labels": ["Farm", "Crop"], "rels": ["GROWS"], "keys": ["name"], "nodes": 10, "edges": 4}
+    monkeypatch.setattr(schema_reader, "run_read", lambda query, params=None: [{**base, **row}])
+    return schema_reader.schema_fingerprints()
+
+
+def test_data_writes_move_only_the_data_fingerprint(monkeypatch):
+    schema, data = _fingerprints(monkeypatch)
+    assert _fingerprints(monkeypatch, labels=["Crop", "Farm"]) == (schema, data)
+    more_schema, more_data = _fingerprints(monkeypatch, nodes=11, edges=5)
+    assert more_schema == schema and more_data != data
+    assert _fingerprints(monkeypatch, keys=["name", "acres"])[0] != schema
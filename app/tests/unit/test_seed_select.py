@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.retrievers.seed_select import cut_k, mmr, select
+
+_STEP = np.asarray([0.9, 0.88, 0.5, 0.49], dtype=np.float32)  # one big drop after the second
+
+
+def test_cut_k_edges():
+    assert cut_k(np.zeros(0), 8, 1, 0.15, 0.0) == (0, 0)
+    assert cut_k(_STEP, 8, 1, 0.15, 0.0) == (2, 4)     # gap cut
+    assert cut_k(_STEP, 8, 3, 0.15, 0.0) == (3, 4)     # min_k clamps the gap cut
+    assert cut_k(_STEP, 8, 1, 0.0, 0.0) == (4, 4)      # gap off
+    assert cut_k(_STEP, 1, 1, 0.0, 0.0) == (1, 4)      # max_k
+    assert cut_k(_STEP[:1], 8, 3, 0.15, 0.0) == (1, 1)  # min_k beyond the candidates
+
+
+def test_cut_k_threshold_with_nothing_eligible_keeps_min_k():
+    assert cut_k(np.asarray([0.3, 0.2, 0.1]), 8, 2, 0.15, 0.5) == (2, 2)
+    assert cut_k(np.asarray([0.9, 0.8, 0.1]), 8, 1, 0.0, 0.5) == (2, 2)
+
+
+_VECS = np.asarray([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]], dtype=np.float32)
+_SCORES = np.asarray([0.9, 0.89, 0.5], dtype=np.float32)
+
+
+def test_mmr_lambda_extremes():
+    assert mmr(_SCORES, _VECS, 2, 1.0) == [0, 1]   # pure relevance
+    assert mmr(_SCORES, _VECS, 2, 0.0) == [0, 2]   # pure diversity: skip the near-duplicate
+    assert mmr(_SCORES, _VECS, 2, 0.9) == [0, 1]
+    assert mmr(_SCORES, _VECS, 5, 0.5) == [0, 1, 2]
+
+
+def test_select_orders_by_score_and_diversifies():
+    rows = [{"id": i, "score": float(s), "vec": v.tolist()} for i, (s, v) in enumerate(zip(_SCORES, _VECS))]
+    rows.reverse()
+    assert [r["id"] for r in select(rows, 2, gap=0.0, lam=0.0)] == [0, 2]
+    assert [r["id"] for r in select(rows, 2, gap=0.0, lam=1.0)] == [0, 1]
+    assert select([], 4) == []
+
+
+def test_select_without_vectors_keeps_score_order():
+    rows = [{"id": "b", "score": 0.5}, {"id": "a", "score": 0.9, "vec": [1.0, 0.0]}]
+    assert [r["id"] for r in select(rows, 2, gap=0.0, lam=0.0)] == ["a", "b"]
@@ -1,57 +1,63 @@
+# Run from the repo root: python -m scripts.backfill_embeddings
 import os, time
 from neo4j import GraphDatabase
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from app.adapters.embedding_providers import get_provider
+from app.core.settings import settings
+
 NEO4J_URI  = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASS = os.getenv("NEO4J_PASS")
-OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-EMB_MODEL  = os.getenv("EMB_MODEL", "text-embedding-3-large")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "200"))
 
-# Sanity: pick expected dimension from model name
-EXPECTED_DIMS = 3072 if "3-large" in EMB_MODEL else 1536
-
 driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-client  = OpenAI(api_key=OPENAI_KEY)
+# Same provider the API uses for query embeddings (EMB_PROVIDER), so vectors stay comparable.
+provider = get_provider()
 
+# settings.emb_property lets reduced-size variants (e.g. embedding_256) live next to the full vectors.
 FETCH_QUERY = """
 MATCH (n:Embeddable)
-WHERE n.card IS NOT NULL AND n.embedding IS NULL
+WHERE n.card IS NOT NULL AND n[$prop] IS NULL
 RETURN elementId(n) AS id, n.card AS text
 LIMIT $batch
 """
 
+# setNodeVectorProperty stores a float32 vector (half the size of a generic float list)
+# and validates it as a vector; one UNWIND per batch instead of one transaction per node.
 SET_QUERY = """
-MATCH (n) WHERE elementId(n) = $id
-SET n.embedding = $vec
+UNWIND $rows AS row
+MATCH (n) WHERE elementId(n) = row.id
+SET n.embedding_updatedAt = datetime()
+WITH n, row
+CALL db.create.setNodeVectorProperty(n, $prop, row.vec)
 """
 
 def fetch_nodes(tx, batch):
-    return list(tx.run(FETCH_QUERY, batch=batch))
+    return list(tx.run(FETCH_QUERY, batch=batch, prop=settings.emb_property))
 
-def set_embedding(tx, node_id, vec):
-    tx.run(SET_QUERY, id=node_id, vec=vec)
+def set_embeddings(tx, rows):
+    tx.run(SET_QUERY, rows=rows, prop=settings.emb_property)
 
-def get_index_dims(tx):
+def get_index_dims(tx, index_name):
     q = """
     SHOW INDEXES YIELD name, options
-    WHERE name = 'emb_card_idx'
+    WHERE name = $name
     RETURN toInteger(options['indexConfig']['vector.dimensions']) AS dims
     """
-    rec = tx.run(q).single()
+    rec = tx.run(q, name=index_name).single()
     return rec["dims"] if rec else None
 
 def main():
     with driver.session() as sess:
-        dims = sess.execute_read(get_index_dims)
-        if dims and dims != EXPECTED_DIMS:
+        dims = sess.execute_read(get_index_dims, settings.vector_index)
+        if dims and dims != provider.dims:
             raise RuntimeError(
-                f"Index dimension {dims} != expected {EXPECTED_DIMS} for {EMB_MODEL}. "
-                "Fix the index or change the model."
+                f"Index {settings.vector_index} has dimension {dims} != {provider.dims} "
+                f"for provider {settings.emb_provider} ({provider.name}). "
+                "Fix the index or change the provider/model."
             )
 
         total = 0
@@ -61,19 +67,20 @@ def main():
                 break
 
             texts = [r["text"] for r in rows]
-            # Call embeddings API
-            resp = client.embeddings.create(model=EMB_MODEL, input=texts)
-            vectors = [d.embedding for d in resp.data]
+            # Batched inference (remote API call or local thread pool)
+            vectors = provider.embed_documents(texts)
 
             # Write back
-            for rec, vec in zip(rows, vectors):
-                sess.execute_write(set_embedding, rec["id"], vec)
+            sess.execute_write(set_embeddings, [
+                {"id": rec["id"], "vec": vec} for rec, vec in zip(rows, vectors)
+            ])
 
             total += len(rows)
             print(f"Upserted {total} embeddings...")
 
-            # Gentle pacing to avoid rate limits
-            time.sleep(0.3)
+            # Gentle pacing to avoid rate limits (remote provider only)
+            if settings.emb_provider == "openai":
+                time.sleep(0.3)
 
     print("Done.")
 
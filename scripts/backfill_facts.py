@@ -0,0 +1,65 @@
+# Run from the repo root: python -m scripts.backfill_facts [--full]
+"""
+Precompute each :Embeddable node's neighbourhood as a capped `facts` list for
+EXPANSION_ENGINE=facts, where hybrid retrieval reads it right after KNN instead of expanding.
+
+  n.facts            ["REL\\tNodeID", ...], best-connected neighbours first, at most --per-type
+                     per relationship type and --cap in total
+  n.facts_degree     relationship count when the list was built
+  n.facts_updatedAt  datetime of the last refresh
+
+By default only nodes whose relationship count changed since their last refresh (or that
+have no facts yet) are rebuilt, so it is cheap to run after every ingest; --full rebuilds all.
+An edge swapped for another without changing the count is only picked up by --full.
+"""
+import argparse
+
+from neo4j import GraphDatabase
+
+from app.core.settings import settings
+
+FACTS_QUERY = """
+MATCH (n:Embeddable)
+WHERE $full OR n.facts IS NULL OR n.facts_degree <> COUNT { (n)--() }
+CALL {
+  WITH n
+  CALL {
+    WITH n
+    MATCH (n)-[r]-(m)
+    WHERE labels(m) <> []
+    WITH type(r) AS rel, coalesce(m.degree, 0) AS deg,
+         coalesce(m.NodeID, labels(m)[0] + ':' + coalesce(m.code, m.name)) AS b
+    ORDER BY deg DESC
+    WITH rel, collect(DISTINCT {b: b, deg: deg})[..$perType] AS picks
+    UNWIND picks AS p
+    // Re-rank across types so --cap drops the least-connected neighbours, not whole types.
+    WITH rel, p ORDER BY p.deg DESC
+    RETURN collect(rel + '\\t' + p.b)[..$cap] AS facts
+  }
+  SET n.facts = facts,
+      n.facts_degree = COUNT { (n)--() },
+      n.facts_updatedAt = datetime()
+} IN TRANSACTIONS OF $batch ROWS
+"""
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--full", action="store_true", help="rebuild every node, not just changed ones")
+    ap.add_argument("--cap", type=int, default=40, help="facts kept per node")
+    ap.add_argument("--per-type", type=int, default=10, help="facts kept per relationship type")
+    ap.add_argument("--batch", type=int, default=5000)
+    args = ap.parse_args()
+
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        # CALL ... IN TRANSACTIONS needs an auto-commit transaction, so session.run rather than execute_write.
+        counters = s.run(FACTS_QUERY, full=args.full, cap=args.cap, perType=args.per_type,
+                         batch=args.batch).consume().counters
+    driver.close()
+    # Three properties per refreshed node.
+    print(f"Refreshed facts on {counters.properties_set // 3} nodes.")
+
+
+if __name__ == "__main__":
+    main()
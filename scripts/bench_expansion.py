@@ -0,0 +1,81 @@
+# Run from the repo root: python -m scripts.bench_expansion [--degrees 10 100 1000 10000]
+"""
+Expansion-engine latency (EXPANSION_ENGINE=apoc vs cypher) over seeds of increasing degree.
+
+Creates one synthetic star per degree — a :BenchHub with N :BenchLeaf neighbours — runs the
+1-hop expansion from each hub with both engines, checks that they return the same triples,
+and deletes the synthetic nodes again (also on failure).
+"""
+import argparse
+import statistics
+import time
+
+from neo4j import GraphDatabase
+
+from app.adapters.neo4j_client import run_read
+from app.core.settings import settings
+from app.retrievers import hybrid_generic
+from app.services.schema_catalog import get_catalog
+from scripts.compare_dims import _p95
+
+CREATE_STAR = """
+CREATE (h:BenchHub {NodeID: 'bench:hub:' + toString($degree)})
+WITH h
+UNWIND range(1, $degree) AS i
+CREATE (h)-[:BENCH_LINK]->(:BenchLeaf {NodeID: 'bench:leaf:' + toString($degree) + ':' + toString(i)})
+RETURN DISTINCT elementId(h) AS id
+"""
+
+CLEANUP = """
+MATCH (n) WHERE n:BenchHub OR n:BenchLeaf
+CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 5000 ROWS
+"""
+
+
+def run_engine(engine: str, seed_id: str, per_seed: int, limit: int, repeats: int):
+    settings.expansion_engine = engine
+    lat, rows = [], []
+    for r in range(repeats + 1):
+        query, params = hybrid_generic._expand_query([seed_id], per_seed, limit, hybrid_generic._filters())
+        t0 = time.perf_counter()
+        rows = run_read(query, params)
+        if r:  # first run warms the page cache
+            lat.append((time.perf_counter() - t0) * 1000)
+    return lat, rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--degrees", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--per-seed", type=int, default=20)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--repeats", type=int, default=20)
+    args = ap.parse_args()
+
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    try:
+        with driver.session() as s:
+            hubs = {d: s.run(CREATE_STAR, degree=d).single()["id"] for d in args.degrees}
+        get_catalog().refresh(force=True)  # APOC label filter must include the bench labels
+
+        print(f"{'degree':>8}{'engine':>8}{'p50 ms':>10}{'p95 ms':>10}{'triples':>9}")
+        for d, hub in hubs.items():
+            triples = {}
+            for engine in ("apoc", "cypher"):
+                lat, rows = run_engine(engine, hub, args.per_seed, args.limit, args.repeats)
+                triples[engine] = {(r["a"], r["rel"], r["b"]) for r in rows}
+                print(f"{d:>8}{engine:>8}{statistics.median(lat):>10.2f}{_p95(lat):>10.2f}{len(rows):>9}")
+            # Below the per-seed cap both engines must return the full neighbourhood; above it they
+            # may pick different neighbours, but never a different number of them.
+            same = (triples["apoc"] == triples["cypher"]) if d <= args.per_seed \
+                else len(triples["apoc"]) == len(triples["cypher"])
+            if not same:
+                print(f"{'':>8}  warning: engines disagree at degree {d}")
+    finally:
+        with driver.session() as s:
+            s.run(CLEANUP).consume()
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Run from the repo root: python -m scripts.bench_hybrid [--repeats 20]
+"""
+Round trips and latency of hybrid_generic.retrieve per mode:
+
+  legacy      KNN query + db.relationshipTypes() + db.labels() + expansion (filters per request)
+  two-step    KNN query + expansion, filters from the schema catalog
+  single      one statement: KNN → filter → expansion (HYBRID_SINGLE_QUERY=true, the default)
+
+Query embeddings are warmed into the cache first, so timings cover the database side only.
+"""
+import argparse
+import statistics
+import time
+
+from app.adapters.neo4j_client import run_read, query_stats
+from app.core.settings import settings
+from app.retrievers import hybrid_generic
+from app.services.embeddings import embed_one
+from app.services.schema_catalog import get_catalog
+from scripts.compare_dims import load_questions, _p95
+
+MODES = {
+    "legacy": {"single": False, "cached_filters": False},
+    "two-step": {"single": False, "cached_filters": True},
+    "single": {"single": True, "cached_filters": True},
+}
+
+
+def run_mode(questions, mode: dict, repeats: int, k: int, per_seed: int, limit: int):
+    settings.hybrid_single_query = mode["single"]
+    lat, trips = [], []
+    for q in questions:
+        for _ in range(repeats):
+            before = query_stats()["queries"]
+            t0 = time.perf_counter()
+            if not mode["cached_filters"]:
+                # What every request used to pay before filters came from the catalog.
+                run_read("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")
+                run_read("CALL db.labels() YIELD label RETURN label")
+            hybrid_generic.retrieve(q, k=k, per_seed=per_seed, limit=limit)
+            lat.append((time.perf_counter() - t0) * 1000)
+            trips.append(query_stats()["queries"] - before)
+    return lat, trips
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--questions", default="tests/sample_questions.json")
+    ap.add_argument("--repeats", type=int, default=20)
+    ap.add_argument("--k", type=int, default=8)
+    ap.add_argument("--per-seed", type=int, default=20)
+    ap.add_argument("--limit", type=int, default=25)
+    args = ap.parse_args()
+
+    questions = load_questions(args.questions)
+    for q in questions:
+        embed_one(q)
+    get_catalog().current()
+    if settings.knn_backend == "local":
+        print("note: KNN_BACKEND=local — 'single' falls back to local KNN + one expansion query\n")
+
+    print(f"{'mode':<10}{'round trips':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, mode in MODES.items():
+        run_mode(questions[:1], mode, 1, args.k, args.per_seed, args.limit)  # warm-up
+        lat, trips = run_mode(questions, mode, args.repeats, args.k, args.per_seed, args.limit)
+        print(f"{name:<10}{statistics.mean(trips):>12.1f}{statistics.median(lat):>10.2f}{_p95(lat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
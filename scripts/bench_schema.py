@@ -0,0 +1,80 @@
+# Run from the repo root: python -m scripts.bench_schema [--repeats 5]
+"""
+Cold-load cost of schema_snapshot: round trips and wall time of the bulk reader
+(db.schema.nodeTypeProperties/relTypeProperties + chunked sampling) against the previous
+per-label reader (two scans per label), plus a diff of what each one reports.
+"""
+import argparse
+import statistics
+import time
+
+from app.adapters.neo4j_client import run_read, query_stats
+from app.adapters.schema_reader import schema_snapshot
+
+
+def legacy_snapshot(max_nodes: int = 200):
+    """The pre-catalog reader, kept here only as the baseline."""
+    labels = [r["label"] for r in run_read("CALL db.labels() YIELD label RETURN label")]
+    rels = [r["relationshipType"] for r in run_read("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
+
+    label_props = {}
+    for lab in labels:
+        rows = run_read(
+            f"MATCH (n:`{lab}`) WITH n LIMIT $max "
+            f"UNWIND keys(n) AS k RETURN DISTINCT k AS prop ORDER BY prop",
+            {"max": max_nodes},
+        )
+        props = [r["prop"] for r in rows]
+        pref = ["NodeID","nodeId","id","code","name","title","canonical"]
+        display_prop = next((p for p in pref if p in props), (props[0] if props else None))
+        samples = []
+        if display_prop:
+            vals = run_read(
+                f"MATCH (n:`{lab}`) WHERE n.`{display_prop}` IS NOT NULL "
+                f"RETURN DISTINCT toString(n.`{display_prop}`) AS v LIMIT 18"
+            )
+            samples = [r["v"] for r in vals]
+        label_props[lab] = {"properties": props, "display_prop": display_prop, "samples": samples}
+
+    return {"labels": labels, "relationships": rels, "label_props": label_props}
+
+
+def timed(fn, repeats: int):
+    lat, trips, snap = [], [], None
+    for _ in range(repeats):
+        before = query_stats()["queries"]
+        t0 = time.perf_counter()
+        snap = fn()
+        lat.append((time.perf_counter() - t0) * 1000)
+        trips.append(query_stats()["queries"] - before)
+    return lat, trips, snap
+
+
+def diff(old: dict, new: dict):
+    print("\nlabels only in legacy:", sorted(set(old["labels"]) - set(new["labels"])) or "-")
+    print("labels only in bulk:  ", sorted(set(new["labels"]) - set(old["labels"])) or "-")
+    print("rels only in legacy:  ", sorted(set(old["relationships"]) - set(new["relationships"])) or "-")
+    for lab in sorted(set(old["labels"]) & set(new["labels"])):
+        o, n = old["label_props"][lab], new["label_props"][lab]
+        # The legacy reader only saw keys on the first 200 nodes, so extra props on the bulk side are expected.
+        missing = sorted(set(o["properties"]) - set(n["properties"]))
+        if missing or o["display_prop"] != n["display_prop"]:
+            print(f"  {lab}: display {o['display_prop']} -> {n['display_prop']}, missing props {missing or '-'}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeats", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'reader':<10}{'round trips':>12}{'p50 ms':>10}{'max ms':>10}")
+    results = {}
+    for name, fn in (("legacy", legacy_snapshot), ("bulk", schema_snapshot)):
+        lat, trips, snap = timed(fn, args.repeats)
+        results[name] = snap
+        print(f"{name:<10}{statistics.mean(trips):>12.1f}{statistics.median(lat):>10.1f}{max(lat):>10.1f}")
+    diff(results["legacy"], results["bulk"])
+
+
+if __name__ == "__main__":
+    main()
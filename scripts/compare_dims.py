@@ -0,0 +1,84 @@
+# Run from the repo root: python -m scripts.compare_dims --dims 256 512 1024
+"""
+Recall-vs-latency comparison of reduced-size vector indexes against the full-size index.
+
+For every question, the full-size index's top-k is the reference. Each variant
+(`<VECTOR_INDEX>_<dims>`, see scripts/create_vector_index.py) is queried with a vector
+of the same size and scored by recall@k against that reference, next to its median/p95
+KNN latency. Embedding time is reported separately since it doesn't depend on the index.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from neo4j import GraphDatabase
+
+from app.adapters.embedding_providers import make_provider
+from app.core.settings import settings
+from scripts.create_vector_index import variant_names
+
+KNN = """
+CALL db.index.vector.queryNodes($index, $k, $vec)
+YIELD node, score
+RETURN elementId(node) AS id
+"""
+
+
+def load_questions(path: str) -> list[str]:
+    data = json.load(open(path))
+    return [d["q"] if isinstance(d, dict) else str(d) for d in data]
+
+
+def _p95(xs: list[float]) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(0.95 * (len(xs) - 1))))]
+
+
+def run_variant(session, questions, dims, k, repeats):
+    provider = make_provider(dims=dims)
+    index, _ = variant_names(dims)
+
+    t0 = time.perf_counter()
+    vecs = provider.embed_documents(questions)
+    embed_ms = (time.perf_counter() - t0) * 1000 / max(1, len(questions))
+
+    ids, lat = [], []
+    for vec in vecs:
+        for r in range(max(1, repeats) + 1):
+            t0 = time.perf_counter()
+            rows = list(session.run(KNN, index=index, k=k, vec=vec))
+            if r:  # first run warms the page cache
+                lat.append((time.perf_counter() - t0) * 1000)
+        ids.append([row["id"] for row in rows])
+    return {"index": index, "dims": provider.dims, "ids": ids, "lat": lat, "embed_ms": embed_ms}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dims", type=int, nargs="+", default=[256, 512, 1024])
+    ap.add_argument("--questions", default="tests/sample_questions.json")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--repeats", type=int, default=3, help="KNN timings per question (after one warm-up)")
+    args = ap.parse_args()
+
+    questions = load_questions(args.questions)
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        full = run_variant(s, questions, None, args.k, args.repeats)
+        variants = [run_variant(s, questions, d, args.k, args.repeats) for d in args.dims]
+    driver.close()
+
+    print(f"{len(questions)} questions, k={args.k}, reference={full['index']} ({full['dims']} dims)\n")
+    print(f"{'index':<28}{'dims':>6}{'recall@k':>10}{'knn p50 ms':>12}{'knn p95 ms':>12}{'embed ms':>10}")
+    for v in [full] + variants:
+        recalls = [
+            len(set(got) & set(ref)) / len(ref) if ref else 1.0
+            for got, ref in zip(v["ids"], full["ids"])
+        ]
+        print(f"{v['index']:<28}{v['dims']:>6}{statistics.mean(recalls):>10.3f}"
+              f"{statistics.median(v['lat']):>12.2f}{_p95(v['lat']):>12.2f}{v['embed_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Run from the repo root: python -m scripts.compute_degrees [--missing-only]
+"""
+Store n.degree (total number of relationships, both directions) on every node, for hub-aware
+expansion in app/retrievers/hybrid_generic.py. The per-type lists earlier versions wrote
+(n.deg_types, n.deg_counts) had no reader and are removed as nodes are updated.
+
+Re-run after bulk loads; --missing-only just fills in nodes created since the last run.
+"""
+import argparse
+
+from neo4j import GraphDatabase
+
+from app.core.settings import settings
+
+DEGREE_QUERY = """
+MATCH (n)
+WHERE NOT $missingOnly OR n.degree IS NULL
+CALL {
+  WITH n
+  CALL {
+    WITH n
+    MATCH (n)-[r]-()
+    RETURN count(r) AS d
+  }
+  SET n.degree = d,
+      n.degree_updatedAt = datetime()
+  REMOVE n.deg_types, n.deg_counts
+} IN TRANSACTIONS OF $batch ROWS
+"""
+
+SUMMARY_QUERY = """
+MATCH (n) WHERE n.degree >= $hub
+RETURN count(n) AS hubs, max(n.degree) AS maxDegree
+"""
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--missing-only", action="store_true")
+    ap.add_argument("--batch", type=int, default=10000)
+    args = ap.parse_args()
+
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        # CALL ... IN TRANSACTIONS needs an auto-commit transaction, so session.run rather than execute_write.
+        counters = s.run(DEGREE_QUERY, missingOnly=args.missing_only, batch=args.batch).consume().counters
+        summary = s.run(SUMMARY_QUERY, hub=max(1, settings.hub_degree_threshold)).single()
+    driver.close()
+
+    print(f"Updated degree stats ({counters.properties_set} properties set). "
+          f"{summary['hubs']} hubs at degree >= {settings.hub_degree_threshold}, max degree {summary['maxDegree']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Run from the repo root: python -m scripts.create_fulltext_index
+"""
+Create the full-text index used for lexical seeds (SEED_MODE=hybrid): FULLTEXT_INDEX over
+card, name and NodeID of :Embeddable nodes, so exact names ("Acme Grain", "State:WA") can be
+found even when the vector index ranks them low. Neo4j populates it in the background;
+queries return partial results until it is ONLINE.
+"""
+import argparse
+
+from neo4j import GraphDatabase
+
+from app.core.settings import settings
+from scripts.create_vector_index import _IDENT
+
+PROPERTIES = ["card", "name", "NodeID"]
+
+
+def create_index(session, name: str, label: str = "Embeddable", props: list[str] = PROPERTIES):
+    # Index/label/property names can't be parameters; only allow plain identifiers.
+    for ident in [name, label, *props]:
+        if not _IDENT.match(ident):
+            raise ValueError(f"Refusing to use '{ident}' as an index/label/property name")
+    on = ", ".join(f"n.`{p}`" for p in props)
+    session.run(f"CREATE FULLTEXT INDEX `{name}` IF NOT EXISTS FOR (n:`{label}`) ON EACH [{on}]").consume()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--label", default="Embeddable")
+    args = ap.parse_args()
+
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        create_index(s, settings.fulltext_index, args.label)
+    driver.close()
+    print(f"Full-text index {settings.fulltext_index} on :{args.label}({', '.join(PROPERTIES)}).")
+
+
+if __name__ == "__main__":
+    main()
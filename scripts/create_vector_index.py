@@ -0,0 +1,58 @@
+# Run from the repo root: python -m scripts.create_vector_index [--dims 256]
+"""
+Create the native vector index for the active embedding provider, or a reduced-size variant.
+
+Variants live next to the full-size vectors: `--dims 256` creates `<VECTOR_INDEX>_256` over
+`embedding_256`. Fill it with
+    EMB_DIMS=256 EMB_PROPERTY=embedding_256 VECTOR_INDEX=emb_card_idx_256 make backfill
+and point the API at it with the same three variables.
+"""
+import argparse
+import re
+
+from neo4j import GraphDatabase
+
+from app.adapters.embedding_providers import make_provider
+from app.core.settings import settings
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def variant_names(dims: int | None, base_index: str | None = None) -> tuple[str, str]:
+    """(index name, node property) for a vector size; None → the configured full-size pair."""
+    base_index = base_index or settings.vector_index
+    if not dims:
+        return base_index, settings.emb_property
+    return f"{base_index}_{dims}", f"embedding_{dims}"
+
+
+def create_index(session, name: str, prop: str, dims: int, similarity: str = "cosine"):
+    # Index/property names can't be parameters; only allow plain identifiers.
+    for ident in (name, prop):
+        if not _IDENT.match(ident):
+            raise ValueError(f"Refusing to use '{ident}' as an index/property name")
+    session.run(
+        f"CREATE VECTOR INDEX `{name}` IF NOT EXISTS "
+        f"FOR (n:Embeddable) ON (n.`{prop}`) "
+        "OPTIONS {indexConfig: {`vector.dimensions`: $dims, `vector.similarity_function`: $sim}}",
+        dims=dims, sim=similarity,
+    ).consume()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dims", type=int, default=None, help="reduced vector size (default: provider's full size)")
+    ap.add_argument("--similarity", default="cosine", choices=["cosine", "euclidean"])
+    args = ap.parse_args()
+
+    provider = make_provider(dims=args.dims)
+    name, prop = variant_names(args.dims)
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        create_index(s, name, prop, provider.dims, args.similarity)
+    driver.close()
+    print(f"Vector index {name} on :Embeddable({prop}) with {provider.dims} dims ({provider.name}).")
+
+
+if __name__ == "__main__":
+    main()
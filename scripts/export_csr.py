@@ -0,0 +1,98 @@
+# Run from the repo root: python -m scripts.export_csr
+"""
+Export the graph's adjacency as a CSR snapshot for EXPANSION_ENGINE=csr (app/adapters/csr_graph.py).
+
+Snapshot directory layout (CSR_PATH):
+  meta.json     {"nodes", "edges", "rel_types", "version", "created"}
+  nodes.jsonl   one {"id": elementId, "key": NodeID} per node; line number = int32 node index
+  indptr.i64    int64[nodes + 1]; neighbours of node i are entries indptr[i]:indptr[i+1]
+  indices.i32   int32[2 * relationships] neighbour node index (both directions stored)
+  rels.u16      uint16, same length: index into meta.rel_types
+
+Within a node's slice neighbours are ordered by their own degree (highest first), so the first
+per_seed entries are the best-connected ones. Unlabelled nodes are left out, as in live expansion.
+The snapshot is written to a staging directory and swapped in; workers re-map it on their next
+version check.
+"""
+import argparse
+import json
+import os
+import uuid
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+from neo4j import GraphDatabase
+
+from app.core.settings import settings
+from scripts.export_vectors import _write_meta, swap_in
+
+NODES_QUERY = """
+MATCH (n) WHERE labels(n) <> []
+RETURN elementId(n) AS id, coalesce(n.NodeID, labels(n)[0] + ':' + coalesce(n.code, n.name)) AS key
+"""
+
+EDGES_QUERY = """
+MATCH (a)-[r]->(b)
+WHERE labels(a) <> [] AND labels(b) <> []
+RETURN elementId(a) AS s, type(r) AS t, elementId(b) AS d
+"""
+
+
+def export(session, out_dir: str) -> dict:
+    index: dict[str, int] = {}
+    with open(os.path.join(out_dir, "nodes.jsonl"), "w") as f:
+        for rec in session.run(NODES_QUERY):
+            index[rec["id"]] = len(index)
+            f.write(json.dumps({"id": rec["id"], "key": rec["key"]}) + "\n")
+
+    types: dict[str, int] = {}
+    src, dst, rel = array("i"), array("i"), array("H")
+    for rec in session.run(EDGES_QUERY):
+        src.append(index[rec["s"]])
+        dst.append(index[rec["d"]])
+        rel.append(types.setdefault(rec["t"], len(types)))
+
+    n = len(index)
+    s = np.frombuffer(src, dtype=np.int32)
+    d = np.frombuffer(dst, dtype=np.int32)
+    t = np.frombuffer(rel, dtype=np.uint16)
+    # Undirected adjacency: every relationship is listed under both endpoints.
+    s, d, t = np.concatenate([s, d]), np.concatenate([d, s]), np.concatenate([t, t])
+    degree = np.bincount(s, minlength=n)
+    order = np.lexsort((-degree[d], s))  # by source, then best-connected neighbour first
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+
+    indptr.tofile(os.path.join(out_dir, "indptr.i64"))
+    d[order].astype(np.int32).tofile(os.path.join(out_dir, "indices.i32"))
+    t[order].astype(np.uint16).tofile(os.path.join(out_dir, "rels.u16"))
+    return {
+        "nodes": n,
+        "edges": int(len(s)),
+        "rel_types": sorted(types, key=types.get),
+        "version": uuid.uuid4().hex,
+        "created": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--path", default=settings.csr_path)
+    args = ap.parse_args()
+
+    out_dir = f"{args.path.rstrip('/')}.staging-{uuid.uuid4().hex[:8]}"
+    os.makedirs(out_dir, exist_ok=True)
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        meta = export(s, out_dir)
+    driver.close()
+
+    _write_meta(out_dir, meta)
+    swap_in(out_dir, args.path)
+    print(f"Exported {meta['nodes']} nodes, {meta['edges']} adjacency entries, "
+          f"{len(meta['rel_types'])} relationship types to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# Run from the repo root: python -m scripts.export_vectors [--append] [--hnsw]
+"""
+Dump (elementId, NodeID, embedding) of every :Embeddable node into the snapshot read by
+app/adapters/local_ann.py (KNN_BACKEND=local).
+
+  full export   rewrites the snapshot directory (LOCAL_ANN_PATH) from scratch
+  --append      adds only nodes re-embedded since the last export (embedding_updatedAt)
+  --hnsw        also build/extend an hnswlib graph (needs `pip install hnswlib`)
+
+A full export is built in a staging directory and swapped in; an append writes meta.json last.
+Either way running workers never see a half-written snapshot.
+"""
+import argparse
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from neo4j import GraphDatabase
+
+from app.adapters.local_ann import read_meta
+from app.core.settings import settings
+
+# Property names can't be parameters; n[$prop] keeps EMB_PROPERTY configurable.
+EXPORT_QUERY = """
+MATCH (n:Embeddable)
+WHERE n[$prop] IS NOT NULL
+  AND ($since IS NULL OR n.embedding_updatedAt > datetime($since))
+RETURN elementId(n) AS id,
+       labels(n) AS labels,
+       coalesce(n.NodeID, labels(n)[0] + ':' + coalesce(n.code, n.name)) AS nodeId,
+       n[$prop] AS vec
+"""
+
+CHUNK = 5000
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _write_meta(path: str, meta: dict):
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+
+def swap_in(staged: str, path: str):
+    """Replace the snapshot at `path` with the fully written `staged` directory."""
+    old_dir = f"{path.rstrip('/')}.old-{uuid.uuid4().hex[:8]}"
+    if os.path.isdir(path):
+        os.replace(path, old_dir)
+    os.replace(staged, path)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _flush(vec_f, ids_f, vecs: list, ids: list):
+    m = np.asarray(vecs, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    m /= np.where(norms == 0, 1.0, norms)
+    vec_f.write(m.tobytes())
+    for row in ids:
+        ids_f.write(json.dumps(row) + "\n")
+
+
+def export(session, path: str, since: str | None, dims: int | None) -> tuple[int, int | None]:
+    """Append matching nodes to vectors.f32/ids.jsonl; returns (rows written, dims)."""
+    written = 0
+    vecs, ids = [], []
+    with open(os.path.join(path, "vectors.f32"), "ab") as vec_f, \
+         open(os.path.join(path, "ids.jsonl"), "a") as ids_f:
+        for rec in session.run(EXPORT_QUERY, prop=settings.emb_property, since=since):
+            vec = rec["vec"]
+            if dims is None:
+                dims = len(vec)
+            if len(vec) != dims:
+                raise RuntimeError(f"Node {rec['id']} has {len(vec)} dims, snapshot has {dims}")
+            vecs.append(vec)
+            ids.append({"id": rec["id"], "nodeId": rec["nodeId"], "labels": list(rec["labels"])})
+            if len(vecs) >= CHUNK:
+                _flush(vec_f, ids_f, vecs, ids)
+                written += len(vecs)
+                vecs, ids = [], []
+        if vecs:
+            _flush(vec_f, ids_f, vecs, ids)
+            written += len(vecs)
+    return written, dims
+
+
+def build_hnsw(path: str, start_row: int, rows: int, dims: int):
+    import hnswlib
+
+    m = np.memmap(os.path.join(path, "vectors.f32"), dtype=np.float32, mode="r", shape=(rows, dims))
+    idx = hnswlib.Index(space="ip", dim=dims)
+    hnsw_path = os.path.join(path, "hnsw.bin")
+    if start_row and os.path.exists(hnsw_path):
+        idx.load_index(hnsw_path, max_elements=rows)
+        idx.resize_index(rows)
+    else:
+        idx.init_index(max_elements=rows, ef_construction=200, M=16)
+        start_row = 0
+    if rows > start_row:
+        idx.add_items(np.asarray(m[start_row:rows]), np.arange(start_row, rows))
+    tmp = hnsw_path + ".tmp"
+    idx.save_index(tmp)
+    os.replace(tmp, hnsw_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--path", default=settings.local_ann_path)
+    ap.add_argument("--append", action="store_true")
+    ap.add_argument("--hnsw", action="store_true")
+    args = ap.parse_args()
+
+    started = _now()
+    meta = None
+    if args.append and os.path.exists(os.path.join(args.path, "meta.json")):
+        meta = read_meta(args.path)
+        out_dir = args.path
+    else:
+        out_dir = f"{args.path.rstrip('/')}.staging-{uuid.uuid4().hex[:8]}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    since = meta["last_updated"] if meta else None
+    prev_rows = int(meta["rows"]) if meta else 0
+    if meta:
+        # Drop bytes/lines past the published row count (an interrupted earlier append).
+        with open(os.path.join(out_dir, "vectors.f32"), "r+b") as f:
+            f.truncate(prev_rows * int(meta["dims"]) * 4)
+        with open(os.path.join(out_dir, "ids.jsonl")) as f:
+            lines = f.readlines()[:prev_rows]
+        tmp = os.path.join(out_dir, "ids.jsonl.tmp")
+        with open(tmp, "w") as f:
+            f.writelines(lines)
+        os.replace(tmp, os.path.join(out_dir, "ids.jsonl"))
+
+    driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_pass))
+    with driver.session() as s:
+        written, dims = export(s, out_dir, since, meta["dims"] if meta else None)
+    driver.close()
+
+    rows = prev_rows + written
+    if dims is None:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        print("No embedded nodes found; nothing exported.")
+        return
+    if meta and not written:
+        print("No re-embedded nodes since the last export; snapshot unchanged.")
+        return
+    if args.hnsw and written:
+        build_hnsw(out_dir, prev_rows, rows, dims)
+
+    _write_meta(out_dir, {
+        "dims": dims,
+        "rows": rows,
+        "version": uuid.uuid4().hex,
+        "property": settings.emb_property,
+        "model": settings.emb_model if settings.emb_provider == "openai" else settings.emb_provider,
+        "last_updated": started,
+    })
+    if out_dir != args.path:
+        # Swap the staged snapshot in; workers re-map it on their next version check.
+        swap_in(out_dir, args.path)
+    print(f"{'Appended' if meta else 'Exported'} {written} vectors ({rows} rows, {dims} dims) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()